@@ -0,0 +1,151 @@
+"""Query benchmark of the BM25 index against a regex scan over every document.
+
+Run from apps/med_llm_offline:
+
+    python -m benchmarks.bench_bm25 [--documents 50000] [--queries 200] [--k 10]
+
+The catalogue is synthesized from the recordings in data/dvago: every document gets a
+made-up generic name and indication, and a description drawn from the words of the
+recorded products. Brands of the same generic share most of their description, as on
+the live site, and the posting lists have realistic lengths at any catalogue size.
+"""
+
+import argparse
+import random
+import re
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.fixtures import load_recorded_products
+from src.med_llm_offline.application.retrieval import BM25Index, document_text, tokenize
+from src.med_llm_offline.domain import Document, DocumentMetadata
+
+
+def synthesize_documents(count: int, seed: int = 7) -> list[Document]:
+    """Build `count` documents from the recorded products' vocabulary."""
+    rng = random.Random(seed)
+    products = load_recorded_products()
+    words = sorted({word for product in products for word in tokenize(str(product["metadata"]))})
+    generics = [f"generic{i}" for i in range(max(10, count // 20))]
+    indications = [f"indication{i}" for i in range(max(10, count // 50))]
+    descriptions = {
+        generic: rng.choices(words, k=rng.randint(40, 200)) for generic in generics
+    }
+
+    documents = []
+    for i in range(count):
+        generic = rng.choice(generics)
+        indication = rng.choice(indications)
+        # Each brand rewords about a fifth of its generic's description.
+        body = " ".join(
+            rng.choice(words) if rng.random() < 0.2 else word
+            for word in descriptions[generic]
+        )
+        documents.append(
+            Document(
+                id=f"doc-{i}",
+                metadata=DocumentMetadata(
+                    id=f"product-{i}",
+                    url=f"https://www.dvago.pk/p/product-{i}",
+                    name=f"{generic.title()} Tablets {rng.choice([5, 10, 20])}mg",
+                    properties={
+                        "specification": (
+                            f"Requires Prescription (YES/NO) {rng.choice(['Yes', 'No'])}\n"
+                            f"Generics {generic}\nUsed For {indication}\nHow it works {body}"
+                        ),
+                    },
+                ),
+            )
+        )
+
+    return documents
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def time_queries(search, queries: list[str]) -> list[float]:
+    """Return the latency in milliseconds of every query."""
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    documents = synthesize_documents(args.documents)
+    rng = random.Random(11)
+    queries = [
+        f"{rng.choice(documents).metadata.name.split()[0]} {rng.choice(['tablets', 'pain', 'vitamin'])}"
+        for _ in range(args.queries)
+    ]
+
+    start = time.perf_counter()
+    index = BM25Index()
+    index.add(documents)
+    index.merge()
+    build_seconds = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = Path(tmp) / "bm25"
+        start = time.perf_counter()
+        index.save(index_dir)
+        save_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded = BM25Index.load(index_dir)
+        load_seconds = time.perf_counter() - start
+        size_mb = sum(path.stat().st_size for path in index_dir.iterdir()) / 1e6
+
+        print(
+            f"{len(documents)} documents: built in {build_seconds:.2f}s, saved in "
+            f"{save_seconds:.2f}s ({size_mb:.1f} MB), memory-mapped in {load_seconds * 1000:.1f} ms"
+        )
+
+        texts = [(document.id, document_text(document).lower()) for document in documents]
+
+        def regex_scan(query: str) -> list[str]:
+            patterns = [re.compile(re.escape(term)) for term in tokenize(query)]
+            return [
+                doc_id for doc_id, text in texts if any(p.search(text) for p in patterns)
+            ][: args.k]
+
+        results = {}
+        for label, search in (
+            ("regex scan", regex_scan),
+            ("bm25 (memory)", lambda query: index.search(query, k=args.k)),
+            ("bm25 (mmap)", lambda query: loaded.search(query, k=args.k)),
+        ):
+            samples = time_queries(search, queries if label != "regex scan" else queries[:20])
+            results[label] = statistics.median(samples)
+            print(
+                f"{label:>14}: median {results[label]:.3f} ms, "
+                f"p95 {percentile(samples, 0.95):.3f} ms, p99 {percentile(samples, 0.99):.3f} ms"
+            )
+
+        updates = documents[: min(1000, len(documents))]
+        start = time.perf_counter()
+        for document in updates:
+            loaded.delete(document.id)
+        loaded.add(updates)
+        update_ms = (time.perf_counter() - start) * 1000 / len(updates)
+        print(f"incremental delete + add: {update_ms:.3f} ms/document")
+
+    print(f"speed-up over regex scan: {results['regex scan'] / results['bm25 (mmap)']:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
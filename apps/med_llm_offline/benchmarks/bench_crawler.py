@@ -0,0 +1,202 @@
+"""End-to-end crawler benchmark against the local dvago.pk stand-in.
+
+Starts benchmarks.stand_in_server in a child process, runs Crawl4AIMedicineCrawler
+against it and writes a JSON report with throughput, per-product latency percentiles,
+peak RSS and the peak number of browser processes. Run from apps/med_llm_offline:
+
+    python -m benchmarks.bench_crawler --pages 20 --workers 10 --latency-ms 50
+
+Compare two reports by diffing their JSON, e.g. before and after a change.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from benchmarks.stand_in_server import StandInConfig, StandInServer
+from src.med_llm_offline.application.crawlers import Crawl4AIMedicineCrawler
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+class TimedCrawler(Crawl4AIMedicineCrawler):
+    """Crawler that records the wall-clock latency of every product scrape."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.product_latencies: list[float] = []
+
+    async def scrape_product(self, url: str) -> dict:
+        start = time.perf_counter()
+        try:
+            return await super().scrape_product(url)
+        finally:
+            self.product_latencies.append(time.perf_counter() - start)
+
+
+def _descendants(pid: int) -> list[int]:
+    """List the pids of every descendant of `pid`, from /proc."""
+    children = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # The command name may contain spaces, so split after its closing paren.
+        parent = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(parent, []).append(int(entry.name))
+
+    found, stack = [], [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+
+    return found
+
+
+def _rss_bytes(pid: int) -> int:
+    try:
+        return int((Path("/proc") / str(pid) / "statm").read_text().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def _is_browser(pid: int) -> bool:
+    try:
+        return "chrom" in (Path("/proc") / str(pid) / "comm").read_text().lower()
+    except OSError:
+        return False
+
+
+class ProcessSampler:
+    """Samples this process tree's RSS and browser process count in the background."""
+
+    def __init__(self, exclude_pid: Optional[int] = None, interval: float = 0.25) -> None:
+        self.exclude_pid = exclude_pid
+        self.interval = interval
+        self.peak_rss_bytes = 0
+        self.peak_browser_processes = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "ProcessSampler":
+        self._thread = threading.Thread(target=self.__run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def __run(self) -> None:
+        pid = os.getpid()
+        while not self._stop.is_set():
+            # The stand-in server is a child too, but it is not part of the crawler.
+            excluded = set()
+            if self.exclude_pid is not None:
+                excluded = {self.exclude_pid, *_descendants(self.exclude_pid)}
+            tree = [p for p in _descendants(pid) if p not in excluded]
+            browsers = [p for p in tree if _is_browser(p)]
+
+            self.peak_rss_bytes = max(
+                self.peak_rss_bytes, _rss_bytes(pid) + sum(_rss_bytes(p) for p in tree)
+            )
+            self.peak_browser_processes = max(self.peak_browser_processes, len(browsers))
+            self._stop.wait(self.interval)
+
+
+def run_benchmark(args: argparse.Namespace) -> dict:
+    config = StandInConfig(
+        page_count=args.pages,
+        products_per_page=args.products_per_page,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+    )
+
+    with StandInServer(config) as server:
+        crawler = TimedCrawler(
+            max_concurrent_requests=args.workers,
+            base_url=server.base_url,
+            use_http_first=not args.browser_only,
+            cache_dir=args.cache_dir,
+        )
+
+        with ProcessSampler(exclude_pid=server.pid) as sampler:
+            start = time.perf_counter()
+            documents = crawler()
+            elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(crawler.product_latencies) * 1000
+    percentiles = (
+        dict(zip(("p50", "p95", "p99"), np.percentile(latencies_ms, [50, 95, 99]).round(2).tolist()))
+        if latencies_ms.size
+        else {"p50": None, "p95": None, "p99": None}
+    )
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "host": platform.node(),
+        "config": {
+            "pages": args.pages,
+            "products_per_page": args.products_per_page,
+            "latency_ms": args.latency_ms,
+            "latency_jitter_ms": args.latency_jitter_ms,
+            "error_rate": args.error_rate,
+            "workers": args.workers,
+            "http_first": not args.browser_only,
+            "cache_dir": str(args.cache_dir) if args.cache_dir else None,
+        },
+        "expected_products": server.product_count,
+        "documents": len(documents),
+        "failed_urls": len(crawler.failed_urls),
+        "elapsed_seconds": round(elapsed, 3),
+        "products_per_second": round(len(documents) / elapsed, 3) if elapsed else None,
+        "product_latency_ms": percentiles,
+        "peak_rss_mb": round(sampler.peak_rss_bytes / 2**20, 1),
+        "peak_self_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_browser_processes": sampler.peak_browser_processes,
+        "fetch_stats": crawler.fetch_stats,
+        "stage_metrics": crawler.metrics.to_metadata(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--products-per-page", type=int, default=24)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=10)
+    parser.add_argument("--browser-only", action="store_true", help="Disable the HTTP-first tier.")
+    parser.add_argument("--cache-dir", type=Path, default=None)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    report = run_benchmark(args)
+
+    output = args.output or RESULTS_DIR / f"crawler-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+
+    print(json.dumps(report, indent=2))
+    print(f"Saved report to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Micro-benchmark of product page extraction: BeautifulSoup baseline vs. the lxml engine.
+
+Run from apps/med_llm_offline:
+
+    python -m benchmarks.bench_extraction [--html-dir saved_pages/] [--repeat 200]
+
+Without --html-dir, product pages are rendered from the recordings in data/dvago.
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from benchmarks.fixtures import load_recorded_products, render_product_page
+from src.med_llm_offline.application.crawlers.extraction import (
+    PRODUCT_SECTIONS,
+    extract_product,
+)
+
+
+def extract_product_bs4(html: str) -> tuple[str, dict[str, str]]:
+    """The original extraction: one html.parser tree, rescanned once per section."""
+    soup = BeautifulSoup(html, "html.parser")
+
+    def extract_section(title):
+        h2 = soup.find("h2", string=lambda t: t and title.lower() in t.lower())
+        if h2:
+            content = []
+            for sibling in h2.find_next_siblings():
+                if sibling.name == "h2":
+                    break
+                content.append(sibling.get_text(" ", strip=True))
+            return "\n".join(content).strip()
+        return ""
+
+    name_tag = soup.find("h1")
+    name = name_tag.get_text(strip=True) if name_tag else "Unknown"
+
+    return name, {key: extract_section(title) for key, title in PRODUCT_SECTIONS.items()}
+
+
+def time_per_page(extract, pages: list[str], repeat: int) -> list[float]:
+    """Return the per-page cost in milliseconds of each of `repeat` passes over `pages`."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            extract(page)
+        samples.append((time.perf_counter() - start) * 1000 / len(pages))
+
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--html-dir", type=Path, default=None)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.html_dir:
+        pages = [path.read_text(encoding="utf-8") for path in sorted(args.html_dir.glob("*.html"))]
+    else:
+        pages = [render_product_page(product) for product in load_recorded_products()]
+
+    if not pages:
+        raise SystemExit("No product pages to benchmark.")
+
+    mismatches = sum(extract_product(page) != extract_product_bs4(page) for page in pages)
+
+    print(f"{len(pages)} pages, {args.repeat} passes, {mismatches} pages with different output")
+    results = {}
+    for label, extract in (("bs4 html.parser", extract_product_bs4), ("lxml single pass", extract_product)):
+        samples = time_per_page(extract, pages, args.repeat)
+        results[label] = statistics.median(samples)
+        print(
+            f"{label:>18}: median {results[label]:.3f} ms/page, "
+            f"min {min(samples):.3f} ms/page"
+        )
+
+    print(f"speed-up: {results['bs4 html.parser'] / results['lxml single pass']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
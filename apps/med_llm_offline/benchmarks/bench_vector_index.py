@@ -0,0 +1,88 @@
+"""Recall and latency of the IVF vector index against brute-force search.
+
+Run from apps/med_llm_offline:
+
+    python -m benchmarks.bench_vector_index [--documents 20000] [--queries 200] [--k 10]
+
+Sections of a synthetic catalogue (see benchmarks.bench_bm25) are embedded with the
+default hashing encoder. Queries are perturbed copies of indexed sections, so every
+query has true near neighbours. The embedding cache is timed on a second pass.
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.bench_bm25 import percentile, synthesize_documents
+from src.med_llm_offline.application.retrieval import SectionVectorIndex
+from src.med_llm_offline.infrastructure.cache import EmbeddingCache
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    documents = synthesize_documents(args.documents)
+    rng = random.Random(3)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with EmbeddingCache(Path(tmp) / "cache") as cache:
+            start = time.perf_counter()
+            semantic = SectionVectorIndex(cache=cache)
+            semantic.add(documents)
+            embed_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            semantic.train()
+            train_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            SectionVectorIndex(cache=cache).add(documents)
+            cached_seconds = time.perf_counter() - start
+
+        print(
+            f"{len(semantic.index)} sections: embedded in {embed_seconds:.2f}s, "
+            f"{cached_seconds:.2f}s from the cache, trained {semantic.index.n_lists} "
+            f"lists in {train_seconds:.2f}s"
+        )
+
+        queries = []
+        for document in rng.sample(documents, args.queries):
+            words = document.metadata.properties["specification"].split()
+            queries.append(" ".join(rng.sample(words, k=max(1, len(words) // 2))))
+        vectors = semantic.encoder.encode(queries)
+
+        exact, exact_samples = [], []
+        for vector in vectors:
+            start = time.perf_counter()
+            exact.append({hit for hit, _ in semantic.index.search_exact(vector, k=args.k)})
+            exact_samples.append((time.perf_counter() - start) * 1000)
+        print(
+            f"{'brute force':>12}: recall 1.000, median {statistics.median(exact_samples):.3f} ms, "
+            f"p95 {percentile(exact_samples, 0.95):.3f} ms"
+        )
+
+        for n_probe in (1, 2, 4, 8, 16, 32):
+            recalls, samples = [], []
+            for vector, truth in zip(vectors, exact):
+                start = time.perf_counter()
+                hits = semantic.index.search(vector, k=args.k, n_probe=n_probe)
+                samples.append((time.perf_counter() - start) * 1000)
+                recalls.append(len(truth & {hit for hit, _ in hits}) / len(truth))
+            print(
+                f"{f'ivf n_probe={n_probe}':>12}: recall {np.mean(recalls):.3f}, "
+                f"median {statistics.median(samples):.3f} ms, "
+                f"p95 {percentile(samples, 0.95):.3f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
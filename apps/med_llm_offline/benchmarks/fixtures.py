@@ -0,0 +1,85 @@
+"""Recorded dvago.pk products and HTML renderers shared by the benchmarks."""
+
+import html
+import json
+from pathlib import Path
+
+RECORDINGS_DIR = Path(__file__).resolve().parents[3] / "data" / "dvago"
+
+SECTION_TITLES = {
+    "specification": "Specification",
+    "usage_and_safety": "Usage and Safety",
+    "precautions": "Precautions",
+    "warnings": "Warnings",
+    "additional_information": "Additional Information",
+}
+
+
+def load_recorded_products(recordings_dir: Path = RECORDINGS_DIR) -> list[dict]:
+    """Load the recorded product documents, unwrapping double-encoded JSON files."""
+    products = []
+    for path in sorted(recordings_dir.glob("*.json")):
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, str):
+            data = json.loads(data)
+        products.append(data)
+
+    return products
+
+
+def _page_chrome(body: str, title: str) -> str:
+    """Wrap page content in navigation and footer markup similar in size to the live site."""
+    nav = "".join(
+        f'<li><a href="/cat/category-{i}">Category {i}</a></li>' for i in range(150)
+    )
+    footer = "".join(f"<p>Footer link {i}</p>" for i in range(60))
+    return (
+        "<!DOCTYPE html><html><head>"
+        f"<title>{html.escape(title)}</title>"
+        '<script>window.__NEXT_DATA__ = {"props": {}};</script>'
+        "<style>.MuiTypography-root{margin:0}</style>"
+        "</head><body>"
+        f"<header><nav><ul>{nav}</ul></nav></header>"
+        f"<main>{body}</main>"
+        f"<footer>{footer}</footer>"
+        "</body></html>"
+    )
+
+
+def render_product_page(product: dict) -> str:
+    """Render a recorded product the way dvago.pk lays out a product page."""
+    metadata = product["metadata"]
+    sections = []
+    for key, title in SECTION_TITLES.items():
+        text = metadata["properties"].get(key, "")
+        if not text:
+            continue
+        lines = "".join(
+            f'<div class="row"><p>{html.escape(line)}</p></div>'
+            for line in text.split("\n")
+        )
+        sections.append(f'<h2 class="MuiTypography-root">{title}</h2>{lines}')
+
+    body = (
+        '<div class="page-banner_productContainer__vluxa">'
+        f'<h1 class="MuiTypography-root">{html.escape(metadata["name"])}</h1>'
+        '<h2 class="productDetail_price__SAL9I">Rs. 1,000</h2>'
+        f'<section>{"".join(sections)}</section>'
+        "</div>"
+    )
+    return _page_chrome(body, metadata["name"])
+
+
+def render_listing_page(product_paths: list[str], page_number: int) -> str:
+    """Render a listing page linking to the given product paths."""
+    cards = "".join(
+        f'<div class="card"><a href="{path}">{html.escape(path)}</a></div>'
+        for path in product_paths
+    )
+    return _page_chrome(f"<div>{cards}</div>", f"Medicine - Page {page_number}")
+
+
+def render_not_found_page() -> str:
+    """Render the page dvago.pk serves past the last listing page."""
+    return _page_chrome("<h1>Page Not Found</h1>", "Page Not Found")
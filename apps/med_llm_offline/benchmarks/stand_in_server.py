@@ -0,0 +1,182 @@
+"""A local stand-in for dvago.pk serving recorded listing and product pages.
+
+Listing pages live at /cat/medicine?page=N for 1 <= N <= page_count and past that
+return the site's "Page Not Found" page. Product pages live at /p/<slug> and are
+rendered from the recordings in data/dvago, cycled to fill the catalogue. Responses
+carry an ETag and honour If-None-Match, and can be slowed down or made to fail.
+
+Run standalone from apps/med_llm_offline:
+
+    python -m benchmarks.stand_in_server --pages 20 --latency-ms 50
+"""
+
+import argparse
+import hashlib
+import multiprocessing
+import random
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.fixtures import (
+    load_recorded_products,
+    render_listing_page,
+    render_not_found_page,
+    render_product_page,
+)
+
+
+@dataclass
+class StandInConfig:
+    page_count: int = 10
+    products_per_page: int = 24
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+
+
+class StandInCatalogue:
+    """The pages served by the stand-in, rendered once up front."""
+
+    def __init__(self, config: StandInConfig) -> None:
+        products = load_recorded_products()
+        if not products:
+            raise RuntimeError("No recorded products found in data/dvago.")
+
+        self.listings: dict[int, bytes] = {}
+        self.products: dict[str, bytes] = {}
+
+        for page_number in range(1, config.page_count + 1):
+            paths = []
+            for slot in range(config.products_per_page):
+                index = (page_number - 1) * config.products_per_page + slot
+                product = products[index % len(products)]
+                slug = urlparse(product["metadata"]["url"]).path.rsplit("/", 1)[-1]
+                path = f"/p/{slug}-{index}"
+
+                self.products[path] = render_product_page(product).encode("utf-8")
+                paths.append(path)
+
+            self.listings[page_number] = render_listing_page(paths, page_number).encode("utf-8")
+
+        self.not_found = render_not_found_page().encode("utf-8")
+
+
+def _make_handler(catalogue: StandInCatalogue, config: StandInConfig):
+    rng = random.Random(config.seed)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            delay = config.latency_ms + rng.uniform(0, config.latency_jitter_ms)
+            if delay > 0:
+                time.sleep(delay / 1000)
+
+            if config.error_rate and rng.random() < config.error_rate:
+                self.__respond(503, b"Service Unavailable")
+                return
+
+            parsed = urlparse(self.path)
+            if parsed.path == "/cat/medicine":
+                page = int(parse_qs(parsed.query).get("page", ["1"])[0])
+                self.__respond(200, catalogue.listings.get(page, catalogue.not_found))
+            elif parsed.path in catalogue.products:
+                self.__respond(200, catalogue.products[parsed.path])
+            else:
+                self.__respond(404, catalogue.not_found)
+
+        def log_message(self, format, *args) -> None:
+            pass
+
+        def __respond(self, status: int, body: bytes) -> None:
+            etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+            if status == 200 and self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            if status == 200:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def serve(config: StandInConfig, port: int = 0, ready: Optional[multiprocessing.Queue] = None) -> None:
+    """Serve the stand-in catalogue until the process is terminated."""
+    catalogue = StandInCatalogue(config)
+    server = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(catalogue, config))
+    server.daemon_threads = True
+
+    if ready is not None:
+        ready.put(server.server_port)
+    else:
+        print(f"Serving {config.page_count} listing pages on http://127.0.0.1:{server.server_port}")
+
+    server.serve_forever()
+
+
+class StandInServer:
+    """Runs the stand-in in a child process, so it does not compete for the crawler's GIL."""
+
+    def __init__(self, config: StandInConfig) -> None:
+        self.config = config
+        self.base_url: Optional[str] = None
+        self._process: Optional[multiprocessing.Process] = None
+
+    def __enter__(self) -> "StandInServer":
+        ready = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=serve, args=(self.config, 0, ready), daemon=True
+        )
+        self._process.start()
+        self.base_url = f"http://127.0.0.1:{ready.get(timeout=60)}"
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._process.terminate()
+        self._process.join()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid if self._process else None
+
+    @property
+    def product_count(self) -> int:
+        return self.config.page_count * self.config.products_per_page
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--products-per-page", type=int, default=24)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    serve(
+        StandInConfig(
+            page_count=args.pages,
+            products_per_page=args.products_per_page,
+            latency_ms=args.latency_ms,
+            latency_jitter_ms=args.latency_jitter_ms,
+            error_rate=args.error_rate,
+        ),
+        port=args.port,
+    )
+
+
+if __name__ == "__main__":
+    main()
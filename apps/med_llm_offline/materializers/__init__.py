@@ -0,0 +1,3 @@
+from .document_list import DocumentListMaterializer
+
+__all__ = ["DocumentListMaterializer"]
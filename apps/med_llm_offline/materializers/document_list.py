@@ -0,0 +1,79 @@
+import os
+from typing import Any, ClassVar, Dict, Tuple, Type
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from zenml.enums import ArtifactType
+from zenml.materializers.base_materializer import BaseMaterializer
+from zenml.metadata.metadata_types import MetadataType
+
+from src.med_llm_offline.infrastructure.export import DocumentSequence, documents_to_table
+
+DEFAULT_FILENAME = "documents.parquet"
+ROW_GROUP_SIZE = 2048
+
+
+class DocumentListMaterializer(BaseMaterializer):
+    """Stores lists of Documents as a zstd-compressed Parquet table.
+
+    Each field gets its own column (`id`, `metadata.id`, `metadata.url`, `name` and
+    one `properties.<key>` column per property), instead of the whole list being
+    serialized as pydantic objects. Loading returns a `DocumentSequence`, which builds
+    Documents lazily, one row group at a time, and lets a step read only the columns it
+    needs, e.g. `documents.column("metadata.url")`.
+
+    The class is not registered for `list`, so other list artifacts keep ZenML's
+    default materializer. Steps opt in with `output_materializers`.
+    """
+
+    SKIP_REGISTRATION: ClassVar[bool] = True
+    ASSOCIATED_TYPES: ClassVar[Tuple[Type[Any], ...]] = (list, DocumentSequence)
+    ASSOCIATED_ARTIFACT_TYPE: ClassVar[ArtifactType] = ArtifactType.DATA
+
+    def load(self, data_type: Type[Any]) -> DocumentSequence:
+        """Open the stored table as a lazy sequence of Documents.
+
+        The compressed file is read into memory in one go, so the artifact store handle
+        is closed right away; Documents are still only decoded when accessed.
+
+        Args:
+            data_type: The type the artifact is loaded as.
+
+        Returns:
+            DocumentSequence: The stored documents.
+        """
+        data_path = os.path.join(self.uri, DEFAULT_FILENAME)
+        with self.artifact_store.open(data_path, "rb") as f:
+            buffer = pa.py_buffer(f.read())
+        return DocumentSequence(pa.BufferReader(buffer))
+
+    def save(self, data: list) -> None:
+        """Write the documents as a Parquet table.
+
+        Args:
+            data: The documents to store.
+        """
+        data_path = os.path.join(self.uri, DEFAULT_FILENAME)
+        with self.artifact_store.open(data_path, "wb") as f:
+            pq.write_table(
+                documents_to_table(data),
+                f,
+                row_group_size=ROW_GROUP_SIZE,
+                compression="zstd",
+            )
+
+    def extract_metadata(self, data: list) -> Dict[str, MetadataType]:
+        """Extract the document count and the stored columns.
+
+        Args:
+            data: The stored documents.
+
+        Returns:
+            The extracted metadata as a dictionary.
+        """
+        if isinstance(data, DocumentSequence):
+            keys = data.property_keys
+        else:
+            keys = sorted({key for document in data for key in document.metadata.properties})
+
+        return {"count": len(data), "property_keys": keys}
@@ -1,9 +1,11 @@
 from pathlib import Path
+from typing import Optional
 
 from loguru import logger
 from zenml import pipeline
 
-from steps.etl import crawl
+from src.med_llm_offline.domain.chunk import CHUNK_CONTENT_FIELDS
+from steps.etl import chunk_documents, crawl, crawl_to_mongodb, deduplicate
 from steps.infrastructure import (
     ingest_to_mongodb
 )
@@ -13,18 +15,79 @@ def etl(
     load_collection_name: str,
     max_workers: int = 10,
     base_url: str = "https://www.dvago.pk",
+    cache_dir: Optional[str] = None,
+    incremental: bool = False,
+    streaming: bool = False,
+    write_batch_size: int = 500,
+    write_flush_interval: float = 5.0,
+    drop_near_duplicates: bool = False,
+    checkpoint_dir: Optional[str] = None,
+    resume: bool = False,
+    chunk_collection_name: Optional[str] = None,
+    chunk_size: int = 512,
+    chunk_overlap: int = 64,
 ) -> None:
     logger.info(
         f"Starting ETL pipeline with max_workers={max_workers} and base_url={base_url}"
     )
+    if streaming:
+        logger.info(
+            f"Streaming crawled data into MongoDB collection '{load_collection_name}'"
+        )
+        crawl_to_mongodb(
+            max_workers=max_workers,
+            base_url=base_url,
+            collection_name=load_collection_name,
+            cache_dir=cache_dir,
+            incremental=incremental,
+            batch_size=write_batch_size,
+            flush_interval=write_flush_interval,
+            checkpoint_dir=checkpoint_dir,
+            resume=resume,
+        )
+        return
+
     logger.info("Starting web crawling...")
-    crawled_data = crawl(max_workers=max_workers, base_url=base_url)
+    crawled_data, crawl_report = crawl(
+        max_workers=max_workers,
+        base_url=base_url,
+        cache_dir=cache_dir,
+        checkpoint_dir=checkpoint_dir,
+        resume=resume,
+    )
+
+    logger.info("Deduplicating crawled data...")
+    deduplicated_data = deduplicate(
+        documents=crawled_data, drop_near_duplicates=drop_near_duplicates
+    )
 
     logger.info(
         f"Saving crawled data to MongoDB collection '{load_collection_name}'"
     ) 
     ingest_to_mongodb(
-        models=crawled_data,
+        models=deduplicated_data,
         collection_name=load_collection_name,
-        clear_collection=True,
-    )   
+        clear_collection=not incremental,
+        incremental=incremental,
+        crawl_report=crawl_report,
+    )
+
+    if chunk_collection_name:
+        logger.info(
+            f"Chunking documents into MongoDB collection '{chunk_collection_name}'"
+        )
+        chunks = chunk_documents(
+            documents=deduplicated_data,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+        )
+        ingest_to_mongodb(
+            models=chunks,
+            collection_name=chunk_collection_name,
+            clear_collection=not incremental,
+            incremental=incremental,
+            upsert_key="id",
+            fingerprint_fields=list(CHUNK_CONTENT_FIELDS),
+            crawl_report=crawl_report,
+            url_field="document_url",
+        )
@@ -1,7 +1,10 @@
 # apps/med_llm_offline/run_etl.py
 
+import argparse
+
 import yaml
 from pathlib import Path
+from typing import Optional
 from pydantic import BaseModel
 
 from pipelines.etl import etl
@@ -13,6 +16,17 @@ class ETLConfig(BaseModel):
     load_collection_name: str
     max_workers: int 
     base_url: str 
+    cache_dir: Optional[str] = None
+    incremental: bool = False
+    streaming: bool = False
+    write_batch_size: int = 500
+    write_flush_interval: float = 5.0
+    drop_near_duplicates: bool = False
+    checkpoint_dir: Optional[str] = None
+    resume: bool = False
+    chunk_collection_name: Optional[str] = None
+    chunk_size: int = 512
+    chunk_overlap: int = 64
 
 
 def load_config(path: Path) -> ETLConfig:
@@ -23,10 +37,31 @@ def load_config(path: Path) -> ETLConfig:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the ETL pipeline.")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the crawl recorded in checkpoint_dir instead of starting over.",
+    )
+    args = parser.parse_args()
+
     config = load_config(CONFIG_PATH)
+    if args.resume:
+        config.resume = True
 
     etl(
         load_collection_name=config.load_collection_name,
         max_workers=config.max_workers,
         base_url=config.base_url,
+        cache_dir=config.cache_dir,
+        incremental=config.incremental,
+        streaming=config.streaming,
+        write_batch_size=config.write_batch_size,
+        write_flush_interval=config.write_flush_interval,
+        drop_near_duplicates=config.drop_near_duplicates,
+        checkpoint_dir=config.checkpoint_dir,
+        resume=config.resume,
+        chunk_collection_name=config.chunk_collection_name,
+        chunk_size=config.chunk_size,
+        chunk_overlap=config.chunk_overlap,
     )
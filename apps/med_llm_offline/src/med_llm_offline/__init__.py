@@ -1,3 +1,11 @@
-from .config import settings
-
 __all__ = ["settings"]
+
+
+def __getattr__(name: str):
+    # Settings are validated when loaded, so they are only loaded once asked for:
+    # importing e.g. the domain models must not require the environment to be set.
+    if name == "settings":
+        from .config import settings
+
+        return settings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
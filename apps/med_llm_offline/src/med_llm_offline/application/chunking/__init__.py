@@ -0,0 +1,3 @@
+from .section_chunker import ChunkingStats, SectionChunker
+
+__all__ = ["ChunkingStats", "SectionChunker"]
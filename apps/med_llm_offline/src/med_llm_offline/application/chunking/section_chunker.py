@@ -0,0 +1,232 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+from src.med_llm_offline import utils
+from src.med_llm_offline.domain import Chunk, Document
+
+
+class ChunkingStats(BaseModel):
+    """Running totals of a chunking run."""
+
+    documents: int = 0
+    sections: int = 0
+    chunks: int = 0
+    tokens: int = 0
+    seconds: float = 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.tokens / self.seconds if self.seconds else 0.0
+
+    def to_metadata(self) -> dict:
+        """Flatten the totals into step metadata."""
+        return {
+            **self.model_dump(),
+            "seconds": round(self.seconds, 3),
+            "tokens_per_second": round(self.tokens_per_second, 1),
+        }
+
+
+@lru_cache(maxsize=None)
+def _token_byte_lengths(model_id: str) -> np.ndarray:
+    """Length in bytes of every token of a model's vocabulary, indexed by token."""
+    encoding = utils.get_encoding(model_id)
+    lengths = np.zeros(encoding.n_vocab, dtype=np.int64)
+    for token in range(encoding.n_vocab):
+        try:
+            lengths[token] = len(encoding.decode_single_token_bytes(token))
+        except KeyError:
+            # Unused ids between the mergeable ranks and the special tokens.
+            continue
+    return lengths
+
+
+def _char_boundary(data: bytes, offset: int) -> int:
+    """Move a byte offset forward to the start of the next UTF-8 character."""
+    while offset < len(data) and data[offset] & 0xC0 == 0x80:
+        offset += 1
+    return offset
+
+
+def _chunk_batch(
+    documents: list[Document],
+    chunk_size: int,
+    chunk_overlap: int,
+    model_id: str,
+    num_threads: int = 1,
+) -> tuple[list[Chunk], int, int]:
+    """Chunk a batch of documents, returning the chunks, sections and tokens seen."""
+    sections = [
+        (document, key, value)
+        for document in documents
+        for key, value in document.metadata.properties.items()
+        if isinstance(value, str) and value
+    ]
+    encoding = utils.get_encoding(model_id)
+    tokens = encoding.encode_batch(
+        [text for _, _, text in sections], num_threads=num_threads, disallowed_special=()
+    )
+    byte_lengths = _token_byte_lengths(model_id)
+
+    chunks = []
+    token_total = 0
+    for (document, key, text), section_tokens in zip(sections, tokens):
+        count = len(section_tokens)
+        token_total += count
+        data = text.encode("utf-8")
+        # offsets[i] is the byte offset where token i starts, offsets[count] the end.
+        offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(byte_lengths[np.asarray(section_tokens, dtype=np.int64)], out=offsets[1:])
+
+        start, index = 0, 0
+        while start < count:
+            end = min(start + chunk_size, count)
+            byte_start = _char_boundary(data, int(offsets[start]))
+            byte_end = _char_boundary(data, int(offsets[end]))
+            chunks.append(
+                Chunk(
+                    id=f"{document.id}:{key}:{index}",
+                    document_id=document.id,
+                    document_url=document.metadata.url,
+                    document_name=document.metadata.name,
+                    section=key,
+                    chunk_index=index,
+                    content=data[byte_start:byte_end].decode("utf-8"),
+                    token_start=start,
+                    token_end=end,
+                    token_count=end - start,
+                )
+            )
+            if end == count:
+                break
+            start, index = end - chunk_overlap, index + 1
+
+    return chunks, len(sections), token_total
+
+
+class SectionChunker:
+    """
+    Splits every `properties` section of documents into token-bounded, overlapping chunks.
+
+    Each section is tokenized once. The byte length of every token of the vocabulary is
+    looked up once per process, so chunk boundaries are found from the cumulative byte
+    offsets of the tokens and the chunk text is sliced out of the section. No candidate
+    chunk is encoded or decoded again. Boundaries that fall inside a multi-byte character
+    are moved to the start of the next character, so a chunk can hold a few bytes of a
+    token just past its end, and encoding a chunk on its own can give a slightly
+    different token count than its token span.
+
+    Documents are chunked in batches on a process pool, with a few batches in flight, so
+    a catalogue of any size is streamed in constant memory.
+
+    Args:
+        chunk_size: Maximum number of tokens per chunk.
+        chunk_overlap: Number of tokens shared by consecutive chunks of a section.
+        model_id: The model name to determine encoding.
+        max_workers: Number of worker processes. Defaults to the number of CPUs. With 1,
+            documents are chunked in-process on tiktoken's threads.
+        batch_size: Number of documents per task.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 512,
+        chunk_overlap: int = 64,
+        model_id: str = "gpt-4",
+        max_workers: Optional[int] = None,
+        batch_size: int = 256,
+    ) -> None:
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive.")
+        if not 0 <= chunk_overlap < chunk_size:
+            raise ValueError("chunk_overlap must be at least 0 and less than chunk_size.")
+
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.model_id = model_id
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.batch_size = max(1, batch_size)
+        self.stats = ChunkingStats()
+
+    def chunk(self, documents: list[Document]) -> list[Chunk]:
+        """
+        Chunk a list of documents in-process.
+
+        Args:
+            documents: The documents to chunk.
+
+        Returns:
+            list[Chunk]: The chunks of every section, in document and section order.
+        """
+        batches = self.chunk_documents(documents, max_workers=1)
+        return [chunk for batch in batches for chunk in batch]
+
+    def chunk_documents(
+        self, documents: Iterable[Document], max_workers: Optional[int] = None
+    ) -> Iterator[list[Chunk]]:
+        """
+        Stream the chunks of documents, one batch of documents at a time.
+
+        Totals, including the throughput, are kept in `stats`.
+
+        Args:
+            documents: The documents to chunk. Any iterable, consumed lazily.
+            max_workers: Overrides the number of worker processes for this call.
+
+        Yields:
+            list[Chunk]: The chunks of the next batch, in document and section order.
+        """
+        self.stats = ChunkingStats()
+        workers = max_workers or self.max_workers
+        batches = self.__batches(documents)
+        started = time.perf_counter()
+
+        if workers == 1:
+            for batch in batches:
+                result = _chunk_batch(
+                    batch,
+                    self.chunk_size,
+                    self.chunk_overlap,
+                    self.model_id,
+                    num_threads=os.cpu_count() or 1,
+                )
+                yield self.__collect(len(batch), result, started)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for batch in batches:
+                future = executor.submit(
+                    _chunk_batch, batch, self.chunk_size, self.chunk_overlap, self.model_id
+                )
+                pending.append((len(batch), future))
+                if len(pending) >= 2 * workers:
+                    size, future = pending.popleft()
+                    yield self.__collect(size, future.result(), started)
+            while pending:
+                size, future = pending.popleft()
+                yield self.__collect(size, future.result(), started)
+
+    def __batches(self, documents: Iterable[Document]) -> Iterator[list[Document]]:
+        iterator = iter(documents)
+        while batch := list(islice(iterator, self.batch_size)):
+            yield batch
+
+    def __collect(
+        self, size: int, result: tuple[list[Chunk], int, int], started: float
+    ) -> list[Chunk]:
+        chunks, sections, tokens = result
+        self.stats.documents += size
+        self.stats.sections += sections
+        self.stats.chunks += len(chunks)
+        self.stats.tokens += tokens
+        self.stats.seconds = time.perf_counter() - started
+        return chunks
@@ -0,0 +1,181 @@
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from loguru import logger
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    Route,
+    async_playwright,
+)
+
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+
+@dataclass
+class _PageSlot:
+    context: BrowserContext
+    page: Page
+    generation: int
+    uses: int = 0
+
+
+class PlaywrightPagePool:
+    """
+    A long-lived Chromium browser with a fixed pool of recyclable pages.
+
+    Each slot owns its own browser context and page. A slot is handed out to one
+    scraper at a time, and its context is thrown away and recreated after
+    `max_uses_per_context` navigations or after a failure, which keeps renderer
+    memory bounded. If the browser process dies it is relaunched on the next acquire.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_uses_per_context: int = 50,
+        headless: bool = True,
+        block_resources: bool = True,
+    ) -> None:
+        """Initialize the pool with the number of pages and the recycling threshold."""
+        self.size = max(1, size)
+        self.max_uses_per_context = max_uses_per_context
+        self.headless = headless
+        self.block_resources = block_resources
+
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._generation = 0
+        self._slots: asyncio.Queue[_PageSlot] = asyncio.Queue()
+        self._browser_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "PlaywrightPagePool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """Start the Playwright driver, launch the browser and fill the pool."""
+        self._playwright = await async_playwright().start()
+        await self.__launch_browser()
+
+        for _ in range(self.size):
+            self._slots.put_nowait(await self.__new_slot())
+
+        logger.info(f"Started browser pool with {self.size} pages.")
+
+    async def close(self) -> None:
+        """Close every page, the browser and the Playwright driver."""
+        while not self._slots.empty():
+            await self.__close_slot(self._slots.get_nowait())
+
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception as e:
+                logger.warning(f"Failed to close browser cleanly: {e}")
+            self._browser = None
+
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+        logger.info("Closed browser pool.")
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """
+        Borrow a healthy page from the pool.
+
+        The page is returned to the pool on exit. If the caller raised, the slot is
+        recycled so that a broken page is never handed out again.
+        """
+        slot = await self.__acquire()
+        healthy = True
+
+        try:
+            yield slot.page
+        except BaseException:
+            healthy = False
+            raise
+        finally:
+            slot.uses += 1
+            await self.__release(slot, healthy)
+
+    async def __acquire(self) -> _PageSlot:
+        slot = await self._slots.get()
+
+        try:
+            if not self.__is_healthy(slot):
+                if not self._browser.is_connected():
+                    await self.__relaunch_browser(slot.generation)
+                await self.__close_slot(slot)
+                slot = await self.__new_slot()
+        except BaseException:
+            # Never leak a slot, otherwise the pool would shrink permanently.
+            self._slots.put_nowait(slot)
+            raise
+
+        return slot
+
+    async def __release(self, slot: _PageSlot, healthy: bool) -> None:
+        if healthy and slot.uses < self.max_uses_per_context:
+            self._slots.put_nowait(slot)
+            return
+
+        await self.__close_slot(slot)
+        try:
+            slot = await self.__new_slot()
+        except Exception as e:
+            # Keep the stale slot in the pool; the next acquire will retry the rebuild.
+            logger.error(f"Failed to recycle browser page: {e}")
+
+        self._slots.put_nowait(slot)
+
+    def __is_healthy(self, slot: _PageSlot) -> bool:
+        return (
+            self._browser is not None
+            and self._browser.is_connected()
+            and slot.generation == self._generation
+            and not slot.page.is_closed()
+        )
+
+    async def __launch_browser(self) -> None:
+        self._browser = await self._playwright.chromium.launch(headless=self.headless)
+        self._generation += 1
+
+    async def __relaunch_browser(self, generation: int) -> None:
+        async with self._browser_lock:
+            # Another scraper may have relaunched the browser while we waited.
+            if generation != self._generation or self._browser.is_connected():
+                return
+
+            logger.warning("Browser disconnected, relaunching.")
+            await self.__launch_browser()
+
+    async def __new_slot(self) -> _PageSlot:
+        context = await self._browser.new_context()
+        if self.block_resources:
+            await context.route("**/*", self.__block_heavy_resources)
+
+        page = await context.new_page()
+        return _PageSlot(context=context, page=page, generation=self._generation)
+
+    async def __close_slot(self, slot: _PageSlot) -> None:
+        try:
+            await slot.context.close()
+        except Exception as e:
+            logger.debug(f"Ignoring error while closing browser context: {e}")
+
+    @staticmethod
+    async def __block_heavy_resources(route: Route) -> None:
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
@@ -1,6 +1,8 @@
 import asyncio
 
-import random
+from contextlib import AsyncExitStack, nullcontext
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
 
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
@@ -11,12 +13,23 @@ from crawl4ai import (
     CacheMode,
 )
 
-from playwright.async_api import async_playwright
-
 from loguru import logger
 
 from src.med_llm_offline import utils
-from src.med_llm_offline.domain import Document, DocumentMetadata
+from src.med_llm_offline.domain import CrawlReport, Document, DocumentMetadata
+from src.med_llm_offline.infrastructure.cache import ResponseCache
+from src.med_llm_offline.infrastructure.checkpoint import CrawlJournal
+from src.med_llm_offline.infrastructure.mongo import MongoBatchWriter
+from src.med_llm_offline.metrics import MetricsRegistry
+
+from .browser_pool import PlaywrightPagePool
+from .extraction import EXTRACTOR_VERSION, extract_product
+from .http_fetcher import HttpFetcher, HttpStatusError
+from .scheduler import HostScheduler, RequestOutcome, RetryQueue, until_failure
+
+LISTING_FETCH_TRIES = 2
+PRODUCT_RETRIES = 3
+REQUIRED_PROPERTIES = ("specification",)
 
 
 class Crawl4AIMedicineCrawler:
@@ -29,12 +42,45 @@ class Crawl4AIMedicineCrawler:
     def __init__(
             self, 
             max_concurrent_requests: int,
-            base_url: str
+            base_url: str,
+            start_page: int = 1,
+            listing_prefetch: int = 3,
+            use_http_first: bool = True,
+            cache_dir: Optional[Path] = None,
+            document_writer: Optional[MongoBatchWriter] = None,
+            metrics: Optional[MetricsRegistry] = None,
+            checkpoint_dir: Optional[Path] = None,
+            resume: bool = False,
     ) -> None:
         """Initialize the crawler with the maximum number of concurrent requests and base URL."""
-        self.max_concurrent_requests = max_concurrent_requests
+        if resume and checkpoint_dir is None:
+            raise ValueError("Resuming a crawl requires a checkpoint_dir.")
+
+        self.max_concurrent_requests = max(1, max_concurrent_requests)
         self.base_url = base_url
+        self.start_page = start_page
+        self.listing_prefetch = max(1, listing_prefetch)
         self.failed_urls = []
+        self.skipped_pages = []
+        self.use_http_first = use_http_first
+        self.page_pool: PlaywrightPagePool | None = None
+        self.http_fetcher: HttpFetcher | None = None
+        self.cache_dir = cache_dir
+        self.document_writer = document_writer
+        self.documents_scraped = 0
+        self.response_cache: ResponseCache | None = None
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        self.checkpoint_dir = checkpoint_dir
+        self.resume = resume
+        self.journal: CrawlJournal | None = None
+        self.scheduler: HostScheduler | None = None
+        self.retry_queue: RetryQueue | None = None
+        self.fetch_stats = {
+            "http": 0,
+            "browser_fallback": 0,
+            "cache_fresh": 0,
+            "not_modified": 0,
+        }
 
     def __call__(self) -> list[dict]:
         """Run the crawler and return the scraped data."""
@@ -45,28 +91,58 @@ class Crawl4AIMedicineCrawler:
         else:
             return loop.run_until_complete(self.__crawl())
         
-    async def check_no_results(
-        self, 
-        crawler: AsyncWebCrawler, 
-        url: str, 
-        session_id: str) -> bool:
-        """Check if the page has no results."""
-        result = await crawler.arun(
-            url=url,
-            crawler=CrawlerRunConfig(
-                cache_mode=CacheMode.BYPASS,
-                session_id=session_id,
-            ),
+    @property
+    def crawl_report(self) -> CrawlReport:
+        """The product pages and listing pages this crawl could not reach."""
+        return CrawlReport(
+            failed_urls=list(self.failed_urls), skipped_pages=sorted(self.skipped_pages)
         )
 
-        if result.success:
-            if "Page Not Found" in result.cleaned_html:
-                logger.warning(f"No results found for {url}")
-                return True
+    async def fetch_listing_page(
+        self,
+        crawler: AsyncWebCrawler,
+        page_number: int,
+    ) -> Optional[list[str]]:
+        """
+        Fetch a listing page once and return its product links.
+
+        An empty list means the site answered that the page does not exist, i.e. it is
+        past the last page. None means the page could not be fetched, which says
+        nothing about where the catalogue ends. Pages recorded in the checkpoint
+        journal are not fetched again.
+        """
+        if self.journal is not None and page_number in self.journal.pages:
+            return self.journal.pages[page_number]
+
+        url = f"{self.base_url}/cat/medicine?page={page_number}"
+        logger.info(f"Fetching page {page_number} from {url}")
+
+        for attempt in range(1, LISTING_FETCH_TRIES + 1):
+            if attempt > 1:
+                self.metrics.increment("listing_fetch_retries")
+            with self.metrics.time("listing_fetch"):
+                async with self.__schedule(url) as outcome:
+                    result = await crawler.arun(
+                        url=url,
+                        config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS),
+                    )
+                    outcome.status = getattr(result, "status_code", None)
+            if result.success:
+                break
+
+            logger.error(f"Failed to fetch {url} (attempt {attempt}): {result.error_message}")
         else:
-            logger.error(f"Failed to fetch {url}: {result.error_message}")
-        
-        return False
+            self.metrics.increment("listing_fetch_failures")
+            return None
+
+        self.metrics.increment("listing_pages_fetched")
+
+        if "Page Not Found" in (result.cleaned_html or ""):
+            logger.warning(f"No results found for {url}")
+            return []
+
+        soup = BeautifulSoup(result.html, "html.parser")
+        return self.extract_product_links(soup)
 
     def extract_product_links(self, soup: BeautifulSoup) -> list[str]:
         """Extract product links from the soup object."""
@@ -82,123 +158,428 @@ class Crawl4AIMedicineCrawler:
 
         return list(set(links))
 
+    def parse_product_page(self, url: str, html: str) -> Document:
+        """Extract the product name and its sections from a product page."""
+        with self.metrics.time("html_parse"):
+            name, properties = extract_product(html)
+
+        with self.metrics.time("document_build"):
+            doc_id = utils.document_id(url)
+            return Document(
+                id=doc_id,
+                metadata=DocumentMetadata(
+                    id=doc_id,
+                    url=url,
+                    name=name,
+                    properties=properties,
+                ).parse_specification(),
+            )
+
+    @staticmethod
+    def has_required_sections(document: Document) -> bool:
+        """Check that a parsed page has a name and every required section."""
+        metadata = document.metadata
+        return metadata.name != "Unknown" and all(
+            metadata.properties.get(key) for key in REQUIRED_PROPERTIES
+        )
+
+    async def scrape_product(self, url: str) -> dict:
+        """
+        Scrape a product page, trying a plain HTTP fetch before a browser render.
+
+        The browser is only used when a 200 response lacks a required section, e.g.
+        because that part of the page is rendered client-side. With a response cache,
+        the request is conditional and a page the server reports as unchanged (304, or
+        an identical body) reuses the previously extracted document.
+
+        Raises:
+            HttpStatusError: If the page is served with any other status. Rendering it
+                in the browser would only add load to a throttled or failing site, so
+                the product is retried later instead.
+            httpx.HTTPError: If the request fails without a response.
+        """
+        if self.http_fetcher is None:
+            return await self.scrape_with_playwright(url)
+
+        entry = self.response_cache.get(url) if self.response_cache else None
+        if entry is not None and not entry.document:
+            entry = None
+
+        if entry is not None and self.response_cache.is_fresh(entry):
+            self.fetch_stats["cache_fresh"] += 1
+            return Document.model_validate(entry.document)
+
+        headers = self.response_cache.conditional_headers(entry) if self.response_cache else None
+        with self.metrics.time("http_fetch"):
+            response = await self.http_fetcher.fetch(url, headers=headers)
+        if response.status_code not in (200, 304) or (
+            response.status_code == 304 and entry is None
+        ):
+            raise HttpStatusError(url, response.status_code)
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+        if entry is not None and (
+            response.status_code == 304
+            or self.response_cache.hash_body(response.content) == entry.body_hash
+        ):
+            self.response_cache.revalidated(entry, etag=etag, last_modified=last_modified)
+            self.fetch_stats["not_modified"] += 1
+            logger.debug(f"{url} is unchanged, reusing the cached document")
+            return Document.model_validate(entry.document)
+
+        body = response.content
+        document = self.parse_product_page(url, body.decode("utf-8", errors="replace"))
+        if self.has_required_sections(document):
+            self.fetch_stats["http"] += 1
+            logger.info(f"Extracted data for {url}")
+        else:
+            self.fetch_stats["browser_fallback"] += 1
+            logger.debug(f"Falling back to the browser for {url}")
+            document = await self.scrape_with_playwright(url)
+
+        if self.response_cache is not None and document:
+            # Keyed on the HTTP body even when the browser did the extraction, so a
+            # page that needs the browser is only rendered again once it changes.
+            self.response_cache.put(
+                url,
+                body,
+                etag=etag,
+                last_modified=last_modified,
+                document=document.model_dump(mode="json"),
+            )
+
+        return document
+
     async def scrape_with_playwright(self, url: str) -> dict:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
+        try:
+            async with self.page_pool.page() as page:
+                with self.metrics.time("browser_render"):
+                    async with self.__schedule(url) as outcome:
+                        response = await page.goto(url, timeout=20000)
+                        outcome.status = response.status if response else None
+                    await page.wait_for_selector('h2', timeout=10000)
+
+                    html = await page.content()
+
+            document = self.parse_product_page(url, html)
+            logger.info(f"Extracted data for {url}")
+
+            return document
+        except Exception as e:
+            logger.error(f"Failed to scrape {url}: {e}")
+            self.metrics.increment("product_failures")
+            return {}
+
+    def __schedule(self, url: str):
+        """Run a request under the host scheduler, if the crawl has one."""
+        if self.scheduler is None:
+            return nullcontext(RequestOutcome())
+        return self.scheduler.request(url)
+
+    async def __find_last_page(
+        self,
+        crawler: AsyncWebCrawler,
+        first_page: int,
+        on_page: Callable[[int, list[str]], Awaitable[None]],
+    ) -> int:
+        """
+        Find the last listing page, given that `first_page` exists.
+
+        Probes first_page + 1, + 2, + 4, ... until a page is missing, then bisects
+        between the last page found and the first page missing. Every existing page
+        fetched along the way is handed to `on_page` so its products can be scraped
+        right away instead of being fetched again.
+        """
+        last_found = first_page
+        step = 1
+
+        while True:
+            probe = first_page + step
+            links = await self.__fetch_probe(crawler, probe)
+            if not links:
+                first_missing = probe
+                break
+
+            await on_page(probe, links)
+            last_found = probe
+            step *= 2
+
+        while first_missing - last_found > 1:
+            middle = (last_found + first_missing) // 2
+            links = await self.__fetch_probe(crawler, middle)
+            if links:
+                await on_page(middle, links)
+                last_found = middle
+            else:
+                first_missing = middle
+
+        logger.info(f"Last listing page is {last_found}.")
+        return last_found
+
+    async def __fetch_probe(self, crawler: AsyncWebCrawler, page_number: int) -> list[str]:
+        """Fetch a listing page whose existence decides the last page, or raise."""
+        links = await self.fetch_listing_page(crawler, page_number)
+        if links is None:
+            # Taking a failed fetch for a missing page would silently cut the crawl
+            # short, and the journal would keep that page count for resumed runs.
+            raise RuntimeError(
+                f"Cannot find the last listing page, fetching page {page_number} failed."
+            )
+        return links
+
+    async def __discover_products(
+        self,
+        crawler: AsyncWebCrawler,
+        links_queue: asyncio.Queue,
+    ) -> None:
+        """
+        Producer that feeds product links from every listing page into `links_queue`.
+
+        Pages left over after the last-page search are fetched `listing_prefetch` at a
+        time. A page only holds its slot until its links fit in the queue, so discovery
+        never runs more than a few pages ahead of the scrapers.
+        """
+        fetched_pages = set()
+        seen_links = set()
+
+        if self.journal is not None:
+            # Products scraped before a restart are replayed from the journal.
+            seen_links.update(self.journal.scraped_urls)
+
+        async def enqueue(page_number: int, links: list[str]) -> None:
+            fetched_pages.add(page_number)
+            new_links = [link for link in links if link not in seen_links]
+            seen_links.update(new_links)
+
+            logger.info(f"Found {len(new_links)} product links on page {page_number}")
+            for link in new_links:
+                await links_queue.put(link)
+                self.metrics.gauge("links_queue_depth", links_queue.qsize())
+
+            if self.journal is not None and page_number not in self.journal.pages:
+                self.journal.record_page(page_number, links)
+
+        links = await self.__fetch_probe(crawler, self.start_page)
+        if not links:
+            logger.info("No product links found, stopping the crawl.")
+            return
+        await enqueue(self.start_page, links)
+
+        if self.journal is not None and self.journal.last_page is not None:
+            last_page = self.journal.last_page
+        else:
+            last_page = await self.__find_last_page(crawler, self.start_page, enqueue)
+            if self.journal is not None:
+                self.journal.record_last_page(last_page)
+
+        prefetch = asyncio.Semaphore(self.listing_prefetch)
+
+        async def fetch_and_enqueue(page_number: int) -> None:
+            async with prefetch:
+                links = await self.fetch_listing_page(crawler, page_number)
+                if links is None:
+                    # Not recorded in the journal, so a resumed run fetches it again.
+                    logger.error(f"Skipping listing page {page_number}, it could not be fetched.")
+                    self.skipped_pages.append(page_number)
+                    return
+                await enqueue(page_number, links)
+
+        await asyncio.gather(
+            *(
+                fetch_and_enqueue(page_number)
+                for page_number in range(self.start_page, last_page + 1)
+                if page_number not in fetched_pages
+            )
+        )
 
+    async def __stop_workers(
+        self,
+        links_queue: asyncio.Queue,
+        workers: list[asyncio.Task],
+        retry_workers: list[asyncio.Task],
+    ) -> None:
+        """Let the workers finish the queued links and pending retries, then stop them."""
+        for _ in workers:
+            await links_queue.put(None)
+        await asyncio.gather(*workers)
+
+        await self.retry_queue.join()
+        await self.retry_queue.close()
+        await asyncio.gather(*retry_workers)
+
+    async def __scrape_worker(
+        self,
+        links_queue: asyncio.Queue,
+        medicines: list[Document],
+    ) -> None:
+        """Consumer that scrapes product links until it receives the `None` sentinel."""
+        while True:
+            link = await links_queue.get()
+            if link is None:
+                return
+
+            self.metrics.gauge("links_queue_depth", links_queue.qsize())
+            await self.__scrape_once(link, 0, medicines)
+
+    async def __retry_worker(self, medicines: list[Document]) -> None:
+        """Consumer that retries failed product links as their backoff expires."""
+        while True:
+            item = await self.retry_queue.get()
+            if item is None:
+                return
+
+            link, attempt = item
             try:
-                await page.goto(url, timeout=20000)
-                await page.wait_for_selector('h2', timeout=10000)
-
-                html = await page.content()
-                soup = BeautifulSoup(html, "html.parser")
-
-                def extract_section(title):
-                    h2 = soup.find('h2', string=lambda t: t and title.lower() in t.lower())
-                    if h2:
-                        content = []
-                        for sibling in h2.find_next_siblings():
-                            if sibling.name == 'h2':
-                                break
-                            content.append(sibling.get_text(" ", strip=True))
-                        return "\n".join(content).strip()
-                    return ""
-
-                name_tag = soup.find('h1')
-                name = name_tag.get_text(strip=True) if name_tag else "Unknown"
-
-                logger.info(f"Extracted data for {url}")
-
-                doc_id = utils.generate_random_hex(length=32)
-                return Document(
-                    id=doc_id,
-                    metadata=DocumentMetadata(
-                        id=doc_id,
-                        url=url,
-                        name=name,
-                        properties={
-                            "specification": extract_section("Specification"),
-                            "usage_and_safety": extract_section("Usage and Safety"),
-                            "precautions": extract_section("Precautions"),
-                            "warnings": extract_section("Warnings"),
-                            "additional_information": extract_section("Additional Information"),
-                        },
-                    ),
-                )
-            except Exception as e:
-                logger.error(f"Failed to scrape {url}: {e}")
-                self.failed_urls.append(url)
-                return {}
+                logger.info(f"Retrying {link} (attempt {attempt + 1} of {PRODUCT_RETRIES})")
+                await self.__scrape_once(link, attempt + 1, medicines)
             finally:
-                await browser.close()
+                await self.retry_queue.task_done()
+
+    async def __scrape_once(self, link: str, retries: int, medicines: list[Document]) -> None:
+        """Scrape a product, scheduling a retry with backoff if it fails."""
+        try:
+            with self.metrics.time("product_scrape"):
+                medicine = await self.scrape_product(link)
+        except HttpStatusError as e:
+            if e.gone:
+                # Not a failure: the product was removed, so syncs may drop it.
+                logger.warning(f"Skipping {link}, it is no longer available: {e}")
+                self.metrics.increment("products_gone")
+                return
+            logger.error(f"Failed to scrape {link}: {e}")
+            self.metrics.increment("product_failures")
+            medicine = None
+        except Exception as e:
+            logger.error(f"Failed to scrape {link}: {e}")
+            self.metrics.increment("product_failures")
+            medicine = None
+
+        if medicine:
+            await self.__emit(medicine, medicines)
+        elif retries < PRODUCT_RETRIES and self.retry_queue is not None:
+            delay = await self.retry_queue.schedule(link, retries)
+            self.metrics.increment("product_retries")
+            logger.warning(f"Scraping {link} failed, retrying in {delay:.2f} seconds.")
+        else:
+            logger.error(f"Giving up on {link} after {retries} retries.")
+            self.metrics.increment("products_abandoned")
+            self.failed_urls.append(link)
+
+    async def __emit(
+        self, medicine: Document, medicines: list[Document], record: bool = True
+    ) -> None:
+        """Hand a scraped document to the writer when streaming, else collect it."""
+        if record and self.journal is not None:
+            self.journal.record_document(
+                medicine.metadata.url, medicine.model_dump(mode="json")
+            )
+
+        self.documents_scraped += 1
+        self.metrics.increment("products_scraped")
+        if self.document_writer is not None:
+            await self.document_writer.put(medicine)
+        else:
+            medicines.append(medicine)
 
     async def __crawl(self) -> list[dict]:
         browser_congig = utils.get_browser_config()
-        session_id = "dvgao_crawler_session"
-        page_number = 175 #temp
         all_medicines = []
+        self.scheduler = HostScheduler(
+            max_concurrency=self.max_concurrent_requests, metrics=self.metrics
+        )
+        self.retry_queue = RetryQueue()
+
+        async with (
+            PlaywrightPagePool(size=self.max_concurrent_requests) as self.page_pool,
+            AsyncWebCrawler(config=browser_congig) as crawler,
+            AsyncExitStack() as stack,
+        ):
+            if self.document_writer is not None:
+                await stack.enter_async_context(self.document_writer)
+            if self.use_http_first:
+                self.http_fetcher = await stack.enter_async_context(
+                    HttpFetcher(
+                        max_connections=self.max_concurrent_requests,
+                        scheduler=self.scheduler,
+                    )
+                )
+                if self.cache_dir is not None:
+                    self.response_cache = stack.enter_context(
+                        ResponseCache(self.cache_dir, extractor_version=EXTRACTOR_VERSION)
+                    )
+            if self.checkpoint_dir is not None:
+                self.journal = stack.enter_context(
+                    CrawlJournal(
+                        self.checkpoint_dir,
+                        base_url=self.base_url,
+                        start_page=self.start_page,
+                        resume=self.resume,
+                    )
+                )
+                # Documents from a previous run are handed on again: the writer upserts
+                # by URL, so those that already reached MongoDB are left as they are.
+                for document in self.journal.documents:
+                    await self.__emit(
+                        Document.model_validate(document), all_medicines, record=False
+                    )
+                self.journal.documents = []
+
+            # Scraped products are collected in completion order; at most
+            # max_concurrent_requests scrapes run at once. Failed products are retried
+            # by a smaller pool while the crawl goes on.
+            links_queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrent_requests * 2)
+            workers = [
+                asyncio.create_task(self.__scrape_worker(links_queue, all_medicines))
+                for _ in range(self.max_concurrent_requests)
+            ]
+            retry_workers = [
+                asyncio.create_task(self.__retry_worker(all_medicines))
+                for _ in range(max(1, self.max_concurrent_requests // 2))
+            ]
+            background = [*workers, *retry_workers]
+
+            try:
+                await until_failure(self.__discover_products(crawler, links_queue), background)
+                await until_failure(
+                    self.__stop_workers(links_queue, workers, retry_workers), background
+                )
+            finally:
+                # On the abort path the workers are cancelled rather than stopped with
+                # sentinels: they may be dead already, leaving nobody to consume them.
+                for task in background:
+                    task.cancel()
+                await asyncio.gather(*background, return_exceptions=True)
+
+            if self.failed_urls:
+                logger.error(
+                    f"Failed to scrape {len(self.failed_urls)} urls after "
+                    f"{PRODUCT_RETRIES} retries: {self.failed_urls}"
+                )
+            # Set before the writer exits, so products the crawl could not reach are
+            # not mistaken for products removed from the site.
+            if self.document_writer is not None:
+                self.document_writer.crawl_report = self.crawl_report
+
+        self.http_fetcher = None
+        self.response_cache = None
+        self.journal = None
+        self.retry_queue = None
+        for host, stats in self.scheduler.stats().items():
+            logger.info(f"Settled {host} at {stats}")
+        if self.use_http_first:
+            total = self.fetch_stats["http"] + self.fetch_stats["browser_fallback"]
+            logger.info(
+                f"Served {self.fetch_stats['http']}/{total} product pages over plain HTTP, "
+                f"{self.fetch_stats['browser_fallback']} fell back to the browser."
+            )
+            if self.cache_dir is not None:
+                logger.info(
+                    f"Reused {self.fetch_stats['cache_fresh']} fresh and "
+                    f"{self.fetch_stats['not_modified']} revalidated cached product pages."
+                )
 
-        async with AsyncWebCrawler(config=browser_congig) as crawler:
-            while True:
-                url = f"{self.base_url}/cat/medicine?page={page_number}"
-                logger.info(f"Fetching page {page_number} from {url}")
-
-                no_results = await self.check_no_results(crawler, url, session_id)
-                if no_results:
-                    logger.info("No more results found, stopping the crawl.")
-                    break
-
-                res = await crawler.arun(url=url)
-                soup = BeautifulSoup(res.html, "html.parser")
-                links = self.extract_product_links(soup)
-                if not links:
-                    logger.info("No product links found, stopping the crawl.")
-                    break
-                
-                logger.info(f"Found {len(links)} product links on page {page_number}")
-                for link in links:
-                    medicine = await self.scrape_with_playwright(link)
-                    if medicine:
-                        all_medicines.append(medicine)
-
-                await asyncio.sleep(2)
-                page_number += 1
-
-        if self.failed_urls:
-            logger.error(f"Failed to scrape {len(self.failed_urls)} urls.")
-            logger.info("Retrying failed URLs...")
-
-            MAX_TRIES = 1
-            retry_counts = {}
-            retry_failed = []
-            failed_urls = self.failed_urls.copy()
-            self.failed_urls = []
-
-            while failed_urls:
-                url = failed_urls.pop(0)
-                count = retry_counts.get(url, 0)
-
-                if count >= MAX_TRIES:
-                    retry_failed.append(url)
-                    logger.error(f"Max retries reached for {url}. Skipping.")
-                    continue
-                
-                logger.info(f"Retrying {url} (Attempt {count + 1})")
-                medicine = await self.scrape_with_playwright(url)
-                
-                if medicine:    
-                    all_medicines.append(medicine)
-                    logger.info(f"Successfully scraped {url} on attempt {count + 1}.")
-                else:
-                    retry_counts[url] = count + 1
-                    failed_urls.append(url)
-
-                    wait = min(2 ** count + random.uniform(0.1, 1.0), 10)
-                    logger.warning(f"Retry {count + 1} failed for {url}, waiting {wait:.2f} seconds before next attempt.")
-
-            logger.info(f"Final skipped URLs after {MAX_TRIES}: {retry_failed}")
-
-        logger.info(f"Crawled {len(all_medicines)} medicines.")
+        logger.info(f"Crawled {self.documents_scraped} medicines.")
         return all_medicines
     
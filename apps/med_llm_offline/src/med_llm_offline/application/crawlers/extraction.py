@@ -0,0 +1,83 @@
+from lxml import etree
+from lxml import html as lxml_html
+
+# Property key -> text the section heading must contain (case-insensitive).
+PRODUCT_SECTIONS = {
+    "specification": "Specification",
+    "usage_and_safety": "Usage and Safety",
+    "precautions": "Precautions",
+    "warnings": "Warnings",
+    "additional_information": "Additional Information",
+}
+
+_NON_TEXT_TAGS = ("script", "style", "template")
+
+# Version of the documents built from a product page. Bump it whenever the extraction
+# or the Document model changes, so cached documents are extracted again.
+EXTRACTOR_VERSION = "2"
+
+
+def _text(element: etree._Element, separator: str) -> str:
+    """Join the stripped, non-empty text fragments of an element, like BeautifulSoup's get_text."""
+    return separator.join(
+        fragment.strip() for fragment in element.itertext() if fragment.strip()
+    )
+
+
+def extract_product(html: str) -> tuple[str, dict[str, str]]:
+    """
+    Extract the product name and its sections from a product page in a single pass.
+
+    The page is parsed with lxml and the `h1`/`h2` headings are visited once, in
+    document order. Each `h2` is matched against every section title still missing, and
+    the text of its following siblings up to the next `h2` becomes that section.
+
+    Args:
+        html: The product page.
+
+    Returns:
+        The product name ("Unknown" if there is no `h1`) and a dict with one entry per
+        key of `PRODUCT_SECTIONS`, empty if the page lacks that section.
+    """
+    name = "Unknown"
+    properties = {key: "" for key in PRODUCT_SECTIONS}
+
+    try:
+        tree = lxml_html.fromstring(html)
+    except (etree.ParserError, ValueError):
+        return name, properties
+
+    etree.strip_elements(tree, *_NON_TEXT_TAGS, with_tail=False)
+
+    missing = {key: title.lower() for key, title in PRODUCT_SECTIONS.items()}
+    found_name = False
+
+    for heading in tree.iter("h1", "h2"):
+        if heading.tag == "h1":
+            if not found_name:
+                name = _text(heading, "")
+                found_name = True
+            continue
+
+        if not missing:
+            continue
+
+        heading_text = _text(heading, " ").lower()
+        matches = [key for key, title in missing.items() if title in heading_text]
+        if not matches:
+            continue
+
+        content = []
+        for sibling in heading.itersiblings():
+            if not isinstance(sibling.tag, str):
+                continue
+            if sibling.tag == "h2":
+                break
+            content.append(_text(sibling, " "))
+        section = "\n".join(content).strip()
+
+        for key in matches:
+            properties[key] = section
+            del missing[key]
+
+    return name, properties
@@ -0,0 +1,117 @@
+from contextlib import nullcontext
+from typing import Optional
+
+import httpx
+
+from loguru import logger
+
+from .scheduler import HostScheduler, RequestOutcome
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/126.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml",
+}
+# Statuses meaning the page was removed, so retrying or rendering it is pointless.
+GONE_STATUSES = (404, 410)
+
+
+class HttpStatusError(Exception):
+    """Raised for a page served with a status other than 200 or 304."""
+
+    def __init__(self, url: str, status: int) -> None:
+        super().__init__(f"{url} returned HTTP {status}")
+        self.url = url
+        self.status = status
+
+    @property
+    def gone(self) -> bool:
+        """Whether the page was removed, rather than temporarily unavailable."""
+        return self.status in GONE_STATUSES
+
+
+class HttpFetcher:
+    """
+    A pooled async HTTP client for server-rendered pages.
+
+    Connections are kept alive and multiplexed over HTTP/2 where the server supports
+    it, so most product pages cost a single request on an already open connection.
+    With a scheduler, every request waits for its host's rate and concurrency limits
+    and reports its status back to it.
+    """
+
+    def __init__(
+        self,
+        max_connections: int,
+        timeout: float = 20.0,
+        scheduler: Optional[HostScheduler] = None,
+    ) -> None:
+        """Initialize the fetcher with the connection pool size and request timeout."""
+        self.max_connections = max(1, max_connections)
+        self.timeout = timeout
+        self.scheduler = scheduler
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "HttpFetcher":
+        self._client = httpx.AsyncClient(
+            http2=True,
+            follow_redirects=True,
+            headers=DEFAULT_HEADERS,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def fetch(
+        self, url: str, headers: Optional[dict[str, str]] = None
+    ) -> httpx.Response:
+        """
+        Fetch a page, optionally as a conditional request.
+
+        Args:
+            url: The page to fetch.
+            headers: Extra request headers, e.g. If-None-Match / If-Modified-Since.
+
+        Returns:
+            The response, whatever its status. Throttling and server errors are left to
+            the caller, which retries them later rather than hitting the site again.
+
+        Raises:
+            httpx.HTTPError: If the request fails without a response.
+        """
+        slot = self.scheduler.request(url) if self.scheduler else nullcontext(RequestOutcome())
+        try:
+            async with slot as outcome:
+                response = await self._client.get(url, headers=headers)
+                outcome.status = response.status_code
+                outcome.retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        except httpx.HTTPError as e:
+            logger.debug(f"HTTP fetch failed for {url}: {e}")
+            raise
+
+        if response.status_code not in (200, 304):
+            logger.debug(f"HTTP fetch for {url} returned {response.status_code}")
+
+        return response
+
+    async def close(self) -> None:
+        """Close the underlying connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds; HTTP dates are ignored."""
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
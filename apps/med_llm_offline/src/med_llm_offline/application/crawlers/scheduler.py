@@ -0,0 +1,394 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Iterable, Optional
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from src.med_llm_offline.metrics import MetricsRegistry
+
+ERROR_WINDOW = 20
+
+
+@dataclass
+class RequestOutcome:
+    """What a scheduled request reports back: its status and an optional Retry-After."""
+
+    status: Optional[int] = None
+    retry_after: Optional[float] = None
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` requests per second with bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.paused_until = 0.0
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self._updated_at) * self.rate
+                )
+                self._updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for the next `seconds`, e.g. after a Retry-After."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class AIMDLimiter:
+    """
+    Concurrency limit adjusted by additive increase, multiplicative decrease.
+
+    Every clean request raises the limit by 1 / limit, i.e. by about one slot per
+    window of requests. Congestion multiplies it by `decrease_factor`, at most once per
+    `cooldown` seconds so that one burst of errors from requests already in flight
+    only counts once.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float,
+        min_limit: float = 1.0,
+        max_limit: float = 64.0,
+        decrease_factor: float = 0.5,
+        cooldown: float = 1.0,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max(min_limit, max_limit)
+        self.limit = min(max(initial_limit, min_limit), self.max_limit)
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._decreased_at = float("-inf")
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def increase(self) -> None:
+        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def decrease(self) -> bool:
+        """Back off, unless that already happened within the cooldown. Returns whether it did."""
+        now = time.monotonic()
+        if now - self._decreased_at < self.cooldown:
+            return False
+
+        self._decreased_at = now
+        self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        return True
+
+
+class _HostState:
+    def __init__(self, bucket: TokenBucket, limiter: AIMDLimiter) -> None:
+        self.bucket = bucket
+        self.limiter = limiter
+        self.latency_ewma: Optional[float] = None
+        self.slow_start = True
+        # Whether each of the last ERROR_WINDOW requests failed or got a 5xx.
+        self.recent_errors: deque[bool] = deque(maxlen=ERROR_WINDOW)
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+
+
+class HostScheduler:
+    """
+    Per-host request scheduler with a token bucket and AIMD adaptive concurrency.
+
+    Each host gets its own request rate and concurrency limit. Both grow additively
+    while requests succeed, and both are cut multiplicatively as soon as the host
+    answers 429, more than `max_error_rate` of its recent requests failed or got a 5xx,
+    or the average latency exceeds `target_latency`. Until the first sign of
+    congestion the rate grows by one request per second per clean request, i.e. it
+    doubles every second, like TCP's slow start. The crawl therefore settles close to
+    the highest rate the site tolerates. A Retry-After header additionally pauses the
+    host for that long.
+
+    Args:
+        max_concurrency: Upper bound of the per-host concurrency limit.
+        initial_concurrency: Starting concurrency limit, `max_concurrency` if not given.
+        initial_rate: Starting request rate, in requests per second.
+        min_rate: Lower bound of the request rate.
+        max_rate: Upper bound of the request rate.
+        rate_step: Requests per second added to the rate per second of clean requests.
+        target_latency: Average latency, in seconds, above which the host counts as
+            congested.
+        max_error_rate: Share of failed or 5xx requests among the last few above which
+            the host counts as congested.
+        decrease_factor: Factor applied to the rate and the limit on congestion.
+        metrics: Registry that records throttling and the current limits, if any.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        initial_concurrency: Optional[int] = None,
+        initial_rate: float = 5.0,
+        min_rate: float = 0.5,
+        max_rate: float = 50.0,
+        rate_step: float = 1.0,
+        target_latency: float = 5.0,
+        max_error_rate: float = 0.2,
+        decrease_factor: float = 0.5,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.initial_concurrency = initial_concurrency or self.max_concurrency
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max(min_rate, max_rate)
+        self.rate_step = rate_step
+        self.target_latency = target_latency
+        self.max_error_rate = max_error_rate
+        self.decrease_factor = decrease_factor
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        self._hosts: dict[str, _HostState] = {}
+
+    @asynccontextmanager
+    async def request(self, url: str) -> AsyncIterator[RequestOutcome]:
+        """
+        Wait for a slot and a token for the URL's host, then run the request.
+
+        The caller sets `status` (and `retry_after`, if the server sent one) on the
+        yielded outcome. An exception raised by the request counts as a failure.
+        """
+        host = self.__host(urlparse(url).netloc)
+        await host.limiter.acquire()
+        outcome = RequestOutcome()
+        failed = False
+        try:
+            await host.bucket.acquire()
+            start = time.monotonic()
+            try:
+                yield outcome
+            except Exception:
+                failed = True
+                raise
+            finally:
+                self.__record(url, host, outcome, time.monotonic() - start, failed)
+        finally:
+            await host.limiter.release()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Current limits and counters per host."""
+        return {
+            name: {
+                "concurrency_limit": round(host.limiter.limit, 2),
+                "rate": round(host.bucket.rate, 2),
+                "latency_ewma": round(host.latency_ewma or 0.0, 4),
+                "requests": host.requests,
+                "throttled": host.throttled,
+                "errors": host.errors,
+            }
+            for name, host in self._hosts.items()
+        }
+
+    def __host(self, name: str) -> _HostState:
+        host = self._hosts.get(name)
+        if host is None:
+            host = self._hosts[name] = _HostState(
+                TokenBucket(rate=self.initial_rate),
+                AIMDLimiter(
+                    initial_limit=self.initial_concurrency,
+                    max_limit=self.max_concurrency,
+                    decrease_factor=self.decrease_factor,
+                ),
+            )
+        return host
+
+    def __record(
+        self,
+        url: str,
+        host: _HostState,
+        outcome: RequestOutcome,
+        latency: float,
+        failed: bool,
+    ) -> None:
+        host.requests += 1
+        host.latency_ewma = (
+            latency if host.latency_ewma is None else 0.8 * host.latency_ewma + 0.2 * latency
+        )
+
+        throttled = outcome.status == 429
+        server_error = outcome.status is not None and outcome.status >= 500
+        if throttled or server_error:
+            host.throttled += 1
+            self.metrics.increment("throttled_responses")
+        if failed:
+            host.errors += 1
+        host.recent_errors.append(failed or server_error)
+
+        if outcome.retry_after:
+            host.bucket.pause(outcome.retry_after)
+
+        error_rate = sum(host.recent_errors) / len(host.recent_errors)
+        if (
+            throttled
+            or error_rate > self.max_error_rate
+            or host.latency_ewma > self.target_latency
+        ):
+            if host.limiter.decrease():
+                host.slow_start = False
+                # The next decision needs fresh evidence, not the errors just acted upon.
+                host.recent_errors.clear()
+                host.bucket.rate = max(self.min_rate, host.bucket.rate * self.decrease_factor)
+                host.bucket.capacity = max(1.0, host.bucket.rate)
+                logger.debug(
+                    f"Backing off {urlparse(url).netloc} to {host.bucket.rate:.2f} req/s and "
+                    f"{host.limiter.limit:.2f} concurrent requests"
+                )
+        elif not (failed or server_error):
+            host.limiter.increase()
+            if host.slow_start:
+                step = 1.0
+            else:
+                # Roughly `rate_step` more requests per second per second of clean requests.
+                step = self.rate_step / max(host.bucket.rate, 1.0)
+            host.bucket.rate = min(self.max_rate, host.bucket.rate + step)
+            host.bucket.capacity = max(1.0, host.bucket.rate)
+
+        self.metrics.gauge("host_request_rate", round(host.bucket.rate, 3))
+        self.metrics.gauge("host_concurrency_limit", round(host.limiter.limit, 3))
+
+
+class RetryQueue:
+    """
+    Delayed queue of items to retry, with jittered exponential backoff.
+
+    `schedule` makes an item available after min(max_delay, base_delay * 2 ** attempt)
+    seconds, half of which is randomized ("equal jitter") so that retries of a burst of
+    failures spread out instead of hitting the site together. Every item handed out by
+    `get` must be acknowledged with `task_done`, after rescheduling it if needed;
+    `join` waits until nothing is scheduled or being retried.
+    """
+
+    def __init__(self, base_delay: float = 1.0, max_delay: float = 30.0) -> None:
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._heap: list[tuple[float, int, Any, int]] = []
+        self._counter = itertools.count()
+        self._unfinished = 0
+        self._closed = False
+        self._changed = asyncio.Condition()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * 2**attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def schedule(self, item: Any, attempt: int) -> float:
+        """Schedule the `attempt`-th retry of `item`. Returns the delay, in seconds."""
+        delay = self.backoff(attempt)
+        async with self._changed:
+            heapq.heappush(
+                self._heap, (time.monotonic() + delay, next(self._counter), item, attempt)
+            )
+            self._unfinished += 1
+            self._changed.notify_all()
+        return delay
+
+    async def get(self) -> Optional[tuple[Any, int]]:
+        """Wait for the next due item and its attempt number, or None once closed."""
+        async with self._changed:
+            while True:
+                if self._heap:
+                    due = self._heap[0][0] - time.monotonic()
+                    if due <= 0:
+                        _, _, item, attempt = heapq.heappop(self._heap)
+                        return item, attempt
+                elif self._closed:
+                    return None
+                else:
+                    due = None
+
+                try:
+                    await asyncio.wait_for(self._changed.wait(), due)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def task_done(self) -> None:
+        async with self._changed:
+            self._unfinished -= 1
+            self._changed.notify_all()
+
+    async def join(self) -> None:
+        """Wait until every scheduled item has been retried and acknowledged."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._unfinished == 0)
+
+    async def close(self) -> None:
+        """Make `get` return None once no items are left."""
+        async with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+
+async def until_failure(awaitable: Awaitable[Any], tasks: Iterable[asyncio.Task]) -> Any:
+    """
+    Await `awaitable`, unless one of `tasks` fails first.
+
+    Producers feeding bounded queues wait on consumers that may die. Racing the wait
+    against the consumer tasks turns a consumer failure into an exception instead of
+    a producer blocked forever.
+
+    Args:
+        awaitable: What to wait for.
+        tasks: Background tasks whose failure aborts the wait. Tasks that finish
+            without an exception are ignored.
+
+    Returns:
+        The result of `awaitable`.
+
+    Raises:
+        Exception: The exception of the first failed task. `awaitable` is cancelled.
+    """
+    tasks = list(tasks)
+    main = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            for task in tasks:
+                if task.done() and not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+            if main.done():
+                return main.result()
+
+            running = [task for task in tasks if not task.done()]
+            await asyncio.wait([main, *running], return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        if not main.done():
+            main.cancel()
+            await asyncio.gather(main, return_exceptions=True)
@@ -0,0 +1,3 @@
+from .minhash import DeduplicationResult, DocumentDeduplicator
+
+__all__ = ["DeduplicationResult", "DocumentDeduplicator"]
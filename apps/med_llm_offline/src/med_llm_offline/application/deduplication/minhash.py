@@ -0,0 +1,217 @@
+import re
+import zlib
+from collections import Counter, defaultdict
+
+import numpy as np
+from loguru import logger
+from pydantic import BaseModel, ConfigDict
+
+from src.med_llm_offline import utils
+from src.med_llm_offline.domain import Document
+
+# Mersenne prime used for the universal hash family (a * x + b) mod p. With a < p and
+# 32-bit shingle hashes the product stays below 2**63, so uint64 math never overflows.
+MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+class DeduplicationResult(BaseModel):
+    """Documents left after deduplication, and what was found along the way."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    documents: list[Document]
+    url_duplicates: int
+    content_duplicates: int
+    near_duplicates_dropped: int
+    clusters: list[list[str]]
+
+    def cluster_stats(self) -> dict:
+        """Summarize the near-duplicate clusters as flat step metadata."""
+        sizes = [len(cluster) for cluster in self.clusters]
+        return {
+            "near_duplicate_clusters": len(sizes),
+            "documents_in_clusters": sum(sizes),
+            "largest_cluster": max(sizes, default=0),
+            "cluster_size_histogram": {
+                str(size): count for size, count in sorted(Counter(sizes).items())
+            },
+        }
+
+
+class DocumentDeduplicator:
+    """
+    Removes exact duplicates and clusters near-duplicates among crawled documents.
+
+    Exact duplicates are documents sharing a URL or a content hash of their name and
+    properties; only the first one is kept. Near-duplicates are found with MinHash
+    signatures over word shingles of the `properties` text and banded LSH, so that
+    only documents sharing a band bucket are ever compared. Each candidate is checked
+    against its bucket's first member, which keeps the work linear in the number of
+    documents even when a bucket is large.
+
+    Args:
+        threshold: Minimum estimated Jaccard similarity for two documents to be
+            clustered together.
+        num_perm: Number of MinHash permutations per signature.
+        bands: Number of LSH bands; `num_perm` must be divisible by it.
+        shingle_size: Number of words per shingle.
+        seed: Seed of the permutations, so signatures are stable across runs.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_size: int = 3,
+        seed: int = 42,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands.")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def deduplicate(
+        self, documents: list[Document], drop_near_duplicates: bool = False
+    ) -> DeduplicationResult:
+        """
+        Deduplicate documents.
+
+        Args:
+            documents: The crawled documents.
+            drop_near_duplicates: If True, keep only the first document of every
+                near-duplicate cluster. Pack-size variants are distinct products, so by
+                default clusters are only reported.
+
+        Returns:
+            DeduplicationResult: The remaining documents and the duplicate statistics.
+        """
+        unique_urls = {}
+        for document in documents:
+            unique_urls.setdefault(document.metadata.url, document)
+        url_duplicates = len(documents) - len(unique_urls)
+
+        unique_content = {}
+        for document in unique_urls.values():
+            fingerprint = utils.compute_fingerprint(
+                {"name": document.metadata.name, "properties": document.metadata.properties}
+            )
+            unique_content.setdefault(fingerprint, document)
+        content_duplicates = len(unique_urls) - len(unique_content)
+
+        candidates = list(unique_content.values())
+        clusters = self.cluster(candidates)
+
+        remaining = candidates
+        near_duplicates_dropped = 0
+        if drop_near_duplicates:
+            dropped = {index for cluster in clusters for index in cluster[1:]}
+            remaining = [doc for index, doc in enumerate(candidates) if index not in dropped]
+            near_duplicates_dropped = len(dropped)
+
+        result = DeduplicationResult(
+            documents=remaining,
+            url_duplicates=url_duplicates,
+            content_duplicates=content_duplicates,
+            near_duplicates_dropped=near_duplicates_dropped,
+            clusters=[
+                [candidates[index].metadata.url for index in cluster] for cluster in clusters
+            ],
+        )
+        logger.info(
+            f"Dropped {url_duplicates} URL and {content_duplicates} content duplicates, "
+            f"found {len(clusters)} near-duplicate clusters."
+        )
+
+        return result
+
+    def cluster(self, documents: list[Document]) -> list[list[int]]:
+        """
+        Group near-duplicate documents.
+
+        Returns:
+            Clusters of two or more document indices, each sorted ascending.
+        """
+        if not documents:
+            return []
+
+        signatures = np.stack([self.signature(self.__text(doc)) for doc in documents])
+        parent = list(range(len(documents)))
+
+        def find(index: int) -> int:
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        empty = np.all(signatures == np.iinfo(np.uint64).max, axis=1)
+
+        for band in range(self.bands):
+            columns = signatures[:, band * self.rows : (band + 1) * self.rows]
+            buckets = defaultdict(list)
+            for index, row in enumerate(columns):
+                if not empty[index]:
+                    buckets[row.tobytes()].append(index)
+
+            for members in buckets.values():
+                head = members[0]
+                for member in members[1:]:
+                    root_head, root_member = find(head), find(member)
+                    if root_head == root_member:
+                        continue
+                    if self.similarity(signatures[head], signatures[member]) >= self.threshold:
+                        parent[root_member] = root_head
+
+        groups = defaultdict(list)
+        for index in range(len(documents)):
+            groups[find(index)].append(index)
+
+        return sorted(
+            (sorted(group) for group in groups.values() if len(group) > 1),
+            key=lambda group: group[0],
+        )
+
+    def signature(self, text: str) -> np.ndarray:
+        """Compute the MinHash signature of a text."""
+        shingles = self.__shingle_hashes(text)
+        if shingles.size == 0:
+            return np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+
+        hashed = (np.outer(shingles, self._a) + self._b) % MERSENNE_PRIME
+        return hashed.min(axis=0)
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        """Estimate the Jaccard similarity of two signatures."""
+        return float(np.mean(first == second))
+
+    def __shingle_hashes(self, text: str) -> np.ndarray:
+        words = WORD_PATTERN.findall(text.lower())
+        if len(words) < self.shingle_size:
+            shingles = {" ".join(words)} if words else set()
+        else:
+            shingles = {
+                " ".join(words[i : i + self.shingle_size])
+                for i in range(len(words) - self.shingle_size + 1)
+            }
+
+        return np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+
+    @staticmethod
+    def __text(document: Document) -> str:
+        properties = document.metadata.properties
+        return "\n".join(str(properties[key]) for key in sorted(properties))
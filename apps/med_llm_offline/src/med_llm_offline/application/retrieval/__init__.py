@@ -0,0 +1,16 @@
+from .bm25 import BM25Index, SearchHit, document_text, tokenize
+from .encoders import HashingEncoder, SentenceTransformerEncoder, TextEncoder
+from .semantic import SectionVectorIndex
+from .vector_index import IVFIndex
+
+__all__ = [
+    "BM25Index",
+    "HashingEncoder",
+    "IVFIndex",
+    "SearchHit",
+    "SectionVectorIndex",
+    "SentenceTransformerEncoder",
+    "TextEncoder",
+    "document_text",
+    "tokenize",
+]
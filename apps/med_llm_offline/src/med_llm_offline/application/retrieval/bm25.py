@@ -0,0 +1,338 @@
+import os
+import re
+import shutil
+from collections import Counter, defaultdict
+from itertools import chain
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+import orjson
+from pydantic import BaseModel
+
+from src.med_llm_offline.domain import Document
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+INDEX_ARRAYS = ("offsets", "postings", "frequencies", "doc_lengths")
+INDEX_META = "index.json"
+
+
+class SearchHit(BaseModel):
+    """One result of an index query."""
+
+    id: str
+    score: float
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def document_text(document: Document) -> str:
+    """The searchable text of a document: its name followed by its properties."""
+    properties = document.metadata.properties
+    return "\n".join(
+        [document.metadata.name, *(str(properties[key]) for key in sorted(properties))]
+    )
+
+
+class BM25Index:
+    """
+    In-process BM25 index over Document names and properties.
+
+    Postings live in compact NumPy arrays laid out by term: `offsets[t]:offsets[t + 1]`
+    is the slice of `postings` (document numbers) and `frequencies` (term frequencies)
+    of term `t`. A query scores every posting of its terms with vectorized NumPy math
+    and picks the top k with `argpartition`, so its cost depends on the length of the
+    query's posting lists rather than on the size of the catalogue.
+
+    Added documents go to a small in-memory segment that is merged into the arrays
+    once `merge_threshold` documents are pending, or on `save`. Deleted documents are
+    masked out right away, both from the results and from the document frequencies,
+    and dropped from the arrays at the next merge. Adding a document with an ID that
+    is already indexed replaces it.
+
+    `save` writes each array as an `.npy` file, and `load` memory-maps them, so a
+    saved index opens instantly and only the posting lists that queries touch are
+    read from disk.
+
+    Args:
+        k1: BM25 term frequency saturation.
+        b: BM25 document length normalization.
+        merge_threshold: Number of pending documents that triggers a merge.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, merge_threshold: int = 10000) -> None:
+        self.k1 = k1
+        self.b = b
+        self.merge_threshold = merge_threshold
+
+        self._terms: dict[str, int] = {}
+        self._doc_ids: list[str] = []
+        self._docnos: dict[str, int] = {}
+        self._doc_lengths = np.zeros(0, dtype=np.int32)
+        self._live = np.zeros(0, dtype=bool)
+        self._total_length = 0
+
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._postings = np.zeros(0, dtype=np.int32)
+        self._frequencies = np.zeros(0, dtype=np.int32)
+
+        self._pending: defaultdict[int, list[tuple[int, int]]] = defaultdict(list)
+        self._pending_docs = 0
+
+    def __len__(self) -> int:
+        return len(self._docnos)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._docnos
+
+    def add(self, documents: Iterable[Document]) -> None:
+        """Index documents by their ID, from their name and properties."""
+        for document in documents:
+            self.add_text(document.id, document_text(document))
+
+    def add_text(self, doc_id: str, text: str) -> None:
+        """
+        Index a text under a document ID, replacing any text indexed under that ID.
+
+        Args:
+            doc_id: ID of the document.
+            text: Searchable text of the document.
+        """
+        self.delete(doc_id)
+
+        counts = Counter(tokenize(text))
+        length = sum(counts.values())
+        docno = len(self._doc_ids)
+        self._doc_ids.append(doc_id)
+        self._docnos[doc_id] = docno
+        self._doc_lengths = self.__grow(self._doc_lengths, docno + 1)
+        self._live = self.__grow(self._live, docno + 1)
+        self._doc_lengths[docno] = length
+        self._live[docno] = True
+        self._total_length += length
+
+        terms, pending = self._terms, self._pending
+        for term, frequency in counts.items():
+            term_id = terms.setdefault(term, len(terms))
+            pending[term_id].append((docno, frequency))
+
+        self._pending_docs += 1
+        if self._pending_docs >= self.merge_threshold:
+            self.merge()
+
+    def delete(self, doc_id: str) -> bool:
+        """
+        Remove a document from the results.
+
+        Args:
+            doc_id: ID of the document.
+
+        Returns:
+            bool: Whether the document was indexed.
+        """
+        docno = self._docnos.pop(doc_id, None)
+        if docno is None:
+            return False
+
+        self._live[docno] = False
+        self._total_length -= int(self._doc_lengths[docno])
+        return True
+
+    def search(self, query: str, k: int = 10) -> list[SearchHit]:
+        """
+        Find the documents that best match a query.
+
+        Args:
+            query: Free-text query.
+            k: Maximum number of results.
+
+        Returns:
+            list[SearchHit]: The best matches, highest score first.
+        """
+        query_terms = Counter(
+            self._terms[term] for term in tokenize(query) if term in self._terms
+        )
+        if not query_terms or not self._docnos:
+            return []
+
+        doc_count = len(self._docnos)
+        average_length = self._total_length / doc_count
+        matched_docs, matched_scores = [], []
+
+        for term_id, query_frequency in query_terms.items():
+            docs, frequencies = self.__postings(term_id)
+            # Deleted documents must not count towards df, or idf would shrink, and
+            # eventually turn negative, as documents are deleted.
+            live = self._live[docs]
+            docs, frequencies = docs[live], frequencies[live]
+            if docs.size == 0:
+                continue
+
+            df = len(docs)
+            idf = np.log1p((doc_count - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (
+                1 - self.b + self.b * self._doc_lengths[docs] / average_length
+            )
+            frequencies = frequencies.astype(np.float32)
+            matched_docs.append(docs)
+            matched_scores.append(
+                query_frequency * idf * frequencies * (self.k1 + 1) / (frequencies + norm)
+            )
+
+        if not matched_docs:
+            return []
+
+        # Sum the scores over the union of the matched postings only, so the cost
+        # stays independent of the number of indexed documents.
+        docnos, positions = np.unique(np.concatenate(matched_docs), return_inverse=True)
+        scores = np.bincount(positions, weights=np.concatenate(matched_scores)).astype(
+            np.float32
+        )
+
+        top = np.arange(len(docnos))
+        if top.size > k:
+            top = np.argpartition(scores, -k)[-k:]
+        top = top[np.lexsort((docnos[top], -scores[top]))]
+
+        return [
+            SearchHit(id=self._doc_ids[docnos[i]], score=float(scores[i])) for i in top
+        ]
+
+    def merge(self) -> None:
+        """Fold the pending documents into the posting arrays and drop deleted ones."""
+        main_terms = np.repeat(
+            np.arange(len(self._offsets) - 1, dtype=np.int64), np.diff(self._offsets)
+        )
+        pending_terms = np.repeat(
+            np.fromiter(self._pending.keys(), dtype=np.int64, count=len(self._pending)),
+            [len(postings) for postings in self._pending.values()],
+        )
+        pending = np.fromiter(
+            chain.from_iterable(chain.from_iterable(self._pending.values())),
+            dtype=np.int64,
+            count=2 * len(pending_terms),
+        ).reshape(-1, 2)
+
+        terms = np.concatenate([main_terms, pending_terms])
+        docs = np.concatenate([self._postings, pending[:, 0]])
+        frequencies = np.concatenate([self._frequencies, pending[:, 1]])
+
+        # Renumber the live documents densely and drop the postings of deleted ones.
+        live = self._live[: len(self._doc_ids)]
+        renumber = np.cumsum(live, dtype=np.int64) - 1
+        keep = live[docs]
+        terms, docs, frequencies = terms[keep], renumber[docs[keep]], frequencies[keep]
+
+        order = np.lexsort((docs, terms))
+        term_count = len(self._terms)
+        self._postings = docs[order].astype(np.int32)
+        self._frequencies = frequencies[order].astype(np.int32)
+        self._offsets = np.zeros(term_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=term_count), out=self._offsets[1:])
+
+        self._doc_ids = [doc_id for doc_id, alive in zip(self._doc_ids, live) if alive]
+        self._docnos = {doc_id: docno for docno, doc_id in enumerate(self._doc_ids)}
+        self._doc_lengths = np.array(self._doc_lengths[: len(live)][live], dtype=np.int32)
+        self._live = np.ones(len(self._doc_ids), dtype=bool)
+        self._pending.clear()
+        self._pending_docs = 0
+
+    def save(self, directory: Path) -> None:
+        """
+        Merge pending changes and write the index to a directory.
+
+        The files are written to a sibling directory that then replaces `directory`,
+        so a crash never leaves a half-written index behind.
+
+        Args:
+            directory: Directory to write the index to.
+        """
+        self.merge()
+
+        directory = Path(directory)
+        tmp_dir = directory.with_name(f"{directory.name}.tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+
+        arrays = {
+            "offsets": self._offsets,
+            "postings": self._postings,
+            "frequencies": self._frequencies,
+            "doc_lengths": self._doc_lengths,
+        }
+        for name in INDEX_ARRAYS:
+            np.save(tmp_dir / f"{name}.npy", arrays[name])
+        meta = {
+            "k1": self.k1,
+            "b": self.b,
+            "terms": list(self._terms),
+            "doc_ids": self._doc_ids,
+        }
+        (tmp_dir / INDEX_META).write_bytes(orjson.dumps(meta))
+
+        old_dir = directory.with_name(f"{directory.name}.old")
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if directory.exists():
+            os.replace(directory, old_dir)
+        os.replace(tmp_dir, directory)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    @classmethod
+    def load(
+        cls, directory: Path, mmap: bool = True, merge_threshold: int = 10000
+    ) -> "BM25Index":
+        """
+        Open an index written by `save`.
+
+        Args:
+            directory: Directory the index was saved to.
+            mmap: Memory-map the posting arrays instead of reading them.
+            merge_threshold: Number of pending documents that triggers a merge.
+
+        Returns:
+            BM25Index: The index, ready for queries and updates.
+        """
+        directory = Path(directory)
+        meta = orjson.loads((directory / INDEX_META).read_bytes())
+        mmap_mode: Optional[str] = "r" if mmap else None
+
+        index = cls(k1=meta["k1"], b=meta["b"], merge_threshold=merge_threshold)
+        index._terms = {term: term_id for term_id, term in enumerate(meta["terms"])}
+        index._doc_ids = meta["doc_ids"]
+        index._docnos = {doc_id: docno for docno, doc_id in enumerate(index._doc_ids)}
+        index._offsets = np.load(directory / "offsets.npy", mmap_mode=mmap_mode)
+        index._postings = np.load(directory / "postings.npy", mmap_mode=mmap_mode)
+        index._frequencies = np.load(directory / "frequencies.npy", mmap_mode=mmap_mode)
+        # Small per-document arrays that updates write to stay in memory.
+        index._doc_lengths = np.array(np.load(directory / "doc_lengths.npy"), dtype=np.int32)
+        index._live = np.ones(len(index._doc_ids), dtype=bool)
+        index._total_length = int(index._doc_lengths.sum())
+
+        return index
+
+    def __postings(self, term_id: int) -> tuple[np.ndarray, np.ndarray]:
+        docs = np.zeros(0, dtype=np.int64)
+        frequencies = np.zeros(0, dtype=np.int32)
+        if term_id < len(self._offsets) - 1:
+            start, end = self._offsets[term_id], self._offsets[term_id + 1]
+            docs, frequencies = self._postings[start:end], self._frequencies[start:end]
+
+        pending = self._pending.get(term_id)
+        if pending:
+            pending_postings = np.asarray(pending, dtype=np.int64)
+            docs = np.concatenate([docs, pending_postings[:, 0]])
+            frequencies = np.concatenate([frequencies, pending_postings[:, 1]])
+
+        return docs, frequencies
+
+    @staticmethod
+    def __grow(array: np.ndarray, size: int) -> np.ndarray:
+        if size <= len(array):
+            return array
+        grown = np.zeros(max(size, 2 * len(array)), dtype=array.dtype)
+        grown[: len(array)] = array
+        return grown
@@ -0,0 +1,103 @@
+import zlib
+from typing import Protocol
+
+import numpy as np
+
+from .bm25 import tokenize
+
+
+class TextEncoder(Protocol):
+    """Turns texts into L2-normalized float32 vectors on the CPU."""
+
+    name: str
+    dimension: int
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Embed texts into an array of shape `(len(texts), dimension)`."""
+        ...
+
+
+class HashingEncoder:
+    """
+    Deterministic encoder that hashes words and character trigrams into a fixed vector.
+
+    Each feature is hashed with CRC32 to a dimension and a sign, so the same text
+    always gets the same vector, on any machine and without a model download. It has
+    no notion of synonyms, but near-identical texts and misspelled drug names land
+    close together, which makes it a good default for tests and benchmarks.
+
+    Args:
+        dimension: Size of the vectors.
+        seed: Seed of the hash, to get an independent set of vectors.
+    """
+
+    def __init__(self, dimension: int = 256, seed: int = 0) -> None:
+        self.dimension = dimension
+        self.seed = seed
+        self.name = f"hashing-{dimension}-{seed}"
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        # The features of every distinct word of the batch are hashed once, then all
+        # texts are accumulated into the output with a single scatter-add.
+        word_hashes: dict[str, list[int]] = {}
+        rows, columns = [], []
+        for text in texts:
+            for word in tokenize(text):
+                hashes = word_hashes.get(word)
+                if hashes is None:
+                    hashes = word_hashes[word] = [
+                        zlib.crc32(feature.encode("utf-8"), self.seed)
+                        for feature in self.__features(word)
+                    ]
+                columns.extend(hashes)
+            rows.append(len(columns))
+
+        columns = np.asarray(columns, dtype=np.int64)
+        rows = np.repeat(np.arange(len(texts)), np.diff(np.asarray([0, *rows])))
+        signs = np.where(columns & (1 << 31), -1.0, 1.0).astype(np.float32)
+
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        np.add.at(vectors, (rows, columns % self.dimension), signs)
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+    @staticmethod
+    def __features(word: str) -> list[str]:
+        padded = f"#{word}#"
+        return [word, *(padded[i : i + 3] for i in range(len(padded) - 2))]
+
+
+class SentenceTransformerEncoder:
+    """
+    Encoder backed by a sentence-transformers model running on the CPU.
+
+    `sentence-transformers` is not a dependency of the project and is only imported
+    when this encoder is created.
+
+    Args:
+        model_name: Name or path of the model.
+        batch_size: Number of texts per forward pass.
+    """
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", batch_size: int = 64) -> None:
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "SentenceTransformerEncoder requires the sentence-transformers package."
+            ) from e
+
+        self._model = SentenceTransformer(model_name, device="cpu")
+        self.batch_size = batch_size
+        self.dimension = self._model.get_sentence_embedding_dimension()
+        self.name = f"sentence-transformers-{model_name}"
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        return self._model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        ).astype(np.float32)
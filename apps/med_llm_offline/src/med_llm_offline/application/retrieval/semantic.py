@@ -0,0 +1,171 @@
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+from loguru import logger
+
+from src.med_llm_offline.domain import Document
+from src.med_llm_offline.infrastructure.cache import EmbeddingCache
+
+from .bm25 import SearchHit
+from .encoders import HashingEncoder, TextEncoder
+from .vector_index import IVFIndex
+
+
+class SectionVectorIndex:
+    """
+    Semantic search over the `properties` sections of documents.
+
+    Sections are embedded in batches with a pluggable CPU encoder (a deterministic
+    `HashingEncoder` by default) and stored in an `IVFIndex` under the ID
+    `<document id>:<section key>`. With an `EmbeddingCache`, vectors are looked up
+    by a hash of the section text first, so a recrawl only embeds sections whose text
+    changed. Adding a document again replaces all of its sections.
+
+    Args:
+        encoder: Encoder of the sections and the queries.
+        cache: Optional on-disk cache of the section vectors.
+        index: Vector index to fill. A new, untrained `IVFIndex` by default.
+        batch_size: Number of documents embedded per encoder call.
+    """
+
+    def __init__(
+        self,
+        encoder: Optional[TextEncoder] = None,
+        cache: Optional[EmbeddingCache] = None,
+        index: Optional[IVFIndex] = None,
+        batch_size: int = 256,
+    ) -> None:
+        self.encoder = encoder or HashingEncoder()
+        self.cache = cache
+        self.index = index or IVFIndex(self.encoder.dimension)
+        if self.index.dimension != self.encoder.dimension:
+            raise ValueError(
+                f"Index dimension {self.index.dimension} does not match encoder "
+                f"dimension {self.encoder.dimension}."
+            )
+        self.batch_size = max(1, batch_size)
+        self.embedded = 0
+        self.cache_hits = 0
+
+        self._sections: dict[str, list[str]] = {}
+        for section_id in self.index.ids:
+            document_id, _, _ = section_id.partition(":")
+            self._sections.setdefault(document_id, []).append(section_id)
+
+    def add(self, documents: Iterable[Document]) -> None:
+        """Embed and index the sections of documents, replacing their previous sections."""
+        iterator = iter(documents)
+        while batch := list(islice(iterator, self.batch_size)):
+            sections = [
+                (document.id, f"{document.id}:{key}", value)
+                for document in batch
+                for key, value in document.metadata.properties.items()
+                if isinstance(value, str) and value
+            ]
+            for document in batch:
+                self.delete(document.id)
+            if not sections:
+                continue
+
+            vectors = self.embed([text for _, _, text in sections])
+            self.index.add([section_id for _, section_id, _ in sections], vectors)
+            for document_id, section_id, _ in sections:
+                self._sections.setdefault(document_id, []).append(section_id)
+
+    def delete(self, document_id: str) -> bool:
+        """
+        Remove every section of a document.
+
+        Returns:
+            bool: Whether the document was indexed.
+        """
+        section_ids = self._sections.pop(document_id, None)
+        if section_ids is None:
+            return False
+
+        for section_id in section_ids:
+            self.index.delete(section_id)
+        return True
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """
+        Embed texts, reusing the cached vectors of texts seen before.
+
+        Args:
+            texts: The texts to embed.
+
+        Returns:
+            np.ndarray: Array of shape `(len(texts), dimension)`.
+        """
+        if self.cache is None:
+            self.embedded += len(texts)
+            return self.encoder.encode(texts)
+
+        hashes = [EmbeddingCache.hash_content(text) for text in texts]
+        cached = self.cache.get_many(self.encoder.name, hashes)
+        missing = {
+            content_hash: text
+            for content_hash, text in zip(hashes, texts)
+            if content_hash not in cached
+        }
+        if missing:
+            vectors = self.encoder.encode(list(missing.values()))
+            computed = dict(zip(missing, vectors))
+            self.cache.put_many(self.encoder.name, computed)
+            cached.update(computed)
+
+        self.embedded += len(missing)
+        self.cache_hits += len(texts) - len(missing)
+        return np.stack([cached[content_hash] for content_hash in hashes])
+
+    def train(self) -> None:
+        """Cluster the indexed sections so queries only scan the closest lists."""
+        self.index.train()
+        logger.info(
+            f"Trained vector index with {self.index.n_lists} lists over "
+            f"{len(self.index)} sections."
+        )
+
+    def search(self, query: str, k: int = 10, n_probe: Optional[int] = None) -> list[SearchHit]:
+        """
+        Find the sections closest in meaning to a query.
+
+        Args:
+            query: Free-text query.
+            k: Maximum number of results.
+            n_probe: Overrides the number of index lists scanned.
+
+        Returns:
+            list[SearchHit]: Section IDs and cosine similarities, most similar first.
+        """
+        vector = self.encoder.encode([query])[0]
+        return [
+            SearchHit(id=section_id, score=score)
+            for section_id, score in self.index.search(vector, k=k, n_probe=n_probe)
+        ]
+
+    def save(self, directory: Path) -> None:
+        """Write the vector index to a directory."""
+        self.index.save(directory)
+
+    @classmethod
+    def load(
+        cls,
+        directory: Path,
+        encoder: Optional[TextEncoder] = None,
+        cache: Optional[EmbeddingCache] = None,
+    ) -> "SectionVectorIndex":
+        """
+        Open a vector index written by `save`.
+
+        Args:
+            directory: Directory the index was saved to.
+            encoder: Encoder the index was built with. `HashingEncoder` by default.
+            cache: Optional on-disk cache of the section vectors.
+
+        Returns:
+            SectionVectorIndex: The index, ready for queries and updates.
+        """
+        return cls(encoder=encoder, cache=cache, index=IVFIndex.load(directory))
@@ -0,0 +1,310 @@
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import orjson
+
+INDEX_META = "index.json"
+
+
+class IVFIndex:
+    """
+    Inverted-file (IVF) approximate nearest-neighbour index over unit vectors.
+
+    `train` clusters the vectors with spherical k-means into `n_lists` lists and keeps
+    the vectors of every list contiguous, so a query only scores the `n_probe` lists
+    whose centroids are closest to it instead of the whole catalogue. Similarity is
+    the dot product, i.e. the cosine similarity of normalized vectors.
+
+    Vectors added after training go to a tail that every query scans exhaustively,
+    until `merge` assigns them to their nearest list. That happens on its own once the
+    tail holds `merge_threshold` vectors. Deleted vectors are masked out right away
+    and dropped at the next merge. Before training, every query is exact.
+
+    `save` writes the arrays as `.npy` files, and `load` memory-maps the vectors.
+
+    Args:
+        dimension: Size of the vectors.
+        n_lists: Number of lists. Defaults to about sqrt(N) at training time.
+        n_probe: Number of lists scanned per query.
+        merge_threshold: Number of tail vectors that triggers a merge.
+        seed: Seed of the k-means initialization.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        merge_threshold: int = 5000,
+        seed: int = 0,
+    ) -> None:
+        self.dimension = dimension
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.merge_threshold = merge_threshold
+        self.seed = seed
+
+        self._ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._vectors = np.zeros((0, dimension), dtype=np.float32)
+        self._live = np.zeros(0, dtype=bool)
+        self._centroids: Optional[np.ndarray] = None
+        # Rows before `_list_offsets[-1]` are sorted by list, the rest is the tail.
+        self._list_offsets = np.zeros(1, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, vector_id: object) -> bool:
+        return vector_id in self._rows
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    @property
+    def ids(self) -> list[str]:
+        """IDs of the stored vectors."""
+        return list(self._rows)
+
+    def add(self, ids: list[str], vectors: np.ndarray) -> None:
+        """
+        Add vectors, replacing any vector stored under the same ID.
+
+        Args:
+            ids: IDs of the vectors.
+            vectors: Array of shape `(len(ids), dimension)`.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimension)
+        if len(ids) != len(vectors):
+            raise ValueError("ids and vectors must have the same length.")
+        for vector_id in ids:
+            self.delete(vector_id)
+
+        start = len(self._ids)
+        size = start + len(ids)
+        if size > len(self._vectors):
+            capacity = max(size, 2 * len(self._vectors))
+            grown = np.zeros((capacity, self.dimension), dtype=np.float32)
+            grown[:start] = self._vectors[:start]
+            self._vectors = grown
+            live = np.zeros(capacity, dtype=bool)
+            live[:start] = self._live[:start]
+            self._live = live
+
+        self._vectors[start:size] = vectors
+        self._live[start:size] = True
+        for row, vector_id in enumerate(ids, start):
+            self._rows[vector_id] = row
+        self._ids.extend(ids)
+
+        if self.trained and size - self._list_offsets[-1] >= self.merge_threshold:
+            self.merge()
+
+    def delete(self, vector_id: str) -> bool:
+        """
+        Remove a vector from the results.
+
+        Returns:
+            bool: Whether the vector was stored.
+        """
+        row = self._rows.pop(vector_id, None)
+        if row is None:
+            return False
+
+        self._live[row] = False
+        return True
+
+    def train(self, iterations: int = 10, points_per_list: int = 64) -> None:
+        """
+        Cluster the stored vectors into lists with spherical k-means, then merge.
+
+        Args:
+            iterations: Number of k-means iterations.
+            points_per_list: Number of sampled vectors per list the centroids are
+                fitted on.
+        """
+        rows = np.flatnonzero(self._live[: len(self._ids)])
+        if rows.size == 0:
+            raise ValueError("Cannot train an empty index.")
+
+        n_lists = self.n_lists or int(np.sqrt(rows.size))
+        n_lists = max(1, min(n_lists, rows.size))
+        rng = np.random.default_rng(self.seed)
+        if rows.size > points_per_list * n_lists:
+            rows = np.sort(rng.choice(rows, size=points_per_list * n_lists, replace=False))
+        sample = self._vectors[rows]
+
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            counts = np.bincount(assignments, minlength=n_lists)
+            empty = counts == 0
+            # Restart empty lists on random vectors instead of leaving them unused.
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.maximum(norms, 1e-12)
+
+        self._centroids = centroids.astype(np.float32)
+        self.n_lists = n_lists
+        self._list_offsets = np.zeros(1, dtype=np.int64)
+        self.merge()
+
+    def merge(self) -> None:
+        """Assign the tail to its nearest lists, drop deleted vectors and re-sort by list."""
+        live_rows = np.flatnonzero(self._live[: len(self._ids)])
+        vectors = self._vectors[live_rows]
+        ids = [self._ids[row] for row in live_rows]
+
+        if self.trained:
+            assignments = self.__assign(vectors)
+            order = np.argsort(assignments, kind="stable")
+            vectors, ids = vectors[order], [ids[i] for i in order]
+            self._list_offsets = np.zeros(len(self._centroids) + 1, dtype=np.int64)
+            np.cumsum(
+                np.bincount(assignments, minlength=len(self._centroids)),
+                out=self._list_offsets[1:],
+            )
+
+        self._vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self._live = np.ones(len(ids), dtype=bool)
+        self._ids = ids
+        self._rows = {vector_id: row for row, vector_id in enumerate(ids)}
+
+    def search(
+        self, query: np.ndarray, k: int = 10, n_probe: Optional[int] = None
+    ) -> list[tuple[str, float]]:
+        """
+        Find the stored vectors most similar to a query vector.
+
+        Args:
+            query: Unit vector of size `dimension`.
+            k: Maximum number of results.
+            n_probe: Overrides the number of lists scanned.
+
+        Returns:
+            list[tuple[str, float]]: IDs and similarities, most similar first.
+        """
+        query = np.asarray(query, dtype=np.float32).reshape(self.dimension)
+        size = len(self._ids)
+        if not self._rows:
+            return []
+
+        if self.trained:
+            n_probe = min(n_probe or self.n_probe, len(self._centroids))
+            closest = np.argpartition(-(self._centroids @ query), n_probe - 1)[:n_probe]
+            ranges = [
+                (self._list_offsets[i], self._list_offsets[i + 1]) for i in closest
+            ] + [(self._list_offsets[-1], size)]
+        else:
+            ranges = [(0, size)]
+
+        rows, scores = self.__score_ranges(ranges, query)
+        if rows.size > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            rows, scores = rows[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+
+        return [(self._ids[rows[i]], float(scores[i])) for i in order]
+
+    def search_exact(self, query: np.ndarray, k: int = 10) -> list[tuple[str, float]]:
+        """Brute-force search over every stored vector, as a reference for `search`."""
+        query = np.asarray(query, dtype=np.float32).reshape(self.dimension)
+        rows, scores = self.__score_ranges([(0, len(self._ids))], query)
+        top = np.argsort(-scores, kind="stable")[:k]
+        return [(self._ids[rows[i]], float(scores[i])) for i in top]
+
+    def save(self, directory: Path) -> None:
+        """
+        Merge pending changes and write the index to a directory, replacing it atomically.
+
+        Args:
+            directory: Directory to write the index to.
+        """
+        self.merge()
+
+        directory = Path(directory)
+        tmp_dir = directory.with_name(f"{directory.name}.tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+
+        np.save(tmp_dir / "vectors.npy", self._vectors)
+        np.save(tmp_dir / "list_offsets.npy", self._list_offsets)
+        if self.trained:
+            np.save(tmp_dir / "centroids.npy", self._centroids)
+        meta = {
+            "dimension": self.dimension,
+            "n_lists": self.n_lists,
+            "n_probe": self.n_probe,
+            "seed": self.seed,
+            "ids": self._ids,
+        }
+        (tmp_dir / INDEX_META).write_bytes(orjson.dumps(meta))
+
+        old_dir = directory.with_name(f"{directory.name}.old")
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if directory.exists():
+            os.replace(directory, old_dir)
+        os.replace(tmp_dir, directory)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True, merge_threshold: int = 5000) -> "IVFIndex":
+        """
+        Open an index written by `save`.
+
+        Args:
+            directory: Directory the index was saved to.
+            mmap: Memory-map the vectors instead of reading them.
+            merge_threshold: Number of tail vectors that triggers a merge.
+
+        Returns:
+            IVFIndex: The index, ready for queries and updates.
+        """
+        directory = Path(directory)
+        meta = orjson.loads((directory / INDEX_META).read_bytes())
+
+        index = cls(
+            dimension=meta["dimension"],
+            n_lists=meta["n_lists"],
+            n_probe=meta["n_probe"],
+            merge_threshold=merge_threshold,
+            seed=meta["seed"],
+        )
+        index._vectors = np.load(directory / "vectors.npy", mmap_mode="r" if mmap else None)
+        index._list_offsets = np.load(directory / "list_offsets.npy")
+        if (directory / "centroids.npy").exists():
+            index._centroids = np.load(directory / "centroids.npy")
+        index._ids = meta["ids"]
+        index._rows = {vector_id: row for row, vector_id in enumerate(index._ids)}
+        index._live = np.ones(len(index._ids), dtype=bool)
+
+        return index
+
+    def __score_ranges(
+        self, ranges: list[tuple[int, int]], query: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # Score contiguous row ranges as views, without gathering the vectors first.
+        rows, scores = [], []
+        for start, end in ranges:
+            if end <= start:
+                continue
+            live = self._live[start:end]
+            range_scores = self._vectors[start:end] @ query
+            rows.append(np.flatnonzero(live) + start)
+            scores.append(range_scores[live])
+        if not rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        return np.concatenate(rows), np.concatenate(scores)
+
+    def __assign(self, vectors: np.ndarray, batch_size: int = 8192) -> np.ndarray:
+        assignments = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), batch_size):
+            batch = vectors[start : start + batch_size]
+            assignments[start : start + batch_size] = np.argmax(batch @ self._centroids.T, axis=1)
+        return assignments
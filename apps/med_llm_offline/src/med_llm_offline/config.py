@@ -44,6 +44,51 @@ class Settings(BaseSettings):
     MONGODB_URI: str = Field(
         description="Connection URI for the local MongoDB Atlas instance.",
     )
+    MONGODB_MAX_POOL_SIZE: int = Field(
+        default=50,
+        description="Maximum number of connections in the shared MongoDB connection pool.",
+    )
+    MONGODB_MIN_POOL_SIZE: int = Field(
+        default=0,
+        description="Number of connections the shared MongoDB pool keeps open when idle.",
+    )
+    MONGODB_MAX_IDLE_TIME_MS: Optional[int] = Field(
+        default=None,
+        description="Time a pooled MongoDB connection may stay idle before it is closed.",
+    )
+    MONGODB_CONNECT_TIMEOUT_MS: int = Field(
+        default=10000,
+        description="Timeout for opening a connection to MongoDB.",
+    )
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = Field(
+        default=10000,
+        description="Timeout for finding a suitable MongoDB server for an operation.",
+    )
+    MONGODB_SOCKET_TIMEOUT_MS: Optional[int] = Field(
+        default=None,
+        description="Timeout for a send or receive on a MongoDB connection. "
+        "No timeout if not provided.",
+    )
+    MONGODB_COMPRESSORS: str = Field(
+        default="zstd,zlib",
+        description="Comma-separated wire compressors offered to MongoDB, in order of "
+        "preference. Compressors the server does not support are skipped.",
+    )
+
+    # --- Document Configuration ---
+    OBFUSCATION_KEY: Optional[str] = Field(
+        default=None,
+        description="Secret key of the keyed mapping used to obfuscate document IDs. "
+        "Required to obfuscate documents; keep it private, as anyone holding it can "
+        "link obfuscated IDs back to the original ones.",
+    )
+
+    # --- Monitoring Configuration ---
+    PROMETHEUS_TEXTFILE_DIR: Optional[str] = Field(
+        default=None,
+        description="Directory watched by node_exporter's textfile collector. "
+        "If provided, pipeline steps write their stage metrics there as .prom files.",
+    )
 
     # --- OpenAI API Configuration ---
     # OPENAI_API_KEY: str = Field(
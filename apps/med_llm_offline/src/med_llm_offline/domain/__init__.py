@@ -1,3 +1,5 @@
+from .chunk import Chunk
+from .crawl_report import CrawlReport
 from .document import Document, DocumentMetadata
 
-__all__ = ["Document", "DocumentMetadata"]
\ No newline at end of file
+__all__ = ["Chunk", "CrawlReport", "Document", "DocumentMetadata"]
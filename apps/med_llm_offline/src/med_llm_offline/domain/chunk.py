@@ -0,0 +1,40 @@
+from pydantic import BaseModel
+
+
+# Fields whose changes make a chunk's content change, as dotted paths.
+CHUNK_CONTENT_FIELDS = (
+    "document_url",
+    "document_name",
+    "section",
+    "content",
+    "token_start",
+    "token_end",
+)
+
+
+class Chunk(BaseModel):
+    """A token-bounded piece of one `properties` section of a Document.
+
+    Attributes:
+        id: Stable ID of the chunk, built from its document ID, section and index.
+        document_id: ID of the Document the chunk comes from.
+        document_url: URL of the product page the chunk comes from.
+        document_name: Name of the product the chunk comes from.
+        section: The `properties` key of the chunked section.
+        chunk_index: Position of the chunk within its section.
+        content: Text of the chunk.
+        token_start: Index of the first token of the chunk within its section.
+        token_end: Index one past the last token of the chunk within its section.
+        token_count: Number of tokens of the chunk.
+    """
+
+    id: str
+    document_id: str
+    document_url: str
+    document_name: str
+    section: str
+    chunk_index: int
+    content: str
+    token_start: int
+    token_end: int
+    token_count: int
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+
+
+class CrawlReport(BaseModel):
+    """What a crawl could not reach, so that syncs do not take it for deleted products.
+
+    Attributes:
+        failed_urls: Product pages abandoned after every retry. They may still exist.
+        skipped_pages: Listing pages that could not be fetched. Their products are
+            unknown, so nothing can be said about which products disappeared.
+    """
+
+    failed_urls: list[str] = Field(default_factory=list)
+    skipped_pages: list[int] = Field(default_factory=list)
+
+    @property
+    def complete(self) -> bool:
+        """Whether every listing page was read, i.e. unseen products are really gone."""
+        return not self.skipped_pages
@@ -1,27 +1,103 @@
-import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterator, Optional
 
-from pydantic import BaseModel, Field  
+import orjson
+from loguru import logger
+from pydantic import BaseModel, Field, computed_field, model_validator
 
 from src.med_llm_offline import utils
 
+from .specification import parse_specification
+
+
+# Fields whose changes make a document's content change, as dotted paths.
+CONTENT_FIELDS = (
+    "metadata.name",
+    "metadata.properties",
+    "metadata.requires_prescription",
+    "metadata.generics",
+    "metadata.used_for",
+)
+
+
+def decode_document_json(raw: bytes) -> dict:
+    """
+    Decode a document file, in the current format or the legacy double-encoded one.
+
+    Older versions of `Document.write` dumped the output of `model_dump_json` with
+    `json.dump`, so those files hold a JSON string that itself contains the document.
+    """
+    data = orjson.loads(raw)
+    if isinstance(data, str):
+        data = orjson.loads(data)
+    return data
+
+
+def _load_files(paths: list[Path]) -> tuple[list["Document"], list[str]]:
+    """Load a chunk of document files, returning the documents and the files that failed."""
+    documents, failed = [], []
+    for path in paths:
+        try:
+            documents.append(Document.from_dict(decode_document_json(path.read_bytes())))
+        except (OSError, ValueError) as e:
+            failed.append(f"{path}: {e}")
+    return documents, failed
+
 
 class DocumentMetadata(BaseModel):
     id: str
     url: str
     name: str
     properties: dict
+    # Parsed from the `specification` property by `parse_specification`.
+    requires_prescription: Optional[bool] = None
+    generics: list[str] = Field(default_factory=list)
+    used_for: list[str] = Field(default_factory=list)
+    how_it_works: Optional[str] = None
+
+    def parse_specification(self) -> "DocumentMetadata":
+        """
+        Fill the typed specification fields from the `specification` property.
 
-    def obfuscate(self) -> "DocumentMetadata":
+        Generic names and indications are stored normalized (case-folded, single
+        spaces), so they can be looked up exactly through an index.
+
+        Returns:
+            DocumentMetadata: Self, with the specification fields set.
+        """
+
+        fields = parse_specification(self.properties.get("specification"))
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+        return self
+
+    def obfuscate(self, key: str) -> "DocumentMetadata":
         """
-        Create am obfuscated version of the metadata.
+        Create an obfuscated version of the metadata.
+
+        The ID is replaced by an HMAC of it, so the same document is always obfuscated
+        the same way under the same key, and obfuscated exports can still be joined.
+
+        Args:
+            key (str): Secret key of the mapping, i.e. the `OBFUSCATION_KEY` setting.
 
         Returns:
             DocumentMetadata: Self, with ID and URL obfuscated.
+
+        Raises:
+            ValueError: If the key is empty.
         """
 
+        if not key:
+            # A default key would be public, and so would the mapping.
+            raise ValueError("Obfuscating documents requires the OBFUSCATION_KEY setting.")
+
         og_id = self.id.replace(":", "_")
-        fake_id = utils.generate_random_hex(len(og_id))
+        fake_id = utils.keyed_hex(og_id, key, len(og_id))
 
         self.id = fake_id
         self.url = self.url.replace(og_id, fake_id)
@@ -30,8 +106,50 @@ class DocumentMetadata(BaseModel):
 
 
 class Document(BaseModel):
-    id: str = Field(default_factory=lambda: utils.generate_random_hex(length=32))
+    id: str
     metadata: DocumentMetadata
+    token_counts: dict[str, int] = Field(default_factory=dict)
+
+    @model_validator(mode="before")
+    @classmethod
+    def derive_id(cls, data):
+        """Default the ID to a hash of the canonical URL, see `utils.document_id`."""
+        if isinstance(data, dict) and not data.get("id"):
+            metadata = data.get("metadata")
+            if isinstance(metadata, dict):
+                url = metadata.get("url")
+            else:
+                url = getattr(metadata, "url", None)
+            if url:
+                data = {**data, "id": utils.document_id(url)}
+        return data
+
+    @computed_field
+    @property
+    def content_fingerprint(self) -> str:
+        """Hash of the `CONTENT_FIELDS`, which changes whenever the content does."""
+        dump = {"metadata": self.metadata.model_dump()}
+        return utils.compute_fingerprint(
+            {field: utils.get_nested(dump, field) for field in CONTENT_FIELDS}
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Document":
+        """
+        Build a Document from its stored form, with its specification parsed.
+
+        Every loader goes through here, so documents stored before the specification
+        fields existed, or by an older parser, get the same fields as freshly crawled ones.
+
+        Args:
+            data (dict): The document, as dumped by `model_dump`.
+
+        Returns:
+            Document: The loaded document.
+        """
+        document = cls.model_validate(data)
+        document.metadata.parse_specification()
+        return document
 
     @classmethod
     def from_file(cls, file_path: Path) -> "Document":
@@ -44,55 +162,182 @@ class Document(BaseModel):
         Returns:
             Document: The loaded document.
         """
-        with file_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        return cls(**data)
+        return cls.from_dict(decode_document_json(file_path.read_bytes()))
+
+    @classmethod
+    def load_dir(
+        cls,
+        directory: Path,
+        chunk_size: int = 1000,
+        max_workers: Optional[int] = None,
+        pattern: str = "*.json",
+    ) -> Iterator[list["Document"]]:
+        """
+        Load every document file in a directory, in chunks.
+
+        Files are decoded with orjson and validated on a process pool, `chunk_size` files
+        per task, and chunks are yielded in file name order. Both the current format
+        and the legacy double-encoded one are read. Files that cannot be loaded are
+        logged and skipped.
+
+        Args:
+            directory (Path): Directory holding the document files.
+            chunk_size (int): Number of files per chunk.
+            max_workers (Optional[int]): Number of worker processes. Defaults to the
+                number of CPUs. With 1, or a single chunk, files are loaded in-process.
+            pattern (str): Glob pattern of the document files.
+
+        Yields:
+            list[Document]: The documents of the next chunk.
+        """
+        paths = sorted(Path(directory).glob(pattern))
+        chunk_size = max(1, chunk_size)
+        chunks = [paths[i : i + chunk_size] for i in range(0, len(paths), chunk_size)]
+
+        workers = max_workers or os.cpu_count() or 1
+        if len(chunks) <= 1 or workers == 1:
+            for chunk in chunks:
+                yield cls.__collect(_load_files(chunk))
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Only a few chunks are in flight, so a slow consumer does not end up with
+            # the whole directory decoded in memory.
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_load_files, chunk))
+                if len(pending) >= 2 * workers:
+                    yield cls.__collect(pending.popleft().result())
+            while pending:
+                yield cls.__collect(pending.popleft().result())
+
+    @classmethod
+    def count_tokens(
+        cls,
+        documents: list["Document"],
+        model_id: str,
+        num_threads: Optional[int] = None,
+    ) -> list["Document"]:
+        """
+        Count the tokens of every `properties` section and store them in `token_counts`.
+
+        The sections of all documents are encoded in one multi-threaded batch.
+
+        Args:
+            documents (list[Document]): The documents to count.
+            model_id (str): The model name to determine encoding.
+            num_threads (Optional[int]): Number of tokenizer threads. Defaults to the
+                number of CPUs.
+
+        Returns:
+            list[Document]: The same documents, with `token_counts` set.
+        """
+        sections = cls.__sections(documents)
+        counts = utils.count_tokens_batch(
+            [text for _, _, text in sections], model_id, num_threads=num_threads
+        )
+        for (document, key, _), count in zip(sections, counts):
+            document.token_counts[key] = count
+
+        return documents
+
+    @classmethod
+    def clip_tokens(
+        cls,
+        documents: list["Document"],
+        max_tokens: int,
+        model_id: str,
+        num_threads: Optional[int] = None,
+    ) -> list["Document"]:
+        """
+        Clip every `properties` section to a maximum number of tokens, in place.
+
+        The sections of all documents are clipped in one multi-threaded batch, and the
+        token count of each clipped section is stored in `token_counts`.
+
+        Args:
+            documents (list[Document]): The documents to clip.
+            max_tokens (int): Maximum number of tokens to keep per section.
+            model_id (str): The model name to determine encoding.
+            num_threads (Optional[int]): Number of tokenizer threads. Defaults to the
+                number of CPUs.
+
+        Returns:
+            list[Document]: The same documents, clipped and with `token_counts` set.
+        """
+        sections = cls.__sections(documents)
+        clipped, counts = utils.clip_tokens_batch(
+            [text for _, _, text in sections], max_tokens, model_id, num_threads=num_threads
+        )
+        for (document, key, _), text, count in zip(sections, clipped, counts):
+            document.metadata.properties[key] = text
+            document.token_counts[key] = count
+
+        return documents
+
+    @staticmethod
+    def __sections(documents: list["Document"]) -> list[tuple["Document", str, str]]:
+        return [
+            (document, key, value)
+            for document in documents
+            for key, value in document.metadata.properties.items()
+            if isinstance(value, str)
+        ]
+
+    @staticmethod
+    def __collect(result: tuple[list["Document"], list[str]]) -> list["Document"]:
+        documents, failed = result
+        for failure in failed:
+            logger.warning(f"Skipping unreadable document file {failure}")
+        return documents
 
     def write(
         self,
         output_dir: Path, 
         obfuscate: bool = False,
-        also_save_as_txt: bool = False
+        also_save_as_txt: bool = False,
+        obfuscation_key: Optional[str] = None,
     ) -> None:
         """
         Write the document to a JSON file.
 
         Args:
             output_dir (Path): Directory to save the document.
-            obfuscate (bool): Whether to obfuscate the metadata.
+            obfuscate (bool): Whether to obfuscate the ID and metadata.
+            obfuscation_key (Optional[str]): Secret key of the mapping, required to
+                obfuscate.
+
+        Raises:
+            ValueError: If `obfuscate` is set without an `obfuscation_key`.
         """
         output_dir.mkdir(parents=True, exist_ok=True)
 
         if obfuscate:
-            self.metadata = self.metadata.obfuscate()
-
-        json_data = self.model_dump_json()
+            self.obfuscate(obfuscation_key)
 
         output_file = output_dir / f"{self.id}.json"
         with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(
-                json_data,
-                f,
-                indent=4,
-                ensure_ascii=False,
-            )
+            f.write(self.model_dump_json(indent=4))
 
         if also_save_as_txt:
             txt_path = output_file.with_suffix(".txt")
             with open(txt_path, "w", encoding="utf-8") as f:
                 f.write(self.metadata.name + "\n")
 
-    def obfuscate(self) -> "Document":
+    def obfuscate(self, key: str) -> "Document":
         """
         Create an obfuscated version of the document.
 
+        Args:
+            key (str): Secret key of the mapping, i.e. the `OBFUSCATION_KEY` setting.
+
         Returns:
             Document: Self, with ID and URL obfuscated.
+
+        Raises:
+            ValueError: If the key is empty.
         """
-        self.metadata = self.metadata.obfuscate()
-        self.parent_metadata = (
-            self.parent_metadata.obfuscate() if self.parent_metadata else None
-        )
+        self.metadata = self.metadata.obfuscate(key)
         self.id = self.metadata.id
 
         return self
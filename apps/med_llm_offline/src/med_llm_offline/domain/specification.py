@@ -0,0 +1,90 @@
+import re
+from typing import Optional
+
+# Labels of the specification block, e.g. "Requires Prescription (YES/NO) Yes". A label
+# must be a whole word followed by a colon, whitespace or the end of the line, so
+# "Used formerly in ..." is not read as "Used For". "(YES/NO)" may be followed by a colon.
+SPECIFICATION_LABEL = re.compile(
+    r"^\s*(?P<label>"
+    r"requires\s+prescription(?:\s*\(\s*yes\s*/\s*no\s*\))?"
+    r"|generics?"
+    r"|used\s+for"
+    r"|how\s+it\s+works"
+    r")(?:\b\s*:|\b\s+|\b$|(?<=\))\s*:?)\s*(?P<value>.*)$",
+    re.IGNORECASE,
+)
+# The free-text label. Its paragraph may contain lines that begin with another label,
+# e.g. "Generic medicines ...", which continue it instead of starting a field.
+FREE_TEXT_LABEL = "how it works"
+# Combination products list their generics as "A + B". Commas and ampersands belong to
+# multi-part names such as "Vitamin B1, B6 & B12".
+GENERIC_SEPARATOR = re.compile(r"\s*[+;]\s*")
+# Indications are listed as "Stroke, Deep Vein Thrombosis".
+INDICATION_SEPARATOR = re.compile(r"\s*[,;]\s*")
+
+
+def normalize_term(value: str) -> str:
+    """Normalize a generic name or indication for exact, case-insensitive lookups."""
+    return " ".join(value.split()).casefold()
+
+
+def _parse_list(value: str, separator: re.Pattern) -> list[str]:
+    terms = [normalize_term(term) for term in separator.split(value)]
+    return list(dict.fromkeys(term for term in terms if term))
+
+
+def _parse_yes_no(value: str) -> Optional[bool]:
+    answer = value.strip().casefold()
+    if answer.startswith("yes"):
+        return True
+    if answer.startswith("no"):
+        return False
+    return None
+
+
+def parse_specification(text: Optional[str]) -> dict:
+    """
+    Parse the label/value lines of a product's specification block.
+
+    Lines that start with no known label continue the value of the current label.
+    Inside the free-text "How it works" value every line does, so a multi-line
+    paragraph is kept whole; elsewhere a known label always starts a new field, in
+    whatever order the labels come.
+
+    Args:
+        text: The `specification` property, e.g. "Requires Prescription (YES/NO) Yes\\n
+            Generics Apixaban\\nUsed For Stroke\\nHow it works ...".
+
+    Returns:
+        dict: `requires_prescription` (bool or None), `generics` and `used_for` (lists
+            of normalized terms) and `how_it_works` (str or None).
+    """
+    values: dict[str, list[str]] = {}
+    current = None
+    for line in (text or "").splitlines():
+        match = SPECIFICATION_LABEL.match(line)
+        label = None
+        if match:
+            label = " ".join(match["label"].split()).casefold()
+            label = "requires prescription" if label.startswith("requires") else label
+            label = "generics" if label == "generic" else label
+            if current == FREE_TEXT_LABEL:
+                label = None
+
+        if label is not None:
+            current = label
+            values.setdefault(current, []).append(match["value"].strip())
+        elif current is not None and line.strip():
+            values[current].append(line.strip())
+
+    how_it_works = " ".join(values.get(FREE_TEXT_LABEL, [])).strip()
+    return {
+        "requires_prescription": _parse_yes_no(
+            " ".join(values.get("requires prescription", []))
+        ),
+        "generics": _parse_list(" ".join(values.get("generics", [])), GENERIC_SEPARATOR),
+        "used_for": _parse_list(
+            " ".join(values.get("used for", [])), INDICATION_SEPARATOR
+        ),
+        "how_it_works": how_it_works or None,
+    }
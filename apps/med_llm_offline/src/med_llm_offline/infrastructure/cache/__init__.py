@@ -0,0 +1,4 @@
+from .embedding_cache import EmbeddingCache
+from .response_cache import CachedResponse, ResponseCache
+
+__all__ = ["CachedResponse", "EmbeddingCache", "ResponseCache"]
@@ -0,0 +1,90 @@
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+# SQLite allows at most 999 bound parameters per statement in older builds.
+LOOKUP_BATCH_SIZE = 900
+
+
+class EmbeddingCache:
+    """On-disk cache of text embeddings keyed by a hash of the text.
+
+    Vectors are stored as float32 blobs in a SQLite database, one table row per
+    (encoder, content hash) pair, so changing the encoder never serves stale vectors
+    and unchanged products are never embedded again.
+
+    Args:
+        cache_dir: Directory holding the database.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._db = sqlite3.connect(self.cache_dir / "embeddings.sqlite")
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                encoder TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (encoder, content_hash)
+            ) WITHOUT ROWID
+            """
+        )
+        self._db.commit()
+
+    def __enter__(self) -> "EmbeddingCache":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @staticmethod
+    def hash_content(text: str) -> str:
+        """Hash a text for cache lookups."""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get_many(self, encoder: str, content_hashes: Iterable[str]) -> dict[str, np.ndarray]:
+        """Look up the cached vectors of many texts.
+
+        Args:
+            encoder: Name of the encoder the vectors were computed with.
+            content_hashes: Hashes of the texts, from `hash_content`.
+
+        Returns:
+            dict[str, np.ndarray]: The cached vectors, by content hash. Misses are left out.
+        """
+        content_hashes = list(dict.fromkeys(content_hashes))
+        vectors = {}
+        for start in range(0, len(content_hashes), LOOKUP_BATCH_SIZE):
+            batch = content_hashes[start : start + LOOKUP_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            for content_hash, vector in self._db.execute(
+                "SELECT content_hash, vector FROM embeddings "
+                f"WHERE encoder = ? AND content_hash IN ({placeholders})",
+                (encoder, *batch),
+            ):
+                vectors[content_hash] = np.frombuffer(vector, dtype=np.float32)
+
+        return vectors
+
+    def put_many(self, encoder: str, vectors: dict[str, np.ndarray]) -> None:
+        """Store the vectors of many texts, by content hash."""
+        self._db.executemany(
+            "INSERT OR REPLACE INTO embeddings (encoder, content_hash, vector) VALUES (?, ?, ?)",
+            (
+                (encoder, content_hash, np.asarray(vector, dtype=np.float32).tobytes())
+                for content_hash, vector in vectors.items()
+            ),
+        )
+        self._db.commit()
+
+    def close(self) -> None:
+        """Close the cache database."""
+        self._db.close()
@@ -0,0 +1,280 @@
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+from pydantic import BaseModel
+
+
+class CachedResponse(BaseModel):
+    """A cached response, together with the document extracted from it, if any."""
+
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    body_hash: str
+    size: int
+    fetched_at: float
+    document: Optional[dict] = None
+    extractor_version: Optional[str] = None
+
+
+class ResponseCache:
+    """On-disk HTTP response cache keyed by URL.
+
+    A small SQLite database holds, per URL, the validators (ETag, Last-Modified), a
+    hash of the body and the document extracted from it. This lets a recrawl send
+    conditional requests and skip extraction altogether when a page has not changed.
+    Bodies themselves are not kept, only their hash.
+
+    Every entry records the version of the extractor that built its document. Entries
+    from another version are treated as missing, so documents are extracted again
+    after the extraction or the Document model changes, even for unchanged pages.
+
+    Lookups only note when an entry was last used; those notes are written together
+    with the next change to the index, so a cache hit costs no commit.
+
+    Args:
+        cache_dir: Directory holding the index.
+        extractor_version: Version of the extractor building the cached documents.
+        ttl_seconds: How long an entry is trusted without revalidating it.
+        max_size_bytes: Upper bound on the total size of cached documents. Least
+            recently used entries are evicted once it is exceeded.
+        max_idle_seconds: Entries not used for this long are dropped when the cache opens.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        extractor_version: str,
+        ttl_seconds: float = 6 * 3600,
+        max_size_bytes: int = 512 * 1024 * 1024,
+        max_idle_seconds: float = 30 * 24 * 3600,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.extractor_version = extractor_version
+        self.ttl_seconds = ttl_seconds
+        self.max_size_bytes = max_size_bytes
+        self.max_idle_seconds = max_idle_seconds
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Last use of the entries looked up since the index was last written.
+        self._accessed: dict[str, float] = {}
+
+        self._db = sqlite3.connect(self.cache_dir / "index.sqlite")
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                document TEXT,
+                extractor_version TEXT
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)"
+        )
+        self._db.commit()
+
+        (self._total_size,) = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+
+        self.purge_idle()
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @staticmethod
+    def hash_body(body: bytes) -> str:
+        """Hash a response body for change detection."""
+        return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Look up the cache entry for a URL and mark it as recently used.
+
+        Entries written by another extractor version are treated as missing.
+        """
+        row = self._db.execute(
+            "SELECT url, etag, last_modified, body_hash, size, fetched_at, document, "
+            "extractor_version FROM entries WHERE url = ?",
+            (url,),
+        ).fetchone()
+        if row is None or row[-1] != self.extractor_version:
+            return None
+
+        self._accessed[url] = time.time()
+
+        url, etag, last_modified, body_hash, size, fetched_at, document, version = row
+        return CachedResponse(
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            body_hash=body_hash,
+            size=size,
+            fetched_at=fetched_at,
+            document=json.loads(document) if document else None,
+            extractor_version=version,
+        )
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """Check whether an entry can be used without revalidation."""
+        return time.time() - entry.fetched_at < self.ttl_seconds
+
+    def conditional_headers(self, entry: Optional[CachedResponse]) -> dict[str, str]:
+        """Build the headers for a conditional request revalidating an entry."""
+        headers = {}
+        if entry is None:
+            return headers
+
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        return headers
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        document: Optional[dict] = None,
+    ) -> CachedResponse:
+        """Store the hash and validators of a response and the document extracted from it."""
+        document_json = json.dumps(document, ensure_ascii=False) if document else None
+        size = len(document_json.encode("utf-8")) if document_json else 0
+
+        previous = self._db.execute(
+            "SELECT size FROM entries WHERE url = ?", (url,)
+        ).fetchone()
+        if previous is not None:
+            self._total_size -= previous[0]
+        self._total_size += size
+
+        self.__write_accessed()
+        now = time.time()
+        entry = CachedResponse(
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            body_hash=self.hash_body(body),
+            size=size,
+            fetched_at=now,
+            document=document,
+            extractor_version=self.extractor_version,
+        )
+        self._db.execute(
+            "INSERT OR REPLACE INTO entries "
+            "(url, etag, last_modified, body_hash, size, fetched_at, accessed_at, document, "
+            "extractor_version) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                url,
+                etag,
+                last_modified,
+                entry.body_hash,
+                entry.size,
+                now,
+                now,
+                document_json,
+                self.extractor_version,
+            ),
+        )
+        self._db.commit()
+
+        self.evict()
+
+        return entry
+
+    def revalidated(
+        self,
+        entry: CachedResponse,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Mark an entry as confirmed unchanged by the server, refreshing its validators."""
+        self.__write_accessed()
+        self._db.execute(
+            "UPDATE entries SET fetched_at = ?, etag = COALESCE(?, etag), "
+            "last_modified = COALESCE(?, last_modified) WHERE url = ?",
+            (time.time(), etag, last_modified, entry.url),
+        )
+        self._db.commit()
+
+    def evict(self) -> None:
+        """Evict least recently used entries until the cache fits in `max_size_bytes`."""
+        if self._total_size <= self.max_size_bytes:
+            return
+
+        # Least recently used is only known once the pending lookups are written.
+        self.__write_accessed()
+        self._db.commit()
+
+        # Evict down to 90% of the limit so that we don't evict on every put.
+        target_size = int(self.max_size_bytes * 0.9)
+        total_size = self._total_size
+        evicted = []
+        for url, size in self._db.execute(
+            "SELECT url, size FROM entries ORDER BY accessed_at ASC"
+        ):
+            if total_size <= target_size:
+                break
+            evicted.append(url)
+            total_size -= size
+
+        self.__delete(evicted)
+        logger.debug(f"Evicted {len(evicted)} entries from the response cache.")
+
+    def purge_idle(self) -> None:
+        """Drop entries that have not been used for `max_idle_seconds`."""
+        cutoff = time.time() - self.max_idle_seconds
+        idle = [
+            url
+            for (url,) in self._db.execute(
+                "SELECT url FROM entries WHERE accessed_at < ?", (cutoff,)
+            )
+        ]
+        self.__delete(idle)
+
+    def close(self) -> None:
+        """Write the pending lookups and close the cache index."""
+        self.__write_accessed()
+        self._db.commit()
+        self._db.close()
+
+    def __write_accessed(self) -> None:
+        """Stage the pending `accessed_at` updates; the caller commits them."""
+        if not self._accessed:
+            return
+
+        self._db.executemany(
+            "UPDATE entries SET accessed_at = ? WHERE url = ?",
+            [(accessed_at, url) for url, accessed_at in self._accessed.items()],
+        )
+        self._accessed.clear()
+
+    def __delete(self, urls: list[str]) -> None:
+        for url in urls:
+            size = self._db.execute(
+                "SELECT size FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+            if size is not None:
+                self._total_size -= size[0]
+
+        self._db.executemany("DELETE FROM entries WHERE url = ?", [(url,) for url in urls])
+        self._db.commit()
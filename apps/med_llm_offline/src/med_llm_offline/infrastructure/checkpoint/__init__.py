@@ -0,0 +1,3 @@
+from .journal import CrawlJournal
+
+__all__ = ["CrawlJournal"]
@@ -0,0 +1,158 @@
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+JOURNAL_FILE_NAME = "crawl.journal.jsonl"
+
+
+class CrawlJournal:
+    """Append-only, crash-safe journal of a crawl's progress.
+
+    Every completed listing page (with its product links), the last listing page once
+    it is known and every extracted document are appended to a JSON-lines file.
+    Records are buffered and written with a single `fsync` per batch of `batch_size`
+    records, or sooner once `flush_interval` seconds have passed, so a killed run loses
+    at most the batch that was still buffered.
+
+    When resuming, the journal is replayed on open: a torn last line left by a crash is
+    cut off, and the recorded pages, documents and last page are exposed so the crawl
+    can skip work it has already done.
+
+    Args:
+        journal_dir: Directory holding the journal file.
+        base_url: Base URL of the crawl. A journal is only resumed for the same site.
+        start_page: First listing page of the crawl, checked like `base_url`.
+        resume: If True, continue the existing journal. Otherwise it is started over.
+        batch_size: Number of records buffered before they are written and synced.
+        flush_interval: Maximum number of seconds a record stays buffered.
+
+    Raises:
+        ValueError: If resuming a journal written for another `base_url` or `start_page`.
+    """
+
+    def __init__(
+        self,
+        journal_dir: Path,
+        base_url: str,
+        start_page: int = 1,
+        resume: bool = False,
+        batch_size: int = 50,
+        flush_interval: float = 2.0,
+    ) -> None:
+        self.path = Path(journal_dir) / JOURNAL_FILE_NAME
+        self.base_url = base_url
+        self.start_page = start_page
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+
+        self.pages: dict[int, list[str]] = {}
+        self.scraped_urls: set[str] = set()
+        self.documents: list[dict] = []
+        self.last_page: Optional[int] = None
+
+        self._buffer: list[bytes] = []
+        self._last_flush = time.monotonic()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self.path.exists():
+            self.__replay()
+            logger.info(
+                f"Resuming crawl from {self.path}: {len(self.pages)} listing pages and "
+                f"{len(self.documents)} documents already done."
+            )
+            self._file = self.path.open("ab")
+        else:
+            self._file = self.path.open("wb")
+            self.__append(
+                {
+                    "type": "run",
+                    "base_url": base_url,
+                    "start_page": start_page,
+                    "started_at": datetime.now(timezone.utc).isoformat(),
+                }
+            )
+            self.flush()
+
+    def __enter__(self) -> "CrawlJournal":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def record_page(self, page_number: int, links: list[str]) -> None:
+        """Record a listing page whose product links have all been queued."""
+        self.pages[page_number] = links
+        self.__append({"type": "page", "page": page_number, "links": links})
+
+    def record_last_page(self, page_number: int) -> None:
+        """Record the last listing page, so a resumed crawl does not search for it again."""
+        self.last_page = page_number
+        self.__append({"type": "last_page", "page": page_number})
+
+    def record_document(self, url: str, document: dict) -> None:
+        """Record a product page and the document extracted from it."""
+        self.scraped_urls.add(url)
+        self.__append({"type": "document", "url": url, "document": document})
+
+    def flush(self) -> None:
+        """Write the buffered records and sync them to disk."""
+        if self._buffer:
+            self._file.write(b"".join(self._buffer))
+            self._buffer.clear()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __append(self, record: dict) -> None:
+        self._buffer.append(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+        if (
+            len(self._buffer) >= self.batch_size
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def __replay(self) -> None:
+        valid_size = 0
+        with self.path.open("rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("truncated record")
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Dropping a torn record at byte {valid_size} of {self.path}")
+                    break
+
+                self.__apply(record)
+                valid_size += len(line)
+
+        if valid_size != self.path.stat().st_size:
+            os.truncate(self.path, valid_size)
+
+    def __apply(self, record: dict) -> None:
+        kind = record["type"]
+        if kind == "run":
+            if record["base_url"] != self.base_url or record["start_page"] != self.start_page:
+                raise ValueError(
+                    f"{self.path} belongs to a crawl of {record['base_url']} from page "
+                    f"{record['start_page']}, not {self.base_url} from page {self.start_page}."
+                )
+        elif kind == "page":
+            self.pages[record["page"]] = record["links"]
+        elif kind == "last_page":
+            self.last_page = record["page"]
+        elif kind == "document":
+            if record["url"] not in self.scraped_urls:
+                self.scraped_urls.add(record["url"])
+                self.documents.append(record["document"])
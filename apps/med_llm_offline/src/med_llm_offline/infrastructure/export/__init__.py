@@ -0,0 +1,24 @@
+from .arrow import documents_to_table, table_to_documents
+from .corpus import (
+    CorpusExporter,
+    ExportManifest,
+    ShardInfo,
+    read_export,
+    read_export_chunks,
+    read_manifest,
+    read_shard,
+)
+from .sequence import DocumentSequence
+
+__all__ = [
+    "CorpusExporter",
+    "DocumentSequence",
+    "ExportManifest",
+    "ShardInfo",
+    "documents_to_table",
+    "read_export",
+    "read_export_chunks",
+    "read_manifest",
+    "read_shard",
+    "table_to_documents",
+]
@@ -0,0 +1,99 @@
+from typing import Iterable, Iterator, Optional
+
+import pyarrow as pa
+
+from src.med_llm_offline.domain import Document
+
+PROPERTY_PREFIX = "properties."
+TOKEN_COUNT_PREFIX = "token_counts."
+
+# Columns every Document table has, in this order, before the property columns.
+BASE_COLUMNS = ("id", "metadata.id", "metadata.url", "name")
+
+
+def documents_to_table(documents: Iterable[Document]) -> pa.Table:
+    """
+    Flatten documents into an Arrow table.
+
+    The table has the columns of `BASE_COLUMNS` followed by one string column per
+    `properties` key, named `properties.<key>`, and one integer column per counted
+    section, named `token_counts.<key>`. A document without a given key gets a null in
+    that column, so keys that only some documents have survive a round trip.
+    """
+    columns: dict[str, list] = {name: [] for name in BASE_COLUMNS}
+    properties: dict[str, list[Optional[str]]] = {}
+    token_counts: dict[str, list[Optional[int]]] = {}
+
+    for row, document in enumerate(documents):
+        columns["id"].append(document.id)
+        columns["metadata.id"].append(document.metadata.id)
+        columns["metadata.url"].append(document.metadata.url)
+        columns["name"].append(document.metadata.name)
+
+        for key, value in document.metadata.properties.items():
+            column = properties.get(key)
+            if column is None:
+                column = properties[key] = [None] * row
+            column.append(value if value is None else str(value))
+
+        for key, count in document.token_counts.items():
+            column = token_counts.get(key)
+            if column is None:
+                column = token_counts[key] = [None] * row
+            column.append(count)
+
+        for column in (*properties.values(), *token_counts.values()):
+            if len(column) == row:
+                column.append(None)
+
+    arrays = {name: pa.array(values, type=pa.string()) for name, values in columns.items()}
+    for key, column in properties.items():
+        arrays[f"{PROPERTY_PREFIX}{key}"] = pa.array(column, type=pa.string())
+    for key, column in token_counts.items():
+        arrays[f"{TOKEN_COUNT_PREFIX}{key}"] = pa.array(column, type=pa.int64())
+
+    return pa.table(arrays)
+
+
+def property_keys(schema: pa.Schema) -> list[str]:
+    """The `properties` keys stored in a Document table."""
+    return [
+        name[len(PROPERTY_PREFIX):] for name in schema.names if name.startswith(PROPERTY_PREFIX)
+    ]
+
+
+def row_to_document(row: dict) -> Document:
+    """
+    Rebuild a Document from one row of a Document table, as returned by `to_pylist`.
+
+    The specification fields are not stored in the table and are parsed again.
+    """
+    properties = {
+        name[len(PROPERTY_PREFIX):]: value
+        for name, value in row.items()
+        if name.startswith(PROPERTY_PREFIX) and value is not None
+    }
+    token_counts = {
+        name[len(TOKEN_COUNT_PREFIX):]: value
+        for name, value in row.items()
+        if name.startswith(TOKEN_COUNT_PREFIX) and value is not None
+    }
+    return Document.from_dict(
+        {
+            "id": row["id"],
+            "metadata": {
+                "id": row["metadata.id"],
+                "url": row["metadata.url"],
+                "name": row["name"],
+                "properties": properties,
+            },
+            "token_counts": token_counts,
+        }
+    )
+
+
+def table_to_documents(table: pa.Table) -> Iterator[Document]:
+    """Rebuild the documents of a Document table, one record batch at a time."""
+    for batch in table.to_batches():
+        for row in batch.to_pylist():
+            yield row_to_document(row)
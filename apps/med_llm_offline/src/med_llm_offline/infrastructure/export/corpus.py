@@ -0,0 +1,270 @@
+import hashlib
+import io
+import json
+import os
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, Literal, Optional
+
+import pyarrow.parquet as pq
+import zstandard
+from loguru import logger
+from pydantic import BaseModel
+
+from src.med_llm_offline.config import settings
+from src.med_llm_offline.domain import Document
+
+from .arrow import BASE_COLUMNS, PROPERTY_PREFIX, documents_to_table, table_to_documents
+
+MANIFEST_FILE_NAME = "manifest.json"
+
+ExportFormat = Literal["jsonl", "parquet"]
+
+
+class ShardInfo(BaseModel):
+    """One shard of an export: where it is, which documents it holds and its checksum."""
+
+    path: str
+    offset: int
+    documents: int
+    bytes: int
+    sha256: str
+
+
+class ExportManifest(BaseModel):
+    """Describes an export: its format and every shard, in document order."""
+
+    format: ExportFormat
+    compression: str
+    documents: int
+    shard_size: int
+    created_at: datetime
+    shards: list[ShardInfo]
+
+
+class CorpusExporter:
+    """
+    Writes documents as a sharded, compressed corpus with a manifest.
+
+    Documents are cut into shards of `shard_size` and each shard is written as a single
+    file, either zstd-compressed JSON lines or a zstd-compressed Parquet file. Shards
+    are encoded, compressed and written on a thread pool while the next ones are being
+    assembled. `manifest.json` lists every shard with its document offset, size and
+    SHA-256, and is replaced atomically once all shards are on disk, so a reader never
+    sees a half-written export. Shards of the previous export are only deleted after
+    that.
+
+    Args:
+        output_dir: Directory of the export.
+        format: "jsonl" for zstd-compressed JSON lines, "parquet" for Parquet files with
+            one column per field, see `documents_to_table`.
+        shard_size: Maximum number of documents per shard.
+        compression_level: zstd compression level.
+        max_workers: Number of shards written concurrently.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        format: ExportFormat = "jsonl",
+        shard_size: int = 10_000,
+        compression_level: int = 3,
+        max_workers: int = 4,
+    ) -> None:
+        if format not in ("jsonl", "parquet"):
+            raise ValueError(f"Unsupported export format: {format}")
+
+        self.output_dir = Path(output_dir)
+        self.format = format
+        self.shard_size = max(1, shard_size)
+        self.compression_level = compression_level
+        self.max_workers = max(1, max_workers)
+        self.manifest_path = self.output_dir / MANIFEST_FILE_NAME
+
+    def export(self, documents: Iterable[Document], obfuscate: bool = False) -> ExportManifest:
+        """
+        Export documents, replacing any previous export in `output_dir`.
+
+        Args:
+            documents: The documents, consumed lazily, one shard at a time.
+            obfuscate: Whether to obfuscate the metadata of the exported copies.
+
+        Returns:
+            ExportManifest: The manifest that was written.
+
+        Raises:
+            ValueError: If `obfuscate` is set but `OBFUSCATION_KEY` is not.
+        """
+        obfuscation_key = settings.OBFUSCATION_KEY
+        if obfuscate and not obfuscation_key:
+            raise ValueError("Obfuscating documents requires the OBFUSCATION_KEY setting.")
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        previous = read_manifest(self.output_dir) if self.manifest_path.exists() else None
+
+        export_id = uuid.uuid4().hex[:8]
+        suffix = "jsonl.zst" if self.format == "jsonl" else "parquet"
+        documents = iter(documents)
+
+        futures: list[Future] = []
+        pending: deque[Future] = deque()
+        offset = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while shard := list(islice(documents, self.shard_size)):
+                if obfuscate:
+                    shard = [
+                        document.model_copy(
+                            update={"metadata": document.metadata.model_copy()}
+                        ).obfuscate(obfuscation_key)
+                        for document in shard
+                    ]
+
+                path = f"part-{export_id}-{len(futures):05d}.{suffix}"
+                future = executor.submit(self.__write_shard, path, offset, shard)
+                futures.append(future)
+                pending.append(future)
+                offset += len(shard)
+
+                # Keep at most a couple of shards per worker in memory.
+                if len(pending) >= 2 * self.max_workers:
+                    pending.popleft().result()
+
+            shards = [future.result() for future in futures]
+
+        manifest = ExportManifest(
+            format=self.format,
+            compression="zstd",
+            documents=offset,
+            shard_size=self.shard_size,
+            created_at=datetime.now(timezone.utc),
+            shards=shards,
+        )
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        tmp_path.write_text(manifest.model_dump_json(indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.manifest_path)
+
+        if previous is not None:
+            current = {shard.path for shard in shards}
+            for shard in previous.shards:
+                if shard.path not in current:
+                    (self.output_dir / shard.path).unlink(missing_ok=True)
+
+        logger.info(
+            f"Exported {offset} documents to {len(shards)} {self.format} shards in {self.output_dir}"
+        )
+        return manifest
+
+    def __write_shard(self, path: str, offset: int, documents: list[Document]) -> ShardInfo:
+        if self.format == "jsonl":
+            lines = b"".join(
+                document.model_dump_json().encode("utf-8") + b"\n" for document in documents
+            )
+            data = zstandard.ZstdCompressor(level=self.compression_level).compress(lines)
+        else:
+            buffer = io.BytesIO()
+            pq.write_table(
+                documents_to_table(documents),
+                buffer,
+                compression="zstd",
+                compression_level=self.compression_level,
+            )
+            data = buffer.getvalue()
+
+        (self.output_dir / path).write_bytes(data)
+
+        return ShardInfo(
+            path=path,
+            offset=offset,
+            documents=len(documents),
+            bytes=len(data),
+            sha256=hashlib.sha256(data).hexdigest(),
+        )
+
+
+def read_manifest(export_dir: Path) -> ExportManifest:
+    """Read the manifest of an export."""
+    with (Path(export_dir) / MANIFEST_FILE_NAME).open("r", encoding="utf-8") as f:
+        return ExportManifest.model_validate(json.load(f))
+
+
+def read_shard(
+    export_dir: Path,
+    shard: ShardInfo,
+    format: ExportFormat,
+    verify: bool = False,
+    properties: Optional[list[str]] = None,
+) -> list[Document]:
+    """
+    Read the documents of one shard.
+
+    Args:
+        export_dir: Directory of the export.
+        shard: The shard, from the manifest.
+        format: Format of the export.
+        verify: Whether to check the shard against its checksum first.
+        properties: For Parquet exports, the `properties` keys to read; the others are
+            not decoded at all. Every key by default.
+
+    Raises:
+        ValueError: If `verify` is set and the shard does not match its checksum.
+    """
+    data = (Path(export_dir) / shard.path).read_bytes()
+    if verify and hashlib.sha256(data).hexdigest() != shard.sha256:
+        raise ValueError(f"Checksum mismatch for shard {shard.path}")
+
+    if format == "jsonl":
+        lines = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+        return [Document.from_dict(json.loads(line)) for line in lines.splitlines() if line]
+
+    columns = None
+    if properties is not None:
+        columns = [*BASE_COLUMNS, *(f"{PROPERTY_PREFIX}{key}" for key in properties)]
+    table = pq.read_table(io.BytesIO(data), columns=columns)
+    return list(table_to_documents(table))
+
+
+def read_export(export_dir: Path, verify: bool = False) -> Iterator[Document]:
+    """Stream the documents of an export, shard by shard, in export order."""
+    manifest = read_manifest(export_dir)
+    for shard in manifest.shards:
+        yield from read_shard(export_dir, shard, manifest.format, verify=verify)
+
+
+def read_export_chunks(
+    export_dir: Path, verify: bool = False, max_workers: Optional[int] = None
+) -> Iterator[list[Document]]:
+    """
+    Load the documents of an export one shard per chunk, decoding shards in parallel.
+
+    Shards are decompressed and validated on a process pool, with a few shards per
+    worker in flight, and yielded in export order.
+
+    Args:
+        export_dir: Directory of the export.
+        verify: Whether to check every shard against its checksum.
+        max_workers: Number of worker processes. Defaults to the number of CPUs.
+
+    Yields:
+        list[Document]: The documents of the next shard.
+    """
+    manifest = read_manifest(export_dir)
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(manifest.shards) <= 1:
+        for shard in manifest.shards:
+            yield read_shard(export_dir, shard, manifest.format, verify=verify)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future] = deque()
+        for shard in manifest.shards:
+            pending.append(
+                executor.submit(read_shard, export_dir, shard, manifest.format, verify)
+            )
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
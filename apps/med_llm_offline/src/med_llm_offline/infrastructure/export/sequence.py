@@ -0,0 +1,124 @@
+from collections.abc import Sequence
+from typing import BinaryIO, Iterator, Optional, Union, overload
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.med_llm_offline.domain import Document
+
+from .arrow import (
+    BASE_COLUMNS,
+    PROPERTY_PREFIX,
+    TOKEN_COUNT_PREFIX,
+    property_keys,
+    row_to_document,
+)
+
+
+class DocumentSequence(Sequence):
+    """
+    Read-only, lazy sequence of the documents stored in a Parquet Document table.
+
+    Nothing but the file footer is read up front. Indexing decodes only the row group
+    holding the requested document, and keeps the rows of the last decoded row group
+    around so that sequential access decodes every row group once. `column` reads a
+    single column without building any Document, and `select` narrows the `properties`
+    keys that are decoded at all.
+
+    Every access builds a new Document, so changes made to a returned Document, e.g.
+    by `Document.clip_tokens`, are never seen through the sequence. Copy the documents
+    into a list to modify them.
+
+    Args:
+        source: Path or seekable binary file of a Parquet file written from
+            `documents_to_table`.
+        properties: The `properties` keys to decode. Every key by default.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, BinaryIO, pq.ParquetFile],
+        properties: Optional[list[str]] = None,
+    ) -> None:
+        self._file = source if isinstance(source, pq.ParquetFile) else pq.ParquetFile(source)
+        metadata = self._file.metadata
+
+        self.property_keys = property_keys(self._file.schema_arrow)
+        if properties is not None:
+            missing = set(properties) - set(self.property_keys)
+            if missing:
+                raise KeyError(f"Unknown properties: {sorted(missing)}")
+            self.property_keys = list(properties)
+
+        self._columns = [*BASE_COLUMNS, *(f"{PROPERTY_PREFIX}{key}" for key in self.property_keys)]
+        self._columns += [
+            f"{TOKEN_COUNT_PREFIX}{key}"
+            for key in self.property_keys
+            if f"{TOKEN_COUNT_PREFIX}{key}" in self._file.schema_arrow.names
+        ]
+        self._row_group_offsets = [0]
+        for index in range(metadata.num_row_groups):
+            self._row_group_offsets.append(
+                self._row_group_offsets[-1] + metadata.row_group(index).num_rows
+            )
+        self._cached_group: Optional[int] = None
+        self._cached_rows: list[dict] = []
+
+    def __len__(self) -> int:
+        return self._row_group_offsets[-1]
+
+    @overload
+    def __getitem__(self, index: int) -> Document: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Document]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("DocumentSequence index out of range")
+
+        group = self.__row_group_of(index)
+        return row_to_document(self.__row_group(group)[index - self._row_group_offsets[group]])
+
+    def __iter__(self) -> Iterator[Document]:
+        for group in range(len(self._row_group_offsets) - 1):
+            for row in self.__row_group(group):
+                yield row_to_document(row)
+
+    def column(self, name: str) -> list:
+        """
+        Read one column, e.g. "metadata.url" or "properties.specification".
+
+        Only that column is read from the file and no Document is built.
+        """
+        return self._file.read(columns=[name]).column(0).to_pylist()
+
+    def select(self, properties: list[str]) -> "DocumentSequence":
+        """A view of the same file that only decodes the given `properties` keys."""
+        return DocumentSequence(self._file, properties=properties)
+
+    def to_table(self) -> pa.Table:
+        """Read the selected columns as an Arrow table."""
+        return self._file.read(columns=self._columns)
+
+    def __row_group_of(self, index: int) -> int:
+        low, high = 0, len(self._row_group_offsets) - 1
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self._row_group_offsets[middle] <= index:
+                low = middle
+            else:
+                high = middle
+        return low
+
+    def __row_group(self, group: int) -> list[dict]:
+        if group != self._cached_group:
+            table = self._file.read_row_group(group, columns=self._columns)
+            self._cached_rows = table.to_pylist()
+            self._cached_group = group
+        return self._cached_rows
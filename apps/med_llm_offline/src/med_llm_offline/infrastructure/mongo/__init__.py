@@ -1,3 +1,5 @@
+from .client import MongoClientRegistry, get_client_registry
 from .service import MongoDBService
+from .writer import MongoBatchWriter
 
-__all__ = ["MongoDBService",]
+__all__ = ["MongoClientRegistry", "MongoDBService", "MongoBatchWriter", "get_client_registry"]
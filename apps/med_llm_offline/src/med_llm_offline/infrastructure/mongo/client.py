@@ -0,0 +1,113 @@
+import atexit
+from threading import Lock
+from typing import Optional
+
+import certifi
+
+from loguru import logger
+from pymongo import MongoClient
+
+from src.med_llm_offline.config import settings
+
+_registry: Optional["MongoClientRegistry"] = None
+_registry_lock = Lock()
+
+
+def get_client_registry() -> "MongoClientRegistry":
+    """Return the process-wide `MongoClientRegistry`, creating it on first use."""
+
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MongoClientRegistry()
+    return _registry
+
+
+class MongoClientRegistry:
+    """Registry of pooled MongoDB clients, one per connection URI.
+
+    A `MongoClient` owns a connection pool and background monitoring threads, so
+    creating one per service means a new TLS handshake, a ping and a new pool for
+    every step. Services borrow their client from the process-wide registry returned
+    by `get_client_registry` instead: the first
+    request for a URI creates and pings the client, later requests reuse it, and
+    every client is closed once when the process exits.
+
+    Pool size, timeouts and wire compressors come from the `MONGODB_*` settings.
+    """
+
+    def __init__(self) -> None:
+        self._clients: dict[str, MongoClient] = {}
+        self._lock = Lock()
+        atexit.register(self.close_all)
+
+    def get(self, mongodb_uri: str = settings.MONGODB_URI) -> MongoClient:
+        """Return the shared client for a URI, connecting on first use.
+
+        Args:
+            mongodb_uri: URI of the MongoDB instance.
+
+        Returns:
+            MongoClient: The pooled client for the URI.
+
+        Raises:
+            Exception: If connection to MongoDB fails.
+        """
+
+        with self._lock:
+            client = self._clients.get(mongodb_uri)
+            if client is not None:
+                return client
+
+            try:
+                client = MongoClient(mongodb_uri, **self.__client_options())
+                client.admin.command("ping")
+            except Exception as e:
+                logger.error(f"Failed to connect to MongoDB: {e}")
+                raise
+
+            self._clients[mongodb_uri] = client
+            logger.info(
+                f"Opened pooled MongoDB client (max pool size {settings.MONGODB_MAX_POOL_SIZE})"
+            )
+            return client
+
+    def close(self, mongodb_uri: str) -> None:
+        """Close and forget the client for a URI, if there is one.
+
+        Args:
+            mongodb_uri: URI of the MongoDB instance.
+        """
+
+        with self._lock:
+            client = self._clients.pop(mongodb_uri, None)
+        if client is not None:
+            client.close()
+
+    def close_all(self) -> None:
+        """Close every pooled client."""
+
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            client.close()
+        if clients:
+            logger.debug(f"Closed {len(clients)} pooled MongoDB client(s).")
+
+    @staticmethod
+    def __client_options() -> dict:
+        options = {
+            "appname": "med_llm",
+            "tls": True,
+            "tlsCAFile": certifi.where(),
+            "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+            "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+            "connectTimeoutMS": settings.MONGODB_CONNECT_TIMEOUT_MS,
+            "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+            "socketTimeoutMS": settings.MONGODB_SOCKET_TIMEOUT_MS,
+            "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
+        }
+        compressors = [c.strip() for c in settings.MONGODB_COMPRESSORS.split(",") if c.strip()]
+        if compressors:
+            options["compressors"] = compressors
+        return options
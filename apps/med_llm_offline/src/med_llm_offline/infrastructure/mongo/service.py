@@ -1,21 +1,69 @@
-from typing import Generic, Type, TypeVar
-
-import certifi
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Generic, Iterable, Iterator, Optional, Type, TypeVar
 
 from bson import ObjectId
 from loguru import logger
 from pydantic import BaseModel
-from pymongo import MongoClient, errors
+from pymongo import ASCENDING, IndexModel, UpdateMany, UpdateOne, errors
 
+from src.med_llm_offline import utils
 from src.med_llm_offline.config import settings
+from src.med_llm_offline.domain.crawl_report import CrawlReport
+from src.med_llm_offline.domain.document import CONTENT_FIELDS
+from src.med_llm_offline.domain.specification import normalize_term
+
+from .client import get_client_registry
 
 T = TypeVar("T", bound=BaseModel)
 
+SYNC_CHUNK_SIZE = 1000
+READ_BATCH_SIZE = 1000
+
+# The same fields as `Document.content_fingerprint`. The parsed specification fields
+# are part of it, so documents stored before they existed are rewritten once by the
+# next incremental sync.
+FINGERPRINT_FIELDS = CONTENT_FIELDS
+
+# Secondary indexes behind `find_by_specification`. `generics` and `used_for` are
+# arrays, so each index holds one entry per generic or indication.
+SPECIFICATION_INDEXES = {
+    "metadata_generics": [("metadata.generics", ASCENDING)],
+    "metadata_used_for": [("metadata.used_for", ASCENDING)],
+    "metadata_requires_prescription_generics": [
+        ("metadata.requires_prescription", ASCENDING),
+        ("metadata.generics", ASCENDING),
+    ],
+    "metadata_requires_prescription_used_for": [
+        ("metadata.requires_prescription", ASCENDING),
+        ("metadata.used_for", ASCENDING),
+    ],
+}
+
+_PARTITION_DONE = object()
+
+
+class BulkWriteStats(BaseModel):
+    """Outcome of one unordered bulk write batch."""
+
+    batch: int
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    errors: list[str] = []
+
+
 class MongoDBService(Generic[T]):
     """Service class for MongoDB operations, supporting ingestion, querying, and validation.
 
     This class provides methods to interact with MongoDB collections, including document
-    ingestion, querying, and validation operations.
+    ingestion, querying, and validation operations. The client is borrowed from the
+    process-wide `MongoClientRegistry`, so services for the same URI share one
+    connection pool.
 
     Args:
         model: The Pydantic model class to use for document serialization.
@@ -28,7 +76,7 @@ class MongoDBService(Generic[T]):
         collection_name: Name of the MongoDB collection.
         database_name: Name of the MongoDB database.
         mongodb_uri: MongoDB connection URI.
-        client: MongoDB client instance for database connections.
+        client: Pooled MongoDB client shared with other services for the same URI.
         database: Reference to the target MongoDB database.
         collection: Reference to the target MongoDB collection.
     """
@@ -60,16 +108,16 @@ class MongoDBService(Generic[T]):
         self.mongodb_uri = mongodb_uri
 
         try:
-            self.client = MongoClient(mongodb_uri, appname="med_llm", tls=True, tlsCAFile=certifi.where())
-            self.client.admin.command("ping")
+            self.client = get_client_registry().get(mongodb_uri)
         except Exception as e:
             logger.error(f"Failed to initialize MongoDBService: {e}")
             raise
 
         self.database = self.client[database_name]
         self.collection = self.database[collection_name]
-        logger.info(
-            f"Connected to MongoDB instance:\n URI: {mongodb_uri}\n Database: {database_name}\n Collection: {collection_name}"
+        self._unique_keys: set[str] = set()
+        logger.debug(
+            f"Using MongoDB collection:\n Database: {database_name}\n Collection: {collection_name}"
         )
 
     def __enter__(self) -> "MongoDBService":
@@ -82,7 +130,7 @@ class MongoDBService(Generic[T]):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
-        """Close MongoDB connection when exiting context.
+        """Release the borrowed collection when exiting context.
 
         Args:
             exc_type: Type of exception that occurred, if any.
@@ -140,12 +188,524 @@ class MongoDBService(Generic[T]):
             logger.error(f"Error inserting documents: {e}")
             raise
 
-    def fetch_documents(self, limit: int, query: dict) -> list[T]:
+    def ensure_unique_index(self, key: str) -> str:
+        """Create a unique index on `key` unless this service already ensured it.
+
+        Args:
+            key: Dotted path of the field that identifies a document.
+
+        Returns:
+            Name of the index.
+
+        Raises:
+            errors.DuplicateKeyError: If the collection already holds duplicate keys.
+            errors.PyMongoError: If the index creation fails.
+        """
+
+        index_name = f"{key.replace('.', '_')}_unique"
+        if key in self._unique_keys:
+            return index_name
+
+        try:
+            self.collection.create_index(
+                [(key, ASCENDING)], name=index_name, unique=True
+            )
+        except errors.DuplicateKeyError as e:
+            logger.error(
+                f"Cannot create a unique index on '{key}', the collection holds duplicates. "
+                f"Clear or deduplicate it first: {e}"
+            )
+            raise
+        except errors.PyMongoError as e:
+            logger.error(f"Error creating index on '{key}': {e}")
+            raise
+
+        self._unique_keys.add(key)
+        return index_name
+
+    def ensure_specification_indexes(self) -> list[str]:
+        """Create the indexes on the parsed specification fields of Documents.
+
+        With them, `find_by_specification` lookups by generic, indication and
+        prescription status are index seeks instead of collection scans.
+
+        Returns:
+            Names of the indexes.
+
+        Raises:
+            errors.PyMongoError: If the index creation fails.
+        """
+
+        try:
+            return self.collection.create_indexes(
+                [IndexModel(keys, name=name) for name, keys in SPECIFICATION_INDEXES.items()]
+            )
+        except errors.PyMongoError as e:
+            logger.error(f"Error creating specification indexes: {e}")
+            raise
+
+    @staticmethod
+    def specification_query(
+        generic: Optional[str] = None,
+        used_for: Optional[str] = None,
+        requires_prescription: Optional[bool] = None,
+    ) -> dict:
+        """Build the query matching documents by their parsed specification fields.
+
+        Args:
+            generic: Generic name the product must contain, in any case.
+            used_for: Indication the product must be used for, in any case.
+            requires_prescription: Required prescription status, if any.
+
+        Returns:
+            MongoDB query filter, served by the `SPECIFICATION_INDEXES`.
+        """
+
+        query = {}
+        if requires_prescription is not None:
+            query["metadata.requires_prescription"] = requires_prescription
+        if generic is not None:
+            query["metadata.generics"] = normalize_term(generic)
+        if used_for is not None:
+            query["metadata.used_for"] = normalize_term(used_for)
+        return query
+
+    def find_by_specification(
+        self,
+        generic: Optional[str] = None,
+        used_for: Optional[str] = None,
+        requires_prescription: Optional[bool] = None,
+        limit: int = 0,
+        include_deleted: bool = False,
+    ) -> list[T]:
+        """Find documents by generic name, indication and prescription status.
+
+        For example, `find_by_specification(generic="Apixaban", requires_prescription=True)`
+        returns every prescription-only product containing Apixaban.
+
+        Args:
+            generic: Generic name the product must contain, in any case.
+            used_for: Indication the product must be used for, in any case.
+            requires_prescription: Required prescription status, if any.
+            limit: Maximum number of documents to return, 0 for no limit.
+            include_deleted: Whether to include documents tombstoned by an
+                incremental sync.
+
+        Returns:
+            List of Pydantic model instances matching every given criterion.
+
+        Raises:
+            ValueError: If no criterion is given.
+            errors.PyMongoError: If the query fails.
+        """
+
+        query = self.specification_query(generic, used_for, requires_prescription)
+        if not query:
+            raise ValueError("At least one specification criterion is required.")
+
+        # Sorting on `_id` could make the planner walk the `_id` index instead of
+        # seeking through the specification indexes.
+        documents = []
+        for chunk in self.iter_documents(
+            query=query, include_deleted=include_deleted, limit=limit, sort=False
+        ):
+            documents.extend(chunk)
+        return documents
+
+    def bulk_upsert(
+        self,
+        documents: list[T],
+        key: str = "metadata.url",
+        batch_size: int = SYNC_CHUNK_SIZE,
+    ) -> list[BulkWriteStats]:
+        """Idempotently upsert documents on a unique key in unordered batches.
+
+        A unique index on `key` is created on demand. Each batch is sent as one
+        unordered `bulk_write`, so the server applies it at full speed and a bad
+        document only fails itself rather than the rest of the batch. Running the
+        same ingestion twice leaves the collection unchanged.
+
+        Args:
+            documents: List of Pydantic model instances to upsert.
+            key: Dotted path of the field that identifies a document.
+            batch_size: Number of documents per bulk write.
+
+        Returns:
+            Per-batch counts of inserted, updated, unchanged and failed documents.
+
+        Raises:
+            ValueError: If documents is empty or contains non-Pydantic model items.
+            errors.PyMongoError: If the index cannot be created or a batch fails
+                as a whole.
+        """
+
+        if not documents or not all(isinstance(doc, BaseModel) for doc in documents):
+            raise ValueError("Documents must be a list of Pydantic models.")
+
+        self.ensure_unique_index(key)
+
+        all_stats = []
+        for batch, start in enumerate(range(0, len(documents), batch_size)):
+            operations = []
+            missing_key = 0
+            for doc in documents[start : start + batch_size]:
+                dict_doc = doc.model_dump()
+                dict_doc.pop("_id", None)
+
+                doc_key = utils.get_nested(dict_doc, key)
+                if doc_key is None:
+                    missing_key += 1
+                    continue
+
+                operations.append(UpdateOne({key: doc_key}, {"$set": dict_doc}, upsert=True))
+
+            try:
+                stats = self.__execute_bulk(batch, operations)
+            except errors.PyMongoError as e:
+                logger.error(f"Error upserting batch {batch}: {e}")
+                raise
+
+            if missing_key:
+                stats.failed += missing_key
+                stats.errors.append(f"{missing_key} documents have no '{key}'")
+
+            all_stats.append(stats)
+
+        totals = {
+            name: sum(getattr(stats, name) for stats in all_stats)
+            for name in ("inserted", "updated", "unchanged", "failed")
+        }
+        logger.debug(f"Upserted {len(documents)} documents in {len(all_stats)} batches: {totals}")
+
+        return all_stats
+
+    def __execute_bulk(self, batch: int, operations: list) -> BulkWriteStats:
+        """Run one unordered bulk write, counting per-document failures instead of raising."""
+
+        if not operations:
+            return BulkWriteStats(batch=batch)
+
+        try:
+            result = self.collection.bulk_write(operations, ordered=False)
+            details = result.bulk_api_result
+        except errors.BulkWriteError as e:
+            details = e.details
+
+        write_errors = details.get("writeErrors", [])
+        if write_errors:
+            logger.warning(f"Batch {batch}: {len(write_errors)} documents failed to write.")
+
+        matched = details.get("nMatched", 0)
+        modified = details.get("nModified", 0)
+        return BulkWriteStats(
+            batch=batch,
+            inserted=details.get("nUpserted", 0),
+            updated=modified,
+            unchanged=matched - modified,
+            failed=len(write_errors),
+            errors=[error.get("errmsg", "") for error in write_errors[:5]],
+        )
+
+    def sync_documents(
+        self,
+        documents: list[T],
+        key: str = "metadata.url",
+        fingerprint_fields: tuple[str, ...] = FINGERPRINT_FIELDS,
+        crawl_report: Optional[CrawlReport] = None,
+        url_field: str = "metadata.url",
+    ) -> dict[str, int]:
+        """Incrementally synchronize the collection with a full crawl.
+
+        New and changed documents are upserted, and documents that were not part of
+        this crawl get a `deleted_at` tombstone instead of being removed. The collection
+        is never emptied, so readers always see a complete snapshot.
+
+        Args:
+            documents: List of Pydantic model instances from the latest crawl.
+            key: Dotted path of the field identifying a document.
+            fingerprint_fields: Dotted paths of the fields whose changes matter.
+            crawl_report: What the crawl could not reach, see `unseen_filter`.
+            url_field: Dotted path of the product URL the report refers to.
+
+        Returns:
+            Counts of inserted, updated, unchanged and tombstoned documents.
+
+        Raises:
+            ValueError: If documents is empty or contains non-Pydantic model items.
+            errors.PyMongoError: If a write operation fails.
+        """
+
+        seen_at = datetime.now(timezone.utc)
+        stats = self.upsert_documents(
+            documents, seen_at, key=key, fingerprint_fields=fingerprint_fields
+        )
+        stats["tombstoned"] = self.tombstone_unseen(seen_at, crawl_report, url_field)
+
+        logger.debug(f"Synchronized {len(documents)} documents with MongoDB: {stats}")
+        return stats
+
+    def replace_documents(
+        self,
+        documents: list[T],
+        key: str = "metadata.url",
+        fingerprint_fields: tuple[str, ...] = FINGERPRINT_FIELDS,
+        crawl_report: Optional[CrawlReport] = None,
+        url_field: str = "metadata.url",
+    ) -> dict[str, int]:
+        """Replace the contents of the collection with a full crawl, without emptying it.
+
+        Like `sync_documents`, but documents that were not part of this crawl are
+        deleted instead of tombstoned. Readers see the previous contents until the new
+        documents are written, rather than an empty collection.
+
+        Args:
+            documents: List of Pydantic model instances from the latest crawl.
+            key: Dotted path of the field identifying a document.
+            fingerprint_fields: Dotted paths of the fields whose changes matter.
+            crawl_report: What the crawl could not reach, see `unseen_filter`.
+            url_field: Dotted path of the product URL the report refers to.
+
+        Returns:
+            Counts of inserted, updated, unchanged and deleted documents.
+
+        Raises:
+            ValueError: If documents is empty or contains non-Pydantic model items.
+            errors.PyMongoError: If a write operation fails.
+        """
+
+        seen_at = datetime.now(timezone.utc)
+        stats = self.upsert_documents(
+            documents, seen_at, key=key, fingerprint_fields=fingerprint_fields
+        )
+        stats["deleted"] = self.delete_unseen(seen_at, crawl_report, url_field)
+
+        logger.debug(f"Replaced the collection with {len(documents)} documents: {stats}")
+        return stats
+
+    def upsert_documents(
+        self,
+        documents: list[T],
+        seen_at: datetime,
+        key: str = "metadata.url",
+        fingerprint_fields: tuple[str, ...] = FINGERPRINT_FIELDS,
+    ) -> dict[str, int]:
+        """Upsert new and changed documents, tracking fingerprints and last-seen times.
+
+        Every stored document carries a `content_fingerprint` of `fingerprint_fields`
+        and a `last_seen_at` timestamp. New and changed documents are upserted on `key`,
+        while unchanged ones only have `last_seen_at` bumped.
+
+        Args:
+            documents: List of Pydantic model instances to upsert.
+            seen_at: Timestamp recorded as `last_seen_at`.
+            key: Dotted path of the field identifying a document.
+            fingerprint_fields: Dotted paths of the fields whose changes matter.
+
+        Returns:
+            Counts of inserted, updated and unchanged documents.
+
+        Raises:
+            ValueError: If documents is empty or contains non-Pydantic model items.
+            errors.PyMongoError: If a write operation fails.
+        """
+
+        if not documents or not all(isinstance(doc, BaseModel) for doc in documents):
+            raise ValueError("Documents must be a list of Pydantic models.")
+
+        stats = {"inserted": 0, "updated": 0, "unchanged": 0, "failed": 0}
+
+        try:
+            self.ensure_unique_index(key)
+
+            for start in range(0, len(documents), SYNC_CHUNK_SIZE):
+                chunk = [
+                    doc.model_dump() for doc in documents[start : start + SYNC_CHUNK_SIZE]
+                ]
+                keys = [utils.get_nested(doc, key) for doc in chunk]
+                stored = {
+                    utils.get_nested(row, key): row
+                    for row in self.collection.find(
+                        {key: {"$in": keys}},
+                        {key: 1, "content_fingerprint": 1, "deleted_at": 1},
+                    )
+                }
+
+                operations = []
+                unchanged_keys = []
+                for doc, doc_key in zip(chunk, keys):
+                    doc.pop("_id", None)
+                    fingerprint = utils.compute_fingerprint(
+                        {field: utils.get_nested(doc, field) for field in fingerprint_fields}
+                    )
+
+                    previous = stored.get(doc_key)
+                    if (
+                        previous is not None
+                        and previous.get("content_fingerprint") == fingerprint
+                        and previous.get("deleted_at") is None
+                    ):
+                        unchanged_keys.append(doc_key)
+                        continue
+
+                    operations.append(
+                        UpdateOne(
+                            {key: doc_key},
+                            {
+                                "$set": {
+                                    **doc,
+                                    "content_fingerprint": fingerprint,
+                                    "last_seen_at": seen_at,
+                                    "deleted_at": None,
+                                }
+                            },
+                            upsert=True,
+                        )
+                    )
+
+                if unchanged_keys:
+                    operations.append(
+                        UpdateMany(
+                            {key: {"$in": unchanged_keys}},
+                            {"$set": {"last_seen_at": seen_at}},
+                        )
+                    )
+
+                batch_stats = self.__execute_bulk(start // SYNC_CHUNK_SIZE, operations)
+                stats["inserted"] += batch_stats.inserted
+                stats["updated"] += (
+                    len(chunk) - len(unchanged_keys) - batch_stats.inserted - batch_stats.failed
+                )
+                stats["unchanged"] += len(unchanged_keys)
+                stats["failed"] += batch_stats.failed
+
+        except errors.PyMongoError as e:
+            logger.error(f"Error upserting documents: {e}")
+            raise
+
+        return stats
+
+    @staticmethod
+    def unseen_filter(
+        seen_at: datetime,
+        crawl_report: Optional[CrawlReport] = None,
+        url_field: str = "metadata.url",
+    ) -> Optional[dict]:
+        """Build the query matching the documents a crawl shows to have disappeared.
+
+        Those are the documents not seen since `seen_at`, except the ones whose product
+        page failed to scrape. If the crawl skipped listing pages, any unseen document
+        may just have been on one of them, so nothing matches.
+
+        Args:
+            seen_at: Start of the crawl that refreshed `last_seen_at`.
+            crawl_report: What the crawl could not reach. The crawl is taken to be
+                complete without one.
+            url_field: Dotted path of the product URL the report refers to.
+
+        Returns:
+            The MongoDB query filter, or None if no document can be considered gone.
+        """
+
+        query = {
+            "$or": [
+                {"last_seen_at": {"$lt": seen_at}},
+                {"last_seen_at": {"$exists": False}},
+            ],
+        }
+        if crawl_report is None:
+            return query
+
+        if not crawl_report.complete:
+            logger.warning(
+                f"The crawl skipped {len(crawl_report.skipped_pages)} listing pages, "
+                "keeping every document it did not see."
+            )
+            return None
+
+        if crawl_report.failed_urls:
+            query[url_field] = {"$nin": crawl_report.failed_urls}
+        return query
+
+    def tombstone_unseen(
+        self,
+        seen_at: datetime,
+        crawl_report: Optional[CrawlReport] = None,
+        url_field: str = "metadata.url",
+    ) -> int:
+        """Mark every live document not seen since `seen_at` as deleted.
+
+        Args:
+            seen_at: Start of the crawl that refreshed `last_seen_at`.
+            crawl_report: What the crawl could not reach, see `unseen_filter`.
+            url_field: Dotted path of the product URL the report refers to.
+
+        Returns:
+            Number of documents tombstoned.
+
+        Raises:
+            errors.PyMongoError: If the update operation fails.
+        """
+
+        query = self.unseen_filter(seen_at, crawl_report, url_field)
+        if query is None:
+            return 0
+
+        try:
+            result = self.collection.update_many(
+                {"deleted_at": None, **query},
+                {"$set": {"deleted_at": datetime.now(timezone.utc)}},
+            )
+        except errors.PyMongoError as e:
+            logger.error(f"Error tombstoning documents: {e}")
+            raise
+
+        return result.modified_count
+
+    def delete_unseen(
+        self,
+        seen_at: datetime,
+        crawl_report: Optional[CrawlReport] = None,
+        url_field: str = "metadata.url",
+    ) -> int:
+        """Delete every document not seen since `seen_at`.
+
+        Together with `upsert_documents`, this replaces the contents of the collection
+        without ever emptying it, unlike `clear_collection` followed by an ingestion.
+
+        Args:
+            seen_at: Start of the crawl that refreshed `last_seen_at`.
+            crawl_report: What the crawl could not reach, see `unseen_filter`.
+            url_field: Dotted path of the product URL the report refers to.
+
+        Returns:
+            Number of documents deleted.
+
+        Raises:
+            errors.PyMongoError: If the delete operation fails.
+        """
+
+        query = self.unseen_filter(seen_at, crawl_report, url_field)
+        if query is None:
+            return 0
+
+        try:
+            result = self.collection.delete_many(query)
+        except errors.PyMongoError as e:
+            logger.error(f"Error deleting unseen documents: {e}")
+            raise
+
+        return result.deleted_count
+
+    def fetch_documents(
+        self, limit: int, query: dict, include_deleted: bool = False
+    ) -> list[T]:
         """Retrieve documents from the MongoDB collection based on a query.
 
         Args:
             limit: Maximum number of documents to retrieve.
             query: MongoDB query filter to apply.
+            include_deleted: Whether to include documents tombstoned by an
+                incremental sync.
 
         Returns:
             List of Pydantic model instances matching the query criteria.
@@ -154,21 +714,204 @@ class MongoDBService(Generic[T]):
             Exception: If the query operation fails.
         """
         try:
-            documents = list(self.collection.find(query).limit(limit))
+            documents = []
+            for chunk in self.iter_documents(
+                query=query, include_deleted=include_deleted, limit=limit
+            ):
+                documents.extend(chunk)
             logger.debug(f"Fetched {len(documents)} documents with query: {query}")
-            return self.__parse_documents(documents)
+            return documents
         except Exception as e:
             logger.error(f"Error fetching documents: {e}")
             raise
 
-    def __parse_documents(self, documents: list[dict]) -> list[T]:
+    def iter_documents(
+        self,
+        query: Optional[dict] = None,
+        projection: Optional[dict] = None,
+        batch_size: int = READ_BATCH_SIZE,
+        include_deleted: bool = False,
+        limit: int = 0,
+        validate: bool = True,
+        sort: bool = True,
+    ) -> Iterator[list]:
+        """Stream the documents matching a query, one chunk at a time, in `_id` order.
+
+        The cursor fetches `batch_size` documents per round trip and every batch is
+        validated and handed out before the next one is requested, so scanning the
+        whole collection takes constant memory.
+
+        Args:
+            query: MongoDB query filter to apply. All documents by default.
+            projection: Fields to return. When validating, it must keep every field the
+                model requires.
+            batch_size: Number of documents per cursor batch and per yielded chunk.
+            include_deleted: Whether to include documents tombstoned by an
+                incremental sync.
+            limit: Maximum number of documents to return, 0 for no limit.
+            validate: If False, yield the raw documents instead of model instances.
+            sort: If False, documents come in no particular order, which leaves the
+                query planner free to pick a secondary index over the `_id` one.
+
+        Yields:
+            The validated models (or raw documents) of the next batch.
+        """
+        cursor = self.collection.find(
+            self.__live(query, include_deleted), projection
+        ).batch_size(batch_size)
+        if sort:
+            cursor = cursor.sort("_id", ASCENDING)
+        if limit:
+            cursor = cursor.limit(limit)
+
+        with cursor:
+            while chunk := list(islice(cursor, batch_size)):
+                yield self.__parse_documents(chunk) if validate else chunk
+
+    def partition_bounds(
+        self,
+        partitions: int,
+        query: Optional[dict] = None,
+        include_deleted: bool = False,
+    ) -> list[tuple[Optional[Any], Optional[Any]]]:
+        """Split the documents matching a query into `_id` ranges of similar size.
+
+        Boundaries are found by skipping along the `_id` index, so no document is
+        fetched beyond one `_id` per boundary.
+
+        Args:
+            partitions: Number of ranges wanted. Fewer are returned for small results.
+            query: MongoDB query filter to apply. All documents by default.
+            include_deleted: Whether to include documents tombstoned by an
+                incremental sync.
+
+        Returns:
+            `(lower, upper)` pairs covering every document, where `lower` is inclusive,
+            `upper` exclusive and None means unbounded.
+        """
+        query = self.__live(query, include_deleted)
+        count = self.collection.count_documents(query)
+        partitions = max(1, min(partitions, count))
+
+        boundaries = []
+        for index in range(1, partitions):
+            boundary = next(
+                self.collection.find(query, {"_id": 1})
+                .sort("_id", ASCENDING)
+                .skip(index * count // partitions)
+                .limit(1),
+                None,
+            )
+            if boundary is not None and (not boundaries or boundary["_id"] != boundaries[-1]):
+                boundaries.append(boundary["_id"])
+
+        lowers = [None, *boundaries]
+        uppers = [*boundaries, None]
+        return list(zip(lowers, uppers))
+
+    def iter_documents_parallel(
+        self,
+        partitions: int = 4,
+        max_workers: Optional[int] = None,
+        query: Optional[dict] = None,
+        projection: Optional[dict] = None,
+        batch_size: int = READ_BATCH_SIZE,
+        include_deleted: bool = False,
+        validate: bool = True,
+    ) -> Iterator[list]:
+        """Stream the documents matching a query by reading `_id` ranges in parallel.
+
+        The matching documents are split with `partition_bounds` and each range is read
+        with `iter_documents` on a thread pool. Chunks are handed over through a
+        bounded queue, so memory stays constant however fast the partitions are read.
+        Chunks from different partitions are interleaved, so there is no global order.
+
+        Args:
+            partitions: Number of `_id` ranges to read.
+            max_workers: Number of ranges read at once. Defaults to `partitions`.
+            query: MongoDB query filter to apply. All documents by default.
+            projection: Fields to return, see `iter_documents`.
+            batch_size: Number of documents per cursor batch and per yielded chunk.
+            include_deleted: Whether to include documents tombstoned by an
+                incremental sync.
+            validate: If False, yield the raw documents instead of model instances.
+
+        Yields:
+            The validated models (or raw documents) of the next chunk read.
+        """
+        bounds = self.partition_bounds(partitions, query, include_deleted)
+        workers = max(1, min(max_workers or len(bounds), len(bounds)))
+        chunks: queue.Queue = queue.Queue(maxsize=2 * workers)
+        stop = threading.Event()
+
+        def read(lower: Optional[Any], upper: Optional[Any]) -> None:
+            id_range = {}
+            if lower is not None:
+                id_range["$gte"] = lower
+            if upper is not None:
+                id_range["$lt"] = upper
+            partition_query = {"$and": [query or {}, {"_id": id_range}]} if id_range else query
+
+            try:
+                for chunk in self.iter_documents(
+                    partition_query,
+                    projection,
+                    batch_size=batch_size,
+                    include_deleted=include_deleted,
+                    validate=validate,
+                ):
+                    while not stop.is_set():
+                        try:
+                            chunks.put(chunk, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop.is_set():
+                        return
+            except Exception as e:
+                chunks.put(e)
+            finally:
+                chunks.put(_PARTITION_DONE)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for lower, upper in bounds:
+                executor.submit(read, lower, upper)
+
+            try:
+                remaining = len(bounds)
+                while remaining:
+                    item = chunks.get()
+                    if item is _PARTITION_DONE:
+                        remaining -= 1
+                    elif isinstance(item, Exception):
+                        raise item
+                    else:
+                        yield item
+            finally:
+                stop.set()
+                # Unblock readers waiting on a full queue so the pool can shut down.
+                while remaining:
+                    try:
+                        if chunks.get(timeout=0.1) is _PARTITION_DONE:
+                            remaining -= 1
+                    except queue.Empty:
+                        continue
+
+    @staticmethod
+    def __live(query: Optional[dict], include_deleted: bool) -> dict:
+        query = query or {}
+        if include_deleted:
+            return query
+        return {**query, "deleted_at": None}
+
+    def __parse_documents(self, documents: Iterable[dict]) -> list[T]:
         """Convert MongoDB documents to Pydantic model instances.
 
         Converts MongoDB ObjectId fields to strings and transforms the document structure
         to match the Pydantic model schema.
 
         Args:
-            documents: List of MongoDB documents to parse.
+            documents: MongoDB documents to parse.
 
         Returns:
             List of validated Pydantic model instances.
@@ -179,8 +922,10 @@ class MongoDBService(Generic[T]):
                 if isinstance(value, ObjectId):
                     doc[key] = str(value)
 
+            # Documents carry their own content-addressed ID, so MongoDB's `_id` is
+            # only a fallback for models stored without one.
             _id = doc.pop("_id", None)
-            doc["id"] = _id
+            doc.setdefault("id", _id)
 
             parsed_doc = self.model.model_validate(doc)
             parsed_documents.append(parsed_doc)
@@ -204,11 +949,10 @@ class MongoDBService(Generic[T]):
             raise
 
     def close(self) -> None:
-        """Close the MongoDB connection.
+        """Release the borrowed collection.
 
-        This method should be called when the service is no longer needed
-        to properly release resources, unless using the context manager.
+        The pooled client stays open for other services and is closed by
+        `MongoClientRegistry` when the process exits.
         """
 
-        self.client.close()
-        logger.debug("Closed MongoDB connection.")
+        logger.debug(f"Released MongoDB collection {self.collection_name}.")
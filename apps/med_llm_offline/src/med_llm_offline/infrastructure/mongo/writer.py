@@ -0,0 +1,189 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Generic, Optional
+
+from loguru import logger
+
+from src.med_llm_offline.domain.crawl_report import CrawlReport
+from src.med_llm_offline.metrics import MetricsRegistry
+
+from .service import MongoDBService, T
+
+_STOP = object()
+
+
+class MongoBatchWriter(Generic[T]):
+    """Asynchronous write-behind batch writer for a MongoDB collection.
+
+    Producers hand documents to `put`, which only waits while the bounded buffer is
+    full. A background task groups them into batches of `batch_size`, or whatever
+    arrived within `flush_interval` seconds, and writes each batch on a worker thread.
+    When MongoDB falls behind the buffer fills up and `put` blocks, so producers slow
+    down instead of piling documents up in memory.
+
+    Args:
+        service: The service used to write batches.
+        batch_size: Maximum number of documents per write.
+        flush_interval: Maximum number of seconds a document waits before being written.
+        max_pending_batches: How many batches may be buffered before `put` blocks.
+        incremental: If True, changed documents are upserted and, once every document
+            has been written, documents that were not seen are tombstoned. Otherwise
+            every document is upserted.
+        replace: If True, changed documents are upserted and, once every document has
+            been written, documents that were not seen are deleted, so the collection
+            ends up holding exactly the written documents without ever being empty.
+            Ignored when `incremental` is set.
+        key: Dotted path of the field that identifies a document.
+        metrics: Registry that records write latencies and the buffer depth, if any.
+
+    Attributes:
+        crawl_report: What the crawl could not reach, set by the crawler before the
+            writer exits. Documents it may still hold are neither tombstoned nor deleted.
+    """
+
+    def __init__(
+        self,
+        service: MongoDBService[T],
+        batch_size: int = 500,
+        flush_interval: float = 5.0,
+        max_pending_batches: int = 2,
+        incremental: bool = False,
+        replace: bool = False,
+        key: str = "metadata.url",
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.service = service
+        self.key = key
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.incremental = incremental
+        self.replace = replace and not incremental
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+
+        self.stats = {
+            "written": 0,
+            "batches": 0,
+            "inserted": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "failed": 0,
+        }
+        if incremental:
+            self.stats["tombstoned"] = 0
+        elif replace:
+            self.stats["deleted"] = 0
+
+        self._queue: asyncio.Queue = asyncio.Queue(
+            maxsize=self.batch_size * max(1, max_pending_batches)
+        )
+        self._task: Optional[asyncio.Task] = None
+        self._seen_at = datetime.now(timezone.utc)
+        self.crawl_report: Optional[CrawlReport] = None
+
+    async def __aenter__(self) -> "MongoBatchWriter[T]":
+        self._seen_at = datetime.now(timezone.utc)
+        self._task = asyncio.create_task(self.__run())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        # A failed writer no longer drains the buffer, so there may be no room for
+        # the stop marker; awaiting the task raises its exception instead.
+        if not self._task.done():
+            await self.__enqueue(_STOP)
+        await self._task
+
+        # Only a complete crawl tells us which documents disappeared.
+        if self.incremental and exc_type is None:
+            self.stats["tombstoned"] = await asyncio.to_thread(
+                self.service.tombstone_unseen, self._seen_at, self.crawl_report
+            )
+        elif self.replace and exc_type is None:
+            self.stats["deleted"] = await asyncio.to_thread(
+                self.service.delete_unseen, self._seen_at, self.crawl_report
+            )
+
+        logger.info(
+            f"Wrote {self.stats['written']} documents in {self.stats['batches']} batches."
+        )
+
+    async def put(self, document: T) -> None:
+        """Queue a document for writing, waiting while the buffer is full."""
+        await self.__enqueue(document)
+        self.metrics.gauge("write_queue_depth", self._queue.qsize())
+
+    async def __enqueue(self, item) -> None:
+        """Add an item to the buffer, raising the writer's exception if it fails.
+
+        While the buffer is full, waiting for room is raced against the writer task,
+        so producers are woken up by a failed write instead of blocking forever.
+        """
+        if self._task is None:
+            await self._queue.put(item)
+            return
+
+        if self._task.done():
+            self.__raise_stopped()
+
+        if not self._queue.full():
+            self._queue.put_nowait(item)
+            return
+
+        put = asyncio.ensure_future(self._queue.put(item))
+        try:
+            await asyncio.wait({put, self._task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if not put.done():
+                put.cancel()
+
+        if not put.done() or put.cancelled():
+            self.__raise_stopped()
+
+    def __raise_stopped(self) -> None:
+        """Raise the writer task's exception, or an error if it stopped without one."""
+        self._task.result()
+        raise RuntimeError("MongoBatchWriter stopped before the document was written")
+
+    async def __run(self) -> None:
+        stopped = False
+        while not stopped:
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+
+                try:
+                    document = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+                if document is _STOP:
+                    stopped = True
+                    break
+                batch.append(document)
+
+            if batch:
+                await asyncio.to_thread(self.__write, batch)
+
+    def __write(self, batch: list[T]) -> None:
+        with self.metrics.time("mongo_write"):
+            if self.incremental or self.replace:
+                stats = self.service.upsert_documents(batch, self._seen_at, key=self.key)
+            else:
+                [batch_stats] = self.service.bulk_upsert(
+                    batch, key=self.key, batch_size=len(batch)
+                )
+                stats = batch_stats.model_dump(
+                    include={"inserted", "updated", "unchanged", "failed"}
+                )
+
+        self.metrics.increment("mongo_documents_failed", stats["failed"])
+
+        for name, count in stats.items():
+            self.stats[name] += count
+
+        self.stats["written"] += len(batch)
+        self.stats["batches"] += 1
@@ -0,0 +1,173 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from loguru import logger
+
+from src.med_llm_offline.config import settings
+
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+
+class Histogram:
+    """A fixed-bucket latency histogram, in seconds, with Prometheus semantics."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        else:
+            self.counts[-1] += 1
+
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating linearly inside its bucket."""
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        cumulative = 0
+        lower = 0.0
+        for index, bucket_count in enumerate(self.counts):
+            upper = self.buckets[index] if index < len(self.buckets) else self.buckets[-1]
+            if cumulative + bucket_count >= rank and bucket_count:
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+            lower = upper
+
+        return self.buckets[-1]
+
+    def to_dict(self) -> dict:
+        cumulative, buckets = 0, {}
+        for bound, bucket_count in zip((*self.buckets, float("inf")), self.counts):
+            cumulative += bucket_count
+            buckets[str(bound)] = cumulative
+
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": round(self.quantile(0.5), 6),
+            "p95": round(self.quantile(0.95), 6),
+            "p99": round(self.quantile(0.99), 6),
+            "buckets": buckets,
+        }
+
+
+class MetricsRegistry:
+    """
+    Thread-safe per-run metrics: stage latency histograms, counters and queue depth gauges.
+
+    Stages are timed with `time(stage)`, counters are bumped with `increment`, and
+    queue depths are sampled with `gauge`, which also keeps the maximum seen. The
+    registry can be attached to ZenML step metadata with `to_metadata` and exported for
+    node_exporter's textfile collector with `write_prometheus_textfile`.
+    """
+
+    def __init__(self) -> None:
+        self.histograms: dict[str, Histogram] = {}
+        self.counters: dict[str, int] = {}
+        self.gauges: dict[str, dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """Time a block of code as one observation of `stage`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Record a latency observation for `stage`."""
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """Increase a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def gauge(self, name: str, value: float) -> None:
+        """Set a gauge, keeping track of the largest value it has had."""
+        with self._lock:
+            gauge = self.gauges.setdefault(name, {"current": value, "max": value})
+            gauge["current"] = value
+            gauge["max"] = max(gauge["max"], value)
+
+    def to_metadata(self) -> dict:
+        """Snapshot the metrics as a JSON-serializable dict for ZenML step metadata."""
+        with self._lock:
+            return {
+                "latency_seconds": {
+                    stage: histogram.to_dict() for stage, histogram in self.histograms.items()
+                },
+                "counters": dict(self.counters),
+                "gauges": {name: dict(values) for name, values in self.gauges.items()},
+            }
+
+    def write_prometheus_textfile(self, path: Path, prefix: str = "med_llm") -> None:
+        """Write the metrics in the Prometheus text format, atomically replacing `path`."""
+        lines = []
+        with self._lock:
+            if self.histograms:
+                name = f"{prefix}_stage_duration_seconds"
+                lines += [f"# HELP {name} Time spent per pipeline stage.", f"# TYPE {name} histogram"]
+                for stage, histogram in self.histograms.items():
+                    cumulative = 0
+                    for bound, bucket_count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+                        cumulative += bucket_count
+                        lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.sum}')
+                    lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+
+            for counter, value in self.counters.items():
+                name = f"{prefix}_{counter}_total"
+                lines += [f"# TYPE {name} counter", f"{name} {value}"]
+
+            for gauge, values in self.gauges.items():
+                for kind in ("current", "max"):
+                    name = f"{prefix}_{gauge}" if kind == "current" else f"{prefix}_{gauge}_max"
+                    lines += [f"# TYPE {name} gauge", f"{name} {values[kind]}"]
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+        tmp_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+def export_prometheus_textfile(metrics: MetricsRegistry, job: str) -> Optional[Path]:
+    """
+    Write `metrics` to `<PROMETHEUS_TEXTFILE_DIR>/med_llm_<job>.prom` if that setting is set.
+
+    Returns:
+        The path written to, or None when no textfile directory is configured.
+    """
+    if not settings.PROMETHEUS_TEXTFILE_DIR:
+        return None
+
+    path = Path(settings.PROMETHEUS_TEXTFILE_DIR) / f"med_llm_{job}.prom"
+    metrics.write_prometheus_textfile(path)
+    logger.info(f"Wrote Prometheus metrics to {path}")
+
+    return path
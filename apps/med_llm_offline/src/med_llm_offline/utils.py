@@ -1,5 +1,12 @@
+import hashlib
+import hmac
+import json
+import os
 import random
 import string
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import tiktoken
 
@@ -41,6 +48,103 @@ def generate_random_hex(length: int) -> str:
     return "".join(random.choice(hex_chars) for _ in range(length))
 
 
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so that every spelling of the same page maps to one string.
+
+    The scheme and host are lowercased, the fragment and a trailing slash are dropped,
+    and query parameters are sorted.
+
+    Args:
+        url: The URL to normalize.
+
+    Returns:
+        str: The canonical URL.
+    """
+
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+
+def document_id(url: str) -> str:
+    """Derive the stable ID of a document from its URL.
+
+    The same page gets the same ID on every crawl, so caches, deduplication and
+    idempotent writes can key on it.
+
+    Args:
+        url: URL of the document.
+
+    Returns:
+        str: 32-character hex digest of the canonical URL.
+    """
+
+    return hashlib.blake2b(canonicalize_url(url).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def keyed_hex(value: str, key: str, length: int) -> str:
+    """Map a value to a stable, keyed hex string with HMAC-SHA256.
+
+    Without the key, the output cannot be linked back to the value, while the same
+    value and key always give the same output.
+
+    Args:
+        value: The value to map.
+        key: The secret key.
+        length: Length of the output, at most 64.
+
+    Returns:
+        str: Hex string of the given length.
+    """
+
+    digest = hmac.new(key.encode("utf-8"), value.encode("utf-8"), hashlib.sha256)
+    return digest.hexdigest()[:length]
+
+
+def compute_fingerprint(data: dict) -> str:
+    """Compute a stable fingerprint of JSON-serializable content.
+
+    Args:
+        data: The content to fingerprint. Key order does not matter.
+
+    Returns:
+        str: Hex digest that changes whenever the content changes.
+    """
+
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def get_nested(data: dict, path: str):
+    """Read a value from nested dictionaries using a dotted path like "metadata.url"."""
+
+    for part in path.split("."):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(part)
+
+    return data
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model_id: str) -> tiktoken.Encoding:
+    """Return the tiktoken encoding of a model, loading it only once per model.
+
+    Args:
+        model_id: The model name to determine encoding.
+
+    Returns:
+        tiktoken.Encoding: The model's encoding, or cl100k_base for unknown models.
+    """
+
+    try:
+        return tiktoken.encoding_for_model(model_id)
+    except KeyError:
+        # Fallback to cl100k_base encoding (used by gpt-4, gpt-3.5-turbo, text-embedding-ada-002)
+        return tiktoken.get_encoding("cl100k_base")
+
+
 def clip_tokens(text: str, max_tokens: int, model_id: str) -> str:
     """Clip the text to a maximum number of tokens using the tiktoken tokenizer.
 
@@ -53,19 +157,76 @@ def clip_tokens(text: str, max_tokens: int, model_id: str) -> str:
         str: The clipped text that fits within the token limit.
     """
 
-    try:
-        encoding = tiktoken.encoding_for_model(model_id)
-    except KeyError:
-        # Fallback to cl100k_base encoding (used by gpt-4, gpt-3.5-turbo, text-embedding-ada-002)
-        encoding = tiktoken.get_encoding("cl100k_base")
+    encoding = get_encoding(model_id)
 
-    tokens = encoding.encode(text)
+    tokens = encoding.encode(text, disallowed_special=())
     if len(tokens) <= max_tokens:
         return text
 
     return encoding.decode(tokens[:max_tokens])
 
 
+def count_tokens_batch(
+    texts: list[str], model_id: str, num_threads: Optional[int] = None
+) -> list[int]:
+    """Count the tokens of many texts at once.
+
+    Args:
+        texts: The input texts.
+        model_id: The model name to determine encoding.
+        num_threads: Number of tokenizer threads. Defaults to the number of CPUs.
+
+    Returns:
+        list[int]: The number of tokens of each text.
+    """
+
+    encoding = get_encoding(model_id)
+    tokens = encoding.encode_batch(
+        texts, num_threads=num_threads or os.cpu_count() or 1, disallowed_special=()
+    )
+
+    return [len(text_tokens) for text_tokens in tokens]
+
+
+def clip_tokens_batch(
+    texts: list[str],
+    max_tokens: int,
+    model_id: str,
+    num_threads: Optional[int] = None,
+) -> tuple[list[str], list[int]]:
+    """Clip many texts to a maximum number of tokens at once.
+
+    Texts are encoded with tiktoken's multi-threaded `encode_batch`, and only the
+    texts over the limit are decoded again, with `decode_batch`.
+
+    Args:
+        texts: The input texts to clip.
+        max_tokens: Maximum number of tokens to keep per text.
+        model_id: The model name to determine encoding.
+        num_threads: Number of tokenizer threads. Defaults to the number of CPUs.
+
+    Returns:
+        tuple[list[str], list[int]]: The clipped texts and the number of tokens of
+            each clipped text.
+    """
+
+    encoding = get_encoding(model_id)
+    num_threads = num_threads or os.cpu_count() or 1
+    tokens = encoding.encode_batch(texts, num_threads=num_threads, disallowed_special=())
+
+    clipped = list(texts)
+    counts = [min(len(text_tokens), max_tokens) for text_tokens in tokens]
+    over_limit = [i for i, text_tokens in enumerate(tokens) if len(text_tokens) > max_tokens]
+    if over_limit:
+        decoded = encoding.decode_batch(
+            [tokens[i][:max_tokens] for i in over_limit], num_threads=num_threads
+        )
+        for i, text in zip(over_limit, decoded):
+            clipped[i] = text
+
+    return clipped, counts
+
+
 def get_browser_config() -> dict:
     return BrowserConfig(
         browser_type="chromium",
@@ -1,3 +1,6 @@
+from .chunk_documents import chunk_documents
 from .crawl import crawl
+from .crawl_to_mongodb import crawl_to_mongodb
+from .deduplicate import deduplicate
 
-__all__ = ["crawl"]
+__all__ = ["chunk_documents", "crawl", "crawl_to_mongodb", "deduplicate"]
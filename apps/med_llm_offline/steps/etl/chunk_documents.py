@@ -0,0 +1,64 @@
+from loguru import logger
+from typing_extensions import Annotated
+from zenml import step, get_step_context
+
+from src.med_llm_offline.application.chunking import SectionChunker
+from src.med_llm_offline.domain import Chunk, Document
+from src.med_llm_offline.metrics import MetricsRegistry, export_prometheus_textfile
+
+@step
+def chunk_documents(
+    documents: Annotated[list[Document], "deduplicated_documents"],
+    chunk_size: int = 512,
+    chunk_overlap: int = 64,
+    model_id: str = "gpt-4",
+    max_workers: int = 4,
+) -> Annotated[list[Chunk], "chunks"]:
+    """ZenML step that splits every properties section into token-bounded chunks.
+
+    Args:
+        documents: The documents to chunk.
+        chunk_size: Maximum number of tokens per chunk.
+        chunk_overlap: Number of tokens shared by consecutive chunks of a section.
+        model_id: The model name to determine encoding.
+        max_workers: Number of worker processes.
+
+    Returns:
+        list[Chunk]: The chunks, each carrying its document and section.
+    """
+
+    chunker = SectionChunker(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        model_id=model_id,
+        max_workers=max_workers,
+    )
+    metrics = MetricsRegistry()
+    chunks = []
+    with metrics.time("chunking"):
+        for batch in chunker.chunk_documents(documents):
+            chunks.extend(batch)
+
+    stats = chunker.stats
+    logger.info(
+        f"Split {stats.sections} sections of {stats.documents} documents into "
+        f"{stats.chunks} chunks ({stats.tokens_per_second:.0f} tokens/sec)."
+    )
+    metrics.increment("chunks_created", stats.chunks)
+    metrics.increment("tokens_chunked", stats.tokens)
+    export_prometheus_textfile(metrics, job="chunk_documents")
+
+    step_context = get_step_context()
+    step_context.add_output_metadata(
+        output_name="chunks",
+        metadata={
+            "count": len(chunks),
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "model_id": model_id,
+            **stats.to_metadata(),
+            "metrics": metrics.to_metadata(),
+        },
+    )
+
+    return chunks
@@ -1,23 +1,43 @@
+from pathlib import Path
+from typing import Optional
+
 from loguru import logger
 from typing_extensions import Annotated
 from zenml import step, get_step_context
 
+from materializers import DocumentListMaterializer
 from src.med_llm_offline.application.crawlers import Crawl4AIMedicineCrawler
-from src.med_llm_offline.domain import Document
+from src.med_llm_offline.domain import CrawlReport, Document
+from src.med_llm_offline.metrics import export_prometheus_textfile
 
-@step(enable_cache=False, name="crawl")
+@step(
+    enable_cache=False,
+    name="crawl",
+    output_materializers={"crawled_documents": DocumentListMaterializer},
+)
 def crawl(
     max_workers: int,
     base_url: str,
-) -> Annotated[list[Document], "crawled_documents"]:
+    cache_dir: Optional[str] = None,
+    checkpoint_dir: Optional[str] = None,
+    resume: bool = False,
+) -> tuple[
+    Annotated[list[Document], "crawled_documents"],
+    Annotated[CrawlReport, "crawl_report"],
+]:
     crawler = Crawl4AIMedicineCrawler(
         max_concurrent_requests=max_workers, 
-        base_url=base_url
+        base_url=base_url,
+        cache_dir=Path(cache_dir) if cache_dir else None,
+        checkpoint_dir=Path(checkpoint_dir) if checkpoint_dir else None,
+        resume=resume,
     )
     documents = crawler()
     documents = list(documents)
+    crawl_report = crawler.crawl_report
 
     logger.info(f"Crawled {len(documents)} documents.")
+    export_prometheus_textfile(crawler.metrics, job="crawl")
 
     step_context = get_step_context()
     step_context.add_output_metadata(
@@ -25,8 +45,22 @@ def crawl(
         metadata={
             "count": len(documents),
             "base_url": base_url,
-            "max_workers": max_workers
+            "max_workers": max_workers,
+            "resumed": resume,
+            "http_pages": crawler.fetch_stats["http"],
+            "browser_fallbacks": crawler.fetch_stats["browser_fallback"],
+            "cache_fresh": crawler.fetch_stats["cache_fresh"],
+            "cache_not_modified": crawler.fetch_stats["not_modified"],
+            "metrics": crawler.metrics.to_metadata(),
+        },
+    )
+    step_context.add_output_metadata(
+        output_name="crawl_report",
+        metadata={
+            "complete": crawl_report.complete,
+            "failed_urls": len(crawl_report.failed_urls),
+            "skipped_pages": crawl_report.skipped_pages,
         },
     )
 
-    return documents
+    return documents, crawl_report
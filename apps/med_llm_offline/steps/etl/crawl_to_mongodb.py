@@ -0,0 +1,95 @@
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+from typing_extensions import Annotated
+from zenml import step, get_step_context
+
+from src.med_llm_offline.application.crawlers import Crawl4AIMedicineCrawler
+from src.med_llm_offline.domain import Document
+from src.med_llm_offline.infrastructure.mongo import MongoBatchWriter, MongoDBService
+from src.med_llm_offline.metrics import MetricsRegistry, export_prometheus_textfile
+
+@step(enable_cache=False, name="crawl_to_mongodb")
+def crawl_to_mongodb(
+    max_workers: int,
+    base_url: str,
+    collection_name: str,
+    cache_dir: Optional[str] = None,
+    incremental: bool = False,
+    batch_size: int = 500,
+    flush_interval: float = 5.0,
+    checkpoint_dir: Optional[str] = None,
+    resume: bool = False,
+) -> Annotated[int, "output"]:
+    """ZenML step that streams crawled documents straight into MongoDB.
+
+    Documents are written in batches while the crawl is running instead of being
+    collected into one artifact, so memory stays flat regardless of catalogue size and
+    a crash only loses the documents still buffered.
+
+    Args:
+        max_workers: Maximum number of concurrent product scrapes.
+        base_url: Base URL of the site to crawl.
+        collection_name: Name of the MongoDB collection to write into.
+        cache_dir: Directory of the response cache, if any.
+        incremental: If True, upserts documents and tombstones the ones that were not
+            crawled. Otherwise the ones that were not crawled are deleted once the crawl
+            completes, so readers never see an empty or partial collection.
+        batch_size: Maximum number of documents per write.
+        flush_interval: Maximum number of seconds a document waits before being written.
+        checkpoint_dir: Directory of the crawl journal, if any.
+        resume: If True, continues the crawl recorded in `checkpoint_dir` and keeps the
+            documents already in the collection.
+
+    Returns:
+        int: Number of documents in the collection after ingestion.
+    """
+
+    metrics = MetricsRegistry()
+    with MongoDBService(model=Document, collection_name=collection_name) as service:
+        service.ensure_specification_indexes()
+
+        writer = MongoBatchWriter(
+            service,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            incremental=incremental,
+            replace=not incremental,
+            metrics=metrics,
+        )
+        crawler = Crawl4AIMedicineCrawler(
+            max_concurrent_requests=max_workers,
+            base_url=base_url,
+            cache_dir=Path(cache_dir) if cache_dir else None,
+            document_writer=writer,
+            metrics=metrics,
+            checkpoint_dir=Path(checkpoint_dir) if checkpoint_dir else None,
+            resume=resume,
+        )
+        crawler()
+
+        count = service.get_collection_count()
+        logger.info(
+            f"Streamed {crawler.documents_scraped} documents into MongoDB collection '{collection_name}'"
+        )
+
+    export_prometheus_textfile(metrics, job="crawl_to_mongodb")
+
+    step_context = get_step_context()
+    step_context.add_output_metadata(
+        output_name="output",
+        metadata={
+            "count": count,
+            "crawled": crawler.documents_scraped,
+            "base_url": base_url,
+            "max_workers": max_workers,
+            "incremental": incremental,
+            "resumed": resume,
+            "batch_size": batch_size,
+            **writer.stats,
+            "metrics": metrics.to_metadata(),
+        },
+    )
+
+    return count
@@ -0,0 +1,55 @@
+from loguru import logger
+from typing_extensions import Annotated
+from zenml import step, get_step_context
+
+from materializers import DocumentListMaterializer
+from src.med_llm_offline.application.deduplication import DocumentDeduplicator
+from src.med_llm_offline.domain import Document
+
+@step(
+    name="deduplicate",
+    output_materializers={"deduplicated_documents": DocumentListMaterializer},
+)
+def deduplicate(
+    documents: Annotated[list[Document], "crawled_documents"],
+    similarity_threshold: float = 0.8,
+    drop_near_duplicates: bool = False,
+) -> Annotated[list[Document], "deduplicated_documents"]:
+    """ZenML step that removes duplicate documents before ingestion.
+
+    Exact URL and content duplicates are always dropped. Near-duplicates are clustered
+    with MinHash/LSH over the properties text and only dropped if requested.
+
+    Args:
+        documents: The crawled documents.
+        similarity_threshold: Minimum estimated Jaccard similarity of near-duplicates.
+        drop_near_duplicates: If True, keeps only the first document of every cluster.
+
+    Returns:
+        list[Document]: The deduplicated documents.
+    """
+
+    deduplicator = DocumentDeduplicator(threshold=similarity_threshold)
+    result = deduplicator.deduplicate(
+        list(documents), drop_near_duplicates=drop_near_duplicates
+    )
+
+    logger.info(
+        f"Kept {len(result.documents)} of {len(documents)} documents after deduplication."
+    )
+
+    step_context = get_step_context()
+    step_context.add_output_metadata(
+        output_name="deduplicated_documents",
+        metadata={
+            "input_count": len(documents),
+            "count": len(result.documents),
+            "url_duplicates": result.url_duplicates,
+            "content_duplicates": result.content_duplicates,
+            "near_duplicates_dropped": result.near_duplicates_dropped,
+            "similarity_threshold": similarity_threshold,
+            **result.cluster_stats(),
+        },
+    )
+
+    return result.documents
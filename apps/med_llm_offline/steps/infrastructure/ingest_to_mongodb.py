@@ -1,20 +1,47 @@
+from typing import Optional
+
 from loguru import logger
 from pydantic import BaseModel
 from typing_extensions import Annotated
 from zenml.steps import get_step_context, step
 
-from src.med_llm_offline.infrastructure.mongo.service import MongoDBService
+from src.med_llm_offline.domain import CrawlReport, Document
+from src.med_llm_offline.infrastructure.mongo.service import (
+    FINGERPRINT_FIELDS,
+    MongoDBService,
+)
+from src.med_llm_offline.metrics import MetricsRegistry, export_prometheus_textfile
 
 @step
 def ingest_to_mongodb(
-    models: list[BaseModel], collection_name: str, clear_collection: bool = True
+    models: list[BaseModel],
+    collection_name: str,
+    clear_collection: bool = True,
+    incremental: bool = False,
+    upsert_key: str = "metadata.url",
+    fingerprint_fields: Optional[list[str]] = None,
+    crawl_report: Optional[CrawlReport] = None,
+    url_field: str = "metadata.url",
 ) -> Annotated[int, "output"]:
     """ZenML step to ingest documents into MongoDB.
 
     Args:
         models: List of Pydantic BaseModel instances to ingest into MongoDB.
         collection_name: Name of the MongoDB collection to ingest into.
-        clear_collection: If True, clears the collection before ingestion. Defaults to True.
+        clear_collection: If True, documents missing from `models` are deleted once they
+            are ingested, so the collection is replaced without ever being empty.
+            Defaults to True. Ignored when `incremental` is set.
+        incremental: If True, upserts new and changed documents and tombstones the ones
+            missing from `models` instead of reloading the collection. Defaults to False.
+        upsert_key: Dotted path of the field that uniquely identifies a document.
+            Defaults to "metadata.url".
+        fingerprint_fields: Dotted paths of the fields whose changes make an
+            incremental sync rewrite a document. Defaults to the content fields of
+            a Document.
+        crawl_report: What the crawl behind `models` could not reach. Documents it may
+            still hold are neither tombstoned nor deleted.
+        url_field: Dotted path of the product URL `crawl_report` refers to.
+            Defaults to "metadata.url".
 
     Returns:
         int: Number of documents in the collection after ingestion.
@@ -30,24 +57,62 @@ def ingest_to_mongodb(
     logger.info(
         f"Ingesting {len(models)} documents of type '{model_type.__name__}' into MongoDB collection '{collection_name}'"
     )
+    write_stats = {}
+    metrics = MetricsRegistry()
     with MongoDBService(model=model_type, collection_name=collection_name) as service:
-        if clear_collection:
-            logger.warning(
-                f"'clear_collection' is set to True. Clearing MongoDB collection '{collection_name}' before ingestion."
+        if incremental:
+            with metrics.time("mongo_write"):
+                write_stats = service.sync_documents(
+                    models,
+                    key=upsert_key,
+                    fingerprint_fields=tuple(fingerprint_fields or FINGERPRINT_FIELDS),
+                    crawl_report=crawl_report,
+                    url_field=url_field,
+                )
+            logger.info(
+                f"Incrementally synchronized MongoDB collection '{collection_name}': {write_stats}"
+            )
+        elif clear_collection:
+            with metrics.time("mongo_write"):
+                write_stats = service.replace_documents(
+                    models,
+                    key=upsert_key,
+                    fingerprint_fields=tuple(fingerprint_fields or FINGERPRINT_FIELDS),
+                    crawl_report=crawl_report,
+                    url_field=url_field,
+                )
+            logger.info(
+                f"Replaced the contents of MongoDB collection '{collection_name}': {write_stats}"
             )
-            service.clear_collection()
-        service.ingest_documents(models)
+        else:
+            with metrics.time("mongo_write"):
+                batch_stats = service.bulk_upsert(models, key=upsert_key)
+            write_stats = {
+                name: sum(getattr(stats, name) for stats in batch_stats)
+                for name in ("inserted", "updated", "unchanged", "failed")
+            }
+            write_stats["batches"] = len(batch_stats)
+            write_stats["failed_batches"] = sum(1 for stats in batch_stats if stats.failed)
+
+        if issubclass(model_type, Document):
+            service.ensure_specification_indexes()
 
         count = service.get_collection_count()
         logger.info(
             f"Successfully ingested {count} documents into MongoDB collection '{collection_name}'"
         )
 
+    metrics.increment("mongo_documents_written", len(models))
+    export_prometheus_textfile(metrics, job="ingest_to_mongodb")
+
     step_context = get_step_context()
     step_context.add_output_metadata(
         output_name="output",
         metadata={
             "count": count,
+            "incremental": incremental,
+            **write_stats,
+            "metrics": metrics.to_metadata(),
         },
     )
 
@@ -1,30 +1,46 @@
-import shutil
 from pathlib import Path
 
 from typing_extensions import Annotated
 from zenml import get_step_context, step
 
 from src.med_llm_offline.domain import Document
+from src.med_llm_offline.infrastructure.export import CorpusExporter
 
 
 @step
 def save_documents_to_disk(
     documents: Annotated[list[Document], "documents"],
     output_dir: Path,
+    format: str = "jsonl",
+    shard_size: int = 10_000,
+    obfuscate: bool = True,
 ) -> Annotated[str, "output"]:
-    if output_dir.exists():
-        shutil.rmtree(output_dir)
-    output_dir.mkdir(parents=True)
+    """ZenML step that exports documents as a sharded, zstd-compressed corpus.
 
-    for document in documents:
-        document.write(output_dir=output_dir, obfuscate=True, also_save_as_txt=False)
+    Args:
+        documents: The documents to export.
+        output_dir: Directory of the export. A previous export there is replaced.
+        format: "jsonl" or "parquet".
+        shard_size: Maximum number of documents per shard.
+        obfuscate: Whether to obfuscate the metadata of the exported documents. Requires
+            the OBFUSCATION_KEY setting.
+
+    Returns:
+        str: The export directory.
+    """
+    manifest = CorpusExporter(output_dir, format=format, shard_size=shard_size).export(
+        documents, obfuscate=obfuscate
+    )
 
     step_context = get_step_context()
     step_context.add_output_metadata(
         output_name="output",
         metadata={
-            "count": len(documents),
+            "count": manifest.documents,
             "output_dir": str(output_dir),
+            "format": manifest.format,
+            "shards": len(manifest.shards),
+            "bytes": sum(shard.bytes for shard in manifest.shards),
         },
     )
 
@@ -0,0 +1,159 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest import mock
+
+import httpx
+import pytest
+
+from src.med_llm_offline.application.crawlers import crawl4ai
+from src.med_llm_offline.application.crawlers.crawl4ai import Crawl4AIMedicineCrawler
+from src.med_llm_offline.application.crawlers.scheduler import RetryQueue
+from src.med_llm_offline.domain import Document
+from src.med_llm_offline.infrastructure.mongo import MongoBatchWriter, MongoDBService
+
+
+class FailingService:
+    def bulk_upsert(self, documents, **kwargs):
+        raise ConnectionError("MongoDB is unreachable")
+
+
+class StubFetcher:
+    def __init__(self, status):
+        self.status = status
+
+    async def fetch(self, url, headers=None):
+        return httpx.Response(self.status, content=b"<html><h2>Unknown</h2></html>")
+
+
+@asynccontextmanager
+async def stub_context(*args, **kwargs):
+    yield None
+
+
+def make_crawler(make_document, writer, pages=3, links_per_page=50, failing_pages=()):
+    crawler = Crawl4AIMedicineCrawler(
+        max_concurrent_requests=2,
+        base_url="https://shop.test",
+        use_http_first=False,
+        document_writer=writer,
+    )
+
+    async def fetch_listing_page(_, page_number):
+        if page_number in failing_pages:
+            return None
+        if page_number > pages:
+            return []
+        return [f"https://shop.test/p/{page_number}-{i}" for i in range(links_per_page)]
+
+    async def scrape_with_playwright(url):
+        return make_document(url)
+
+    crawler.fetch_listing_page = fetch_listing_page
+    crawler.scrape_with_playwright = scrape_with_playwright
+    return crawler
+
+
+async def finish_within(coroutine, timeout):
+    """Await a coroutine, failing if it is still running after `timeout` seconds.
+
+    Unlike `asyncio.wait_for`, the coroutine is not cancelled first, so a crawl that
+    only stops once cancelled still counts as hung.
+    """
+    task = asyncio.ensure_future(coroutine)
+    done, _ = await asyncio.wait([task], timeout=timeout)
+    if not done:
+        task.cancel()
+        pytest.fail(f"Still running after {timeout} seconds")
+    return task.result()
+
+
+@pytest.fixture
+def stub_browser():
+    with (
+        mock.patch.object(crawl4ai, "PlaywrightPagePool", stub_context),
+        mock.patch.object(crawl4ai, "AsyncWebCrawler", stub_context),
+        mock.patch.object(crawl4ai.utils, "get_browser_config", lambda: None),
+    ):
+        yield
+
+
+def test_writer_failure_aborts_the_crawl(stub_browser, make_document):
+    writer = MongoBatchWriter(
+        FailingService(), batch_size=2, flush_interval=0.01, max_pending_batches=1
+    )
+    crawler = make_crawler(make_document, writer)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(finish_within(crawler._Crawl4AIMedicineCrawler__crawl(), timeout=5))
+
+
+def test_crawl_collects_every_product(stub_browser, make_document):
+    crawler = make_crawler(make_document, writer=None, pages=3, links_per_page=5)
+
+    documents = asyncio.run(crawler._Crawl4AIMedicineCrawler__crawl())
+
+    assert len(documents) == 15
+    assert crawler.failed_urls == []
+
+
+def test_skipped_listing_page_keeps_unseen_documents(stub_browser, mongo_client, make_document):
+    service = MongoDBService(model=Document, collection_name="partial_crawl")
+    service.sync_documents([make_document("https://shop.test/p/4-0")])
+    writer = MongoBatchWriter(service, flush_interval=0.01, incremental=True)
+    # Page 4 is not among the pages probed to find the last one, so it is only
+    # fetched, and skipped, once the crawl knows there are 6 pages.
+    crawler = make_crawler(
+        make_document, writer, pages=6, links_per_page=2, failing_pages={4}
+    )
+
+    asyncio.run(crawler._Crawl4AIMedicineCrawler__crawl())
+
+    assert crawler.crawl_report.skipped_pages == [4]
+    assert not crawler.crawl_report.complete
+    assert writer.stats["tombstoned"] == 0
+    assert service.collection.count_documents({"deleted_at": None}) == 11
+
+
+def scrape_over_http(make_document, status):
+    """Scrape one product over HTTP, returning the crawler and the browser renders."""
+    crawler = make_crawler(make_document, writer=None)
+    crawler.http_fetcher = StubFetcher(status)
+    crawler.retry_queue = RetryQueue()
+    rendered = []
+
+    async def scrape_with_playwright(url):
+        rendered.append(url)
+        return make_document(url)
+
+    crawler.scrape_with_playwright = scrape_with_playwright
+    medicines = []
+    scrape_once = crawler._Crawl4AIMedicineCrawler__scrape_once
+    asyncio.run(scrape_once("https://shop.test/p/1", 0, medicines))
+    return crawler, rendered, medicines
+
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_throttled_or_failing_page_is_retried_without_the_browser(make_document, status):
+    crawler, rendered, medicines = scrape_over_http(make_document, status)
+
+    assert rendered == []
+    assert medicines == []
+    assert len(crawler.retry_queue) == 1
+    assert crawler.fetch_stats["browser_fallback"] == 0
+
+
+@pytest.mark.parametrize("status", [404, 410])
+def test_removed_page_is_neither_retried_nor_failed(make_document, status):
+    crawler, rendered, medicines = scrape_over_http(make_document, status)
+
+    assert rendered == []
+    assert len(crawler.retry_queue) == 0
+    assert crawler.failed_urls == []
+
+
+def test_page_missing_sections_falls_back_to_the_browser(make_document):
+    crawler, rendered, medicines = scrape_over_http(make_document, 200)
+
+    assert rendered == ["https://shop.test/p/1"]
+    assert len(medicines) == 1
+    assert crawler.fetch_stats["browser_fallback"] == 1
@@ -0,0 +1,48 @@
+from src.med_llm_offline.application.crawlers.extraction import (
+    PRODUCT_SECTIONS,
+    extract_product,
+)
+
+PAGE = """
+<html>
+  <head><script>var tracking = "Warnings";</script></head>
+  <body>
+    <h1> Eliquis 5mg Tablets </h1>
+    <h2>Specification</h2>
+    <div>Requires Prescription (YES/NO) <b>Yes</b></div>
+    <div>Generics Apixaban</div>
+    <!-- Not part of the section -->
+    <h2>Usage and Safety</h2>
+    <p>Take   with water.</p>
+    <style>p { color: red; }</style>
+    <h2>Customer Reviews</h2>
+    <p>Great.</p>
+    <h2>Warnings</h2>
+    <p>Bleeding risk.</p>
+  </body>
+</html>
+"""
+
+
+def test_extracts_the_name_and_sections():
+    name, properties = extract_product(PAGE)
+
+    assert name == "Eliquis 5mg Tablets"
+    assert properties["specification"] == (
+        "Requires Prescription (YES/NO) Yes\nGenerics Apixaban"
+    )
+    assert properties["usage_and_safety"] == "Take   with water."
+    assert properties["warnings"] == "Bleeding risk."
+
+
+def test_missing_sections_are_empty():
+    name, properties = extract_product(PAGE)
+
+    assert set(properties) == set(PRODUCT_SECTIONS)
+    assert properties["precautions"] == ""
+    assert properties["additional_information"] == ""
+
+
+def test_page_without_heading_is_unknown():
+    assert extract_product("<html><body><p>Not found</p></body></html>")[0] == "Unknown"
+    assert extract_product("")[0] == "Unknown"
@@ -0,0 +1,108 @@
+import asyncio
+
+from src.med_llm_offline.application.crawlers.scheduler import (
+    AIMDLimiter,
+    HostScheduler,
+    RetryQueue,
+)
+
+
+async def request(scheduler, url, status=200, retry_after=None):
+    async with scheduler.request(url) as outcome:
+        outcome.status = status
+        outcome.retry_after = retry_after
+
+
+def test_limiter_grows_additively_and_backs_off_once_per_cooldown():
+    limiter = AIMDLimiter(initial_limit=4, max_limit=8, cooldown=60)
+
+    # About one more slot per window of `limit` clean requests.
+    for _ in range(4):
+        limiter.increase()
+    grown = limiter.limit
+    assert 4.9 < grown < 5
+
+    assert limiter.decrease()
+    assert not limiter.decrease()
+    assert limiter.limit == grown / 2
+
+
+def test_limiter_caps_concurrency():
+    limiter = AIMDLimiter(initial_limit=2)
+    peak = 0
+
+    async def work():
+        nonlocal peak
+        await limiter.acquire()
+        peak = max(peak, limiter.in_flight)
+        await asyncio.sleep(0.01)
+        await limiter.release()
+
+    async def run():
+        await asyncio.gather(*(work() for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+
+
+def test_throttled_host_backs_off_and_others_do_not():
+    scheduler = HostScheduler(max_concurrency=8, initial_rate=100, max_rate=200)
+
+    async def run():
+        await request(scheduler, "https://slow.test/p/1", status=429, retry_after=0.01)
+        for number in range(5):
+            await request(scheduler, f"https://fast.test/p/{number}")
+
+    asyncio.run(run())
+    stats = scheduler.stats()
+
+    assert stats["slow.test"]["rate"] == 50
+    assert stats["slow.test"]["concurrency_limit"] == 4
+    assert stats["slow.test"]["throttled"] == 1
+    assert stats["fast.test"]["rate"] == 105
+    assert stats["fast.test"]["throttled"] == 0
+
+
+def test_failed_requests_count_as_errors():
+    scheduler = HostScheduler(max_concurrency=4)
+
+    async def run():
+        try:
+            async with scheduler.request("https://down.test/p/1"):
+                raise ConnectionError
+        except ConnectionError:
+            pass
+
+    asyncio.run(run())
+
+    assert scheduler.stats()["down.test"]["errors"] == 1
+
+
+def test_retry_queue_hands_out_items_when_due():
+    queue = RetryQueue(base_delay=0.01, max_delay=1)
+
+    async def run():
+        await queue.schedule("late", attempt=3)
+        await queue.schedule("early", attempt=0)
+        items = []
+        for _ in range(2):
+            item = await queue.get()
+            items.append(item)
+            await queue.task_done()
+        await queue.join()
+        await queue.close()
+        return items, await queue.get()
+
+    items, closed = asyncio.run(run())
+
+    assert items == [("early", 0), ("late", 3)]
+    assert closed is None
+
+
+def test_retry_backoff_is_jittered_and_capped():
+    queue = RetryQueue(base_delay=1, max_delay=4)
+
+    delays = [queue.backoff(attempt) for attempt in range(5) for _ in range(20)]
+
+    assert all(0.5 <= delay <= 4 for delay in delays)
+    assert all(2 <= queue.backoff(10) <= 4 for _ in range(20))
@@ -0,0 +1,72 @@
+from src.med_llm_offline.application.deduplication import DocumentDeduplicator
+
+LEAFLET = (
+    "Apixaban is an anticoagulant used to prevent strokes and blood clots in "
+    "patients with atrial fibrillation. Take one tablet twice a day with water, "
+    "with or without food, at the same times every day. Do not stop taking it "
+    "without talking to your doctor, as this raises the risk of a stroke."
+)
+
+
+def make(make_document, url, text, name="Product"):
+    document = make_document(url, name=name)
+    document.metadata.properties["usage_and_safety"] = text
+    return document
+
+
+def test_exact_duplicates_are_dropped(make_document):
+    first = make(make_document, "https://shop.test/p/1", LEAFLET)
+    documents = [
+        first,
+        make(make_document, "https://shop.test/p/1", "Another page"),
+        make(make_document, "https://shop.test/p/2", LEAFLET),
+        make(make_document, "https://shop.test/p/3", "Paracetamol relieves pain."),
+    ]
+
+    result = DocumentDeduplicator().deduplicate(documents)
+
+    assert [document.metadata.url for document in result.documents] == [
+        "https://shop.test/p/1",
+        "https://shop.test/p/3",
+    ]
+    assert (result.url_duplicates, result.content_duplicates) == (1, 1)
+
+
+def test_near_duplicates_are_clustered_and_only_dropped_on_request(make_document):
+    documents = [
+        make(make_document, "https://shop.test/p/10", LEAFLET, name="Apixaban 10 Tablets"),
+        make(
+            make_document,
+            "https://shop.test/p/20",
+            LEAFLET.replace("twice a day", "twice daily"),
+            name="Apixaban 20 Tablets",
+        ),
+        make(make_document, "https://shop.test/p/3", "Paracetamol relieves pain and fever."),
+    ]
+    deduplicator = DocumentDeduplicator(threshold=0.7)
+
+    kept = deduplicator.deduplicate(documents)
+    dropped = deduplicator.deduplicate(documents, drop_near_duplicates=True)
+
+    assert kept.clusters == [["https://shop.test/p/10", "https://shop.test/p/20"]]
+    assert len(kept.documents) == 3
+    assert dropped.near_duplicates_dropped == 1
+    assert [document.metadata.url for document in dropped.documents] == [
+        "https://shop.test/p/10",
+        "https://shop.test/p/3",
+    ]
+    assert kept.cluster_stats()["largest_cluster"] == 2
+
+
+def test_signatures_estimate_jaccard_similarity():
+    deduplicator = DocumentDeduplicator()
+
+    same = deduplicator.similarity(
+        deduplicator.signature(LEAFLET), deduplicator.signature(LEAFLET)
+    )
+    different = deduplicator.similarity(
+        deduplicator.signature(LEAFLET), deduplicator.signature("Paracetamol relieves pain.")
+    )
+
+    assert same == 1.0
+    assert different < 0.2
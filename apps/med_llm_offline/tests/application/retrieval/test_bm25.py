@@ -0,0 +1,104 @@
+import math
+from collections import Counter
+
+import pytest
+
+from src.med_llm_offline.application.retrieval import BM25Index, tokenize
+
+TEXTS = {
+    "apixaban": "Apixaban prevents stroke and blood clots",
+    "warfarin": "Warfarin prevents blood clots, monitor blood tests",
+    "paracetamol": "Paracetamol relieves pain and fever",
+    "ibuprofen": "Ibuprofen relieves pain, fever and inflammation",
+    "cetirizine": "Cetirizine relieves allergy symptoms",
+}
+
+
+def reference_scores(texts, query, k1=1.2, b=0.75):
+    """Plain-Python BM25, scoring every document."""
+    docs = {doc_id: Counter(tokenize(text)) for doc_id, text in texts.items()}
+    average_length = sum(sum(counts.values()) for counts in docs.values()) / len(docs)
+    scores = Counter()
+    for term, query_frequency in Counter(tokenize(query)).items():
+        df = sum(1 for counts in docs.values() if term in counts)
+        if not df:
+            continue
+        idf = math.log1p((len(docs) - df + 0.5) / (df + 0.5))
+        for doc_id, counts in docs.items():
+            if term in counts:
+                length = sum(counts.values())
+                norm = k1 * (1 - b + b * length / average_length)
+                tf = counts[term]
+                scores[doc_id] += query_frequency * idf * tf * (k1 + 1) / (tf + norm)
+    return scores
+
+
+def build(texts, **kwargs):
+    index = BM25Index(**kwargs)
+    for doc_id, text in texts.items():
+        index.add_text(doc_id, text)
+    return index
+
+
+def assert_matches_reference(index, texts, query):
+    expected = reference_scores(texts, query)
+    hits = index.search(query, k=len(texts))
+
+    assert [hit.id for hit in hits] == sorted(expected, key=lambda d: (-expected[d], d))
+    for hit in hits:
+        assert hit.score == pytest.approx(expected[hit.id], rel=1e-5)
+
+
+@pytest.mark.parametrize("merge", [False, True])
+def test_scores_match_reference_bm25(merge):
+    index = build(TEXTS)
+    if merge:
+        index.merge()
+
+    assert_matches_reference(index, TEXTS, "blood clots")
+    assert_matches_reference(index, TEXTS, "pain fever pain")
+
+
+def test_top_k_keeps_the_best_hits():
+    index = build(TEXTS)
+
+    assert [hit.id for hit in index.search("relieves pain", k=2)] == [
+        "paracetamol",
+        "ibuprofen",
+    ]
+    assert index.search("unknown words") == []
+
+
+def test_deleted_documents_leave_results_and_statistics():
+    index = build(TEXTS, merge_threshold=2)
+    index.delete("warfarin")
+    remaining = {doc_id: text for doc_id, text in TEXTS.items() if doc_id != "warfarin"}
+
+    assert "warfarin" not in index
+    assert_matches_reference(index, remaining, "blood clots")
+
+    index.merge()
+    assert_matches_reference(index, remaining, "blood clots")
+
+
+def test_adding_an_indexed_id_replaces_it():
+    index = build(TEXTS)
+    index.add_text("cetirizine", "Cetirizine relieves hay fever")
+    texts = {**TEXTS, "cetirizine": "Cetirizine relieves hay fever"}
+
+    assert len(index) == len(TEXTS)
+    assert_matches_reference(index, texts, "fever allergy")
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_and_load(tmp_path, mmap):
+    build(TEXTS).save(tmp_path / "bm25")
+
+    index = BM25Index.load(tmp_path / "bm25", mmap=mmap)
+    assert_matches_reference(index, TEXTS, "relieves pain")
+
+    index.add_text("aspirin", "Aspirin relieves pain and prevents clots")
+    index.delete("paracetamol")
+    texts = {**TEXTS, "aspirin": "Aspirin relieves pain and prevents clots"}
+    del texts["paracetamol"]
+    assert_matches_reference(index, texts, "pain clots")
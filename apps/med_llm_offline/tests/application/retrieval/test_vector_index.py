@@ -0,0 +1,138 @@
+import numpy as np
+import pytest
+
+from src.med_llm_offline.application.retrieval import (
+    HashingEncoder,
+    IVFIndex,
+    SectionVectorIndex,
+)
+from src.med_llm_offline.infrastructure.cache import EmbeddingCache
+
+DIMENSION = 16
+
+
+def unit_vectors(count, seed=0, clusters=8):
+    """Vectors grouped around a few random directions, like real embeddings."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, DIMENSION))
+    vectors = centers[rng.integers(clusters, size=count)] + 0.3 * rng.normal(
+        size=(count, DIMENSION)
+    )
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def build(count=400, **kwargs):
+    index = IVFIndex(DIMENSION, **kwargs)
+    index.add([f"v{i}" for i in range(count)], unit_vectors(count))
+    return index
+
+
+def test_probing_every_list_is_exact():
+    index = build(n_lists=8)
+    index.train()
+
+    for query in unit_vectors(5, seed=1):
+        expected = index.search_exact(query, k=10)
+        hits = index.search(query, k=10, n_probe=8)
+        assert [vector_id for vector_id, _ in hits] == [vector_id for vector_id, _ in expected]
+
+
+def test_probing_a_few_lists_keeps_recall():
+    index = build(n_lists=16, n_probe=4)
+    index.train()
+
+    recalls = []
+    for query in unit_vectors(20, seed=2):
+        expected = {vector_id for vector_id, _ in index.search_exact(query, k=10)}
+        found = {vector_id for vector_id, _ in index.search(query, k=10)}
+        recalls.append(len(expected & found) / len(expected))
+
+    assert np.mean(recalls) >= 0.9
+
+
+def test_tail_vectors_and_deletions_are_searchable_before_merging():
+    index = build(n_lists=8, merge_threshold=1000)
+    index.train()
+    query = unit_vectors(1, seed=3)[0]
+
+    index.add(["new"], query[None, :])
+    index.delete("v0")
+
+    hits = index.search(query, k=5)
+    assert hits[0][0] == "new"
+    assert hits[0][1] == pytest.approx(1.0)
+    assert "v0" not in index
+    assert all(vector_id != "v0" for vector_id, _ in index.search_exact(query, k=400))
+
+
+def test_adding_a_stored_id_replaces_it():
+    index = build(count=10)
+    query = unit_vectors(1, seed=4)[0]
+
+    index.add(["v3"], query[None, :])
+
+    assert len(index) == 10
+    assert index.search(query, k=1)[0][0] == "v3"
+
+
+@pytest.mark.parametrize("trained", [False, True])
+def test_save_and_load(tmp_path, trained):
+    index = build(n_lists=8)
+    if trained:
+        index.train()
+    query = unit_vectors(1, seed=5)[0]
+    expected = index.search(query, k=10, n_probe=8)
+
+    index.save(tmp_path / "ivf")
+    loaded = IVFIndex.load(tmp_path / "ivf")
+
+    assert loaded.trained == trained
+    assert [vector_id for vector_id, _ in loaded.search(query, k=10, n_probe=8)] == [
+        vector_id for vector_id, _ in expected
+    ]
+    loaded.add(["new"], query[None, :])
+    assert loaded.search(query, k=1)[0][0] == "new"
+
+
+def test_hashing_encoder_is_deterministic_and_normalized():
+    encoder = HashingEncoder(dimension=64)
+
+    vectors = encoder.encode(["Apixaban tablets", "apixaban tablets", ""])
+
+    assert np.allclose(vectors[0], vectors[1])
+    assert np.linalg.norm(vectors[0]) == pytest.approx(1.0)
+    assert not vectors[2].any()
+
+
+def test_section_index_reuses_cached_embeddings(tmp_path, make_document):
+    documents = [
+        make_document("https://shop.test/p/1", specification="Generics Apixaban"),
+        make_document("https://shop.test/p/2", specification="Generics Warfarin"),
+    ]
+
+    with EmbeddingCache(tmp_path) as cache:
+        first = SectionVectorIndex(cache=cache)
+        first.add(documents)
+        assert (first.embedded, first.cache_hits) == (2, 0)
+
+        changed = make_document("https://shop.test/p/2", specification="Generics Heparin")
+        second = SectionVectorIndex(cache=cache)
+        second.add([documents[0], changed])
+        assert (second.embedded, second.cache_hits) == (1, 1)
+
+    hits = second.search("heparin", k=1)
+    assert hits[0].id == f"{changed.id}:specification"
+
+
+def test_section_index_replaces_and_deletes_documents(make_document):
+    index = SectionVectorIndex()
+    document = make_document("https://shop.test/p/1", specification="Generics Apixaban")
+    index.add([document])
+    index.add([make_document("https://shop.test/p/1", specification="Generics Heparin")])
+
+    assert len(index.index) == 1
+    assert index.search("Generics Heparin", k=1)[0].score == pytest.approx(1.0)
+    assert index.search("Generics Apixaban", k=1)[0].score < 0.9
+
+    assert index.delete(document.id)
+    assert index.search("heparin") == []
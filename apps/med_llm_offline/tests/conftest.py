@@ -0,0 +1,42 @@
+import os
+
+# Settings are validated on import; tests never reach these services.
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGODB_DATABASE_NAME", "med_llm_test")
+os.environ.setdefault("COMET_API_KEY", "test")
+os.environ.setdefault("COMET_PROJECT", "test")
+
+from unittest import mock  # noqa: E402
+
+import mongomock  # noqa: E402
+import pytest  # noqa: E402
+
+from src.med_llm_offline import utils  # noqa: E402
+from src.med_llm_offline.domain import Document, DocumentMetadata  # noqa: E402
+
+
+@pytest.fixture
+def mongo_client():
+    """Serve every MongoDBService from an in-memory mongomock client."""
+    from src.med_llm_offline.infrastructure.mongo import client
+
+    with mock.patch.object(client, "MongoClient", mongomock.MongoClient):
+        yield
+        client.get_client_registry().close_all()
+
+
+@pytest.fixture
+def make_document():
+    """Build a Document for a product URL, with its specification parsed."""
+
+    def make(url: str, specification: str = "Generics Apixaban", name: str = "Product"):
+        return Document(
+            metadata=DocumentMetadata(
+                id=utils.document_id(url),
+                url=url,
+                name=name,
+                properties={"specification": specification},
+            ).parse_specification()
+        )
+
+    return make
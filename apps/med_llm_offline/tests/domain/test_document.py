@@ -0,0 +1,112 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.med_llm_offline import utils
+from src.med_llm_offline.domain import Document
+
+
+def test_obfuscation_is_keyed(make_document):
+    url = "https://shop.test/p/1"
+
+    first = make_document(url).obfuscate("secret")
+    again = make_document(url).obfuscate("secret")
+    other = make_document(url).obfuscate("other")
+
+    assert first.id == again.id
+    assert first.id != other.id
+
+
+def test_obfuscation_requires_a_key(make_document):
+    with pytest.raises(ValueError):
+        make_document("https://shop.test/p/1").obfuscate("")
+
+
+def test_domain_imports_without_settings():
+    env = {
+        name: value
+        for name, value in os.environ.items()
+        if name not in ("MONGODB_URI", "MONGODB_DATABASE_NAME", "COMET_API_KEY", "COMET_PROJECT")
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", "from src.med_llm_offline.domain import Document"],
+        env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_write_obfuscates_with_the_given_key(tmp_path, make_document):
+    document = make_document("https://shop.test/p/1")
+    expected = make_document("https://shop.test/p/1").obfuscate("secret").id
+
+    document.write(tmp_path, obfuscate=True, obfuscation_key="secret")
+
+    assert (tmp_path / f"{expected}.json").exists()
+    with pytest.raises(ValueError):
+        make_document("https://shop.test/p/2").write(tmp_path, obfuscate=True)
+
+
+def write_untyped(path, url):
+    """Write a document file from before the specification fields existed."""
+    document = {
+        "id": "1",
+        "metadata": {
+            "id": "1",
+            "url": url,
+            "name": "Product",
+            "properties": {"specification": "Generics Apixaban\nUsed For Stroke"},
+        },
+    }
+    path.write_text(json.dumps(document), encoding="utf-8")
+
+
+def test_from_file_parses_the_specification(tmp_path):
+    write_untyped(tmp_path / "1.json", "https://shop.test/p/1")
+
+    metadata = Document.from_file(tmp_path / "1.json").metadata
+
+    assert metadata.generics == ["apixaban"]
+    assert metadata.used_for == ["stroke"]
+
+
+def test_load_dir_parses_the_specification(tmp_path):
+    for number in range(3):
+        write_untyped(tmp_path / f"{number}.json", f"https://shop.test/p/{number}")
+
+    [documents] = Document.load_dir(tmp_path, max_workers=1)
+
+    assert [document.metadata.generics for document in documents] == [["apixaban"]] * 3
+
+
+@pytest.mark.parametrize(
+    "spelling",
+    [
+        "https://shop.test/p/1?size=10&color=red",
+        "HTTPS://Shop.Test/p/1/?color=red&size=10",
+        "https://shop.test/p/1?color=red&size=10#reviews",
+    ],
+)
+def test_every_spelling_of_a_url_gets_the_same_id(spelling):
+    document = Document(
+        metadata={"id": "", "url": spelling, "name": "Product", "properties": {}}
+    )
+
+    assert document.id == utils.document_id("https://shop.test/p/1?color=red&size=10")
+
+
+def test_fingerprint_follows_the_content(make_document):
+    document = make_document("https://shop.test/p/1")
+    fingerprint = document.content_fingerprint
+
+    document.token_counts["specification"] = 3
+    assert document.content_fingerprint == fingerprint
+
+    document.metadata.properties["specification"] = "Generics Heparin"
+    assert document.content_fingerprint != fingerprint
@@ -0,0 +1,79 @@
+import pytest
+
+from src.med_llm_offline.domain.specification import parse_specification
+
+
+def test_parses_every_field():
+    parsed = parse_specification(
+        "Requires Prescription (YES/NO) Yes\n"
+        "Generics Apixaban\n"
+        "Used For Stroke, Deep Vein Thrombosis\n"
+        "How it works Apixaban blocks factor Xa.\n"
+        "It prevents clots from forming."
+    )
+
+    assert parsed == {
+        "requires_prescription": True,
+        "generics": ["apixaban"],
+        "used_for": ["stroke", "deep vein thrombosis"],
+        "how_it_works": "Apixaban blocks factor Xa. It prevents clots from forming.",
+    }
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("Requires Prescription (YES/NO) Yes", True),
+        ("Requires Prescription (YES/NO): Yes", True),
+        ("Requires Prescription (YES/NO):No", False),
+        ("Requires Prescription: No", False),
+        ("Requires Prescription (YES/NO)", None),
+    ],
+)
+def test_parses_requires_prescription(line, expected):
+    assert parse_specification(line)["requires_prescription"] is expected
+
+
+def test_labels_out_of_order_start_new_fields():
+    parsed = parse_specification("Used For Stroke\nGenerics Apixaban")
+
+    assert parsed["used_for"] == ["stroke"]
+    assert parsed["generics"] == ["apixaban"]
+
+
+def test_labels_inside_how_it_works_continue_it():
+    parsed = parse_specification(
+        "Generics Apixaban\nHow it works Apixaban thins the blood.\nGeneric versions work alike."
+    )
+
+    assert parsed["generics"] == ["apixaban"]
+    assert parsed["how_it_works"] == "Apixaban thins the blood. Generic versions work alike."
+
+
+def test_label_must_be_a_whole_word():
+    parsed = parse_specification("Generics Apixaban\nUsed formerly in hospitals")
+
+    assert parsed["used_for"] == []
+    assert parsed["generics"] == ["apixaban used formerly in hospitals"]
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("Paracetamol + Caffeine", ["paracetamol", "caffeine"]),
+        ("Vitamin B1, B6 & B12", ["vitamin b1, b6 & b12"]),
+        ("Vitamin B1, B6 & B12 + Folic Acid", ["vitamin b1, b6 & b12", "folic acid"]),
+        ("Amoxicillin + amoxicillin", ["amoxicillin"]),
+    ],
+)
+def test_splits_combination_generics(value, expected):
+    assert parse_specification(f"Generics {value}")["generics"] == expected
+
+
+def test_empty_specification():
+    assert parse_specification(None) == {
+        "requires_prescription": None,
+        "generics": [],
+        "used_for": [],
+        "how_it_works": None,
+    }
@@ -0,0 +1,62 @@
+import sqlite3
+import time
+
+from src.med_llm_offline.infrastructure.cache import ResponseCache
+
+
+def accessed_at(cache_dir, url):
+    with sqlite3.connect(cache_dir / "index.sqlite") as db:
+        (value,) = db.execute("SELECT accessed_at FROM entries WHERE url = ?", (url,)).fetchone()
+    return value
+
+
+def test_entry_round_trip(tmp_path):
+    with ResponseCache(tmp_path, extractor_version="1") as cache:
+        cache.put("https://a/p/1", b"<html>", etag='"v1"', document={"name": "Product"})
+        entry = cache.get("https://a/p/1")
+
+    assert entry.body_hash == ResponseCache.hash_body(b"<html>")
+    assert entry.document == {"name": "Product"}
+    assert cache.conditional_headers(entry) == {"If-None-Match": '"v1"'}
+
+
+def test_entries_of_another_extractor_version_are_missing(tmp_path):
+    with ResponseCache(tmp_path, extractor_version="1") as cache:
+        cache.put("https://a/p/1", b"<html>", document={"name": "Product"})
+
+    with ResponseCache(tmp_path, extractor_version="2") as cache:
+        assert cache.get("https://a/p/1") is None
+
+
+def test_lookups_are_written_with_the_next_change(tmp_path):
+    cache = ResponseCache(tmp_path, extractor_version="1")
+    cache.put("https://a/p/1", b"<html>", document={"name": "Product"})
+    stored = accessed_at(tmp_path, "https://a/p/1")
+    time.sleep(0.01)
+
+    cache.get("https://a/p/1")
+    assert accessed_at(tmp_path, "https://a/p/1") == stored
+
+    cache.put("https://a/p/2", b"<html>", document={"name": "Other"})
+    looked_up = accessed_at(tmp_path, "https://a/p/1")
+    assert looked_up > stored
+
+    time.sleep(0.01)
+    cache.get("https://a/p/1")
+    cache.close()
+    assert accessed_at(tmp_path, "https://a/p/1") > looked_up
+
+
+def test_eviction_keeps_recently_looked_up_entries(tmp_path):
+    document = {"text": "x" * 100}
+    with ResponseCache(tmp_path, extractor_version="1", max_size_bytes=250) as cache:
+        cache.put("https://a/p/1", b"1", document=document)
+        time.sleep(0.01)
+        cache.put("https://a/p/2", b"2", document=document)
+        time.sleep(0.01)
+        cache.get("https://a/p/1")
+        cache.put("https://a/p/3", b"3", document=document)
+
+        assert cache.get("https://a/p/1") is not None
+        assert cache.get("https://a/p/2") is None
+        assert cache.get("https://a/p/3") is not None
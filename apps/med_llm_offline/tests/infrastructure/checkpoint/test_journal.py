@@ -0,0 +1,56 @@
+import pytest
+
+from src.med_llm_offline.infrastructure.checkpoint import CrawlJournal
+
+BASE_URL = "https://shop.test"
+
+
+def write_progress(journal_dir):
+    with CrawlJournal(journal_dir, base_url=BASE_URL) as journal:
+        journal.record_page(1, ["https://shop.test/p/1", "https://shop.test/p/2"])
+        journal.record_last_page(4)
+        journal.record_document("https://shop.test/p/1", {"id": "1"})
+        journal.record_document("https://shop.test/p/1", {"id": "1"})
+    return journal.path
+
+
+def test_resume_replays_the_progress(tmp_path):
+    write_progress(tmp_path)
+
+    with CrawlJournal(tmp_path, base_url=BASE_URL, resume=True) as journal:
+        assert journal.pages == {1: ["https://shop.test/p/1", "https://shop.test/p/2"]}
+        assert journal.last_page == 4
+        assert journal.scraped_urls == {"https://shop.test/p/1"}
+        assert journal.documents == [{"id": "1"}]
+
+
+def test_resume_drops_a_torn_last_record(tmp_path):
+    path = write_progress(tmp_path)
+    with path.open("ab") as f:
+        f.write(b'{"type": "document", "url": "https://shop.test/p/2", "docu')
+
+    with CrawlJournal(tmp_path, base_url=BASE_URL, resume=True) as journal:
+        assert journal.scraped_urls == {"https://shop.test/p/1"}
+        journal.record_document("https://shop.test/p/2", {"id": "2"})
+
+    with CrawlJournal(tmp_path, base_url=BASE_URL, resume=True) as journal:
+        assert journal.documents == [{"id": "1"}, {"id": "2"}]
+
+
+def test_starting_over_discards_the_journal(tmp_path):
+    write_progress(tmp_path)
+
+    with CrawlJournal(tmp_path, base_url=BASE_URL) as journal:
+        assert journal.pages == {}
+
+    with CrawlJournal(tmp_path, base_url=BASE_URL, resume=True) as journal:
+        assert journal.documents == []
+
+
+def test_journal_of_another_crawl_is_not_resumed(tmp_path):
+    write_progress(tmp_path)
+
+    with pytest.raises(ValueError):
+        CrawlJournal(tmp_path, base_url="https://other.test", resume=True)
+    with pytest.raises(ValueError):
+        CrawlJournal(tmp_path, base_url=BASE_URL, start_page=2, resume=True)
@@ -0,0 +1,71 @@
+import pytest
+
+from src.med_llm_offline.config import settings
+from src.med_llm_offline.infrastructure.export import (
+    CorpusExporter,
+    read_export,
+    read_export_chunks,
+    read_manifest,
+    read_shard,
+)
+
+
+@pytest.fixture
+def documents(make_document):
+    documents = [
+        make_document(f"https://shop.test/p/{number}", specification="Generics Apixaban")
+        for number in range(25)
+    ]
+    for number, document in enumerate(documents):
+        document.metadata.properties[f"extra_{number % 3}"] = f"Section {number}"
+    return documents
+
+
+@pytest.mark.parametrize("format", ["jsonl", "parquet"])
+def test_export_round_trip(tmp_path, documents, format):
+    manifest = CorpusExporter(tmp_path, format=format, shard_size=10).export(documents)
+
+    assert [shard.documents for shard in manifest.shards] == [10, 10, 5]
+    exported = list(read_export(tmp_path, verify=True))
+    # Documents compare by ID only.
+    assert [document.model_dump() for document in exported] == [
+        document.model_dump() for document in documents
+    ]
+    assert [len(chunk) for chunk in read_export_chunks(tmp_path, max_workers=1)] == [10, 10, 5]
+    assert all(document.metadata.generics == ["apixaban"] for document in read_export(tmp_path))
+
+
+def test_export_replaces_the_previous_one(tmp_path, documents):
+    exporter = CorpusExporter(tmp_path, shard_size=10)
+    first = exporter.export(documents)
+    exporter.export(documents[:5])
+
+    assert read_manifest(tmp_path).documents == 5
+    assert all(not (tmp_path / shard.path).exists() for shard in first.shards)
+
+
+def test_corrupt_shard_fails_verification(tmp_path, documents):
+    manifest = CorpusExporter(tmp_path, shard_size=10).export(documents)
+    shard = manifest.shards[0]
+    (tmp_path / shard.path).write_bytes(b"corrupt")
+
+    with pytest.raises(ValueError):
+        read_shard(tmp_path, shard, manifest.format, verify=True)
+
+
+def test_obfuscated_export_leaves_the_documents_alone(tmp_path, documents, monkeypatch):
+    monkeypatch.setattr(settings, "OBFUSCATION_KEY", "secret")
+    ids = [document.id for document in documents]
+
+    CorpusExporter(tmp_path).export(documents, obfuscate=True)
+
+    exported = [document.id for document in read_export(tmp_path)]
+    assert [document.id for document in documents] == ids
+    assert set(exported).isdisjoint(ids)
+
+
+def test_obfuscated_export_requires_a_key(tmp_path, documents, monkeypatch):
+    monkeypatch.setattr(settings, "OBFUSCATION_KEY", None)
+
+    with pytest.raises(ValueError):
+        CorpusExporter(tmp_path).export(documents, obfuscate=True)
@@ -0,0 +1,55 @@
+import pyarrow.parquet as pq
+import pytest
+
+from src.med_llm_offline.infrastructure.export import DocumentSequence, documents_to_table
+
+
+@pytest.fixture
+def documents(make_document):
+    documents = []
+    for number in range(10):
+        document = make_document(f"https://shop.test/p/{number}")
+        document.metadata.properties["usage"] = f"Usage {number}"
+        document.token_counts = {"usage": number}
+        documents.append(document)
+    return documents
+
+
+@pytest.fixture
+def sequence(tmp_path, documents):
+    path = tmp_path / "documents.parquet"
+    # Several row groups, so lookups have to find the right one.
+    pq.write_table(documents_to_table(documents), path, row_group_size=3)
+    return DocumentSequence(str(path))
+
+
+def test_sequence_reads_every_document(sequence, documents):
+    assert len(sequence) == 10
+    assert [document.model_dump() for document in sequence] == [
+        document.model_dump() for document in documents
+    ]
+    assert sequence[-1].model_dump() == documents[-1].model_dump()
+    assert [document.id for document in sequence[2:8:2]] == [
+        document.id for document in documents[2:8:2]
+    ]
+    with pytest.raises(IndexError):
+        sequence[10]
+
+
+def test_select_decodes_only_some_properties(sequence):
+    selected = sequence.select(["usage"])
+
+    assert selected[4].metadata.properties == {"usage": "Usage 4"}
+    assert selected[4].token_counts == {"usage": 4}
+    with pytest.raises(KeyError):
+        sequence.select(["missing"])
+
+
+def test_column_reads_without_building_documents(sequence, documents):
+    assert sequence.column("metadata.url") == [document.metadata.url for document in documents]
+
+
+def test_changes_to_returned_documents_are_not_shared(sequence):
+    sequence[0].metadata.properties["usage"] = "changed"
+
+    assert sequence[0].metadata.properties["usage"] == "Usage 0"
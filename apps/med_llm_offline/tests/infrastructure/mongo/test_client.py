@@ -0,0 +1,52 @@
+from unittest import mock
+
+import mongomock
+import pytest
+
+from src.med_llm_offline.infrastructure.mongo import client
+from src.med_llm_offline.infrastructure.mongo.client import MongoClientRegistry
+
+
+@pytest.fixture
+def registry():
+    with mock.patch.object(client, "MongoClient", mongomock.MongoClient):
+        registry = MongoClientRegistry()
+        yield registry
+        registry.close_all()
+
+
+def test_one_client_is_shared_per_uri(registry):
+    first = registry.get("mongodb://a.test")
+
+    assert registry.get("mongodb://a.test") is first
+    assert registry.get("mongodb://b.test") is not first
+
+
+def test_closed_client_is_replaced_on_next_use(registry):
+    first = registry.get("mongodb://a.test")
+
+    registry.close("mongodb://a.test")
+
+    assert registry.get("mongodb://a.test") is not first
+
+
+def test_close_all_closes_every_client(registry):
+    clients = [registry.get("mongodb://a.test"), registry.get("mongodb://b.test")]
+
+    with mock.patch.object(mongomock.MongoClient, "close") as close:
+        registry.close_all()
+
+    assert close.call_count == len(clients)
+    assert registry.get("mongodb://a.test") is not clients[0]
+
+
+def test_failed_connection_is_not_cached(registry):
+    with mock.patch.object(mongomock.Database, "command", side_effect=ConnectionError):
+        with pytest.raises(ConnectionError):
+            registry.get("mongodb://a.test")
+
+    assert registry.get("mongodb://a.test") is not None
+
+
+def test_registry_is_process_wide():
+    assert client.get_client_registry() is client.get_client_registry()
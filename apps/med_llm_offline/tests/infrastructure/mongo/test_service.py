@@ -0,0 +1,124 @@
+import pytest
+
+from src.med_llm_offline.domain import CrawlReport, Document
+from src.med_llm_offline.infrastructure.mongo import MongoDBService
+
+
+@pytest.fixture
+def service(mongo_client, make_document):
+    service = MongoDBService(model=Document, collection_name="sync")
+    service.sync_documents([make_document(f"https://a/p/{number}") for number in range(3)])
+    return service
+
+
+def tombstoned_urls(service):
+    return sorted(
+        document["metadata"]["url"]
+        for document in service.collection.find({"deleted_at": {"$ne": None}})
+    )
+
+
+def test_sync_tombstones_unseen_documents(service, make_document):
+    stats = service.sync_documents([make_document("https://a/p/0")])
+
+    assert stats["tombstoned"] == 2
+    assert tombstoned_urls(service) == ["https://a/p/1", "https://a/p/2"]
+
+
+def test_sync_keeps_documents_that_failed_to_scrape(service, make_document):
+    report = CrawlReport(failed_urls=["https://a/p/1"])
+
+    stats = service.sync_documents([make_document("https://a/p/0")], crawl_report=report)
+
+    assert stats["tombstoned"] == 1
+    assert tombstoned_urls(service) == ["https://a/p/2"]
+
+
+def test_partial_crawl_tombstones_nothing(service, make_document):
+    report = CrawlReport(skipped_pages=[2])
+
+    stats = service.sync_documents([make_document("https://a/p/0")], crawl_report=report)
+
+    assert stats["tombstoned"] == 0
+    assert tombstoned_urls(service) == []
+
+
+def test_replace_deletes_unseen_documents_without_clearing(service, make_document):
+    report = CrawlReport(failed_urls=["https://a/p/2"])
+
+    stats = service.replace_documents(
+        [make_document("https://a/p/0"), make_document("https://a/p/3")], crawl_report=report
+    )
+
+    urls = sorted(document["metadata"]["url"] for document in service.collection.find())
+    assert urls == ["https://a/p/0", "https://a/p/2", "https://a/p/3"]
+    assert stats["deleted"] == 1
+    assert stats["inserted"] == 1
+
+
+def totals(batch_stats):
+    return {
+        name: sum(getattr(stats, name) for stats in batch_stats)
+        for name in ("inserted", "updated", "unchanged", "failed")
+    }
+
+
+def test_bulk_upsert_is_idempotent(mongo_client, make_document):
+    service = MongoDBService(model=Document, collection_name="bulk")
+    documents = [make_document(f"https://a/p/{number}") for number in range(5)]
+
+    first = service.bulk_upsert(documents, batch_size=2)
+    again = service.bulk_upsert(documents, batch_size=2)
+    documents[0].metadata.name = "Renamed"
+    changed = service.bulk_upsert(documents, batch_size=2)
+
+    assert len(first) == 3
+    assert totals(first) == {"inserted": 5, "updated": 0, "unchanged": 0, "failed": 0}
+    assert totals(again) == {"inserted": 0, "updated": 0, "unchanged": 5, "failed": 0}
+    assert totals(changed) == {"inserted": 0, "updated": 1, "unchanged": 4, "failed": 0}
+    assert service.get_collection_count() == 5
+    assert any(
+        index["key"] == {"metadata.url": 1} and index.get("unique")
+        for index in service.collection.list_indexes()
+    )
+
+
+@pytest.fixture
+def many(mongo_client, make_document):
+    service = MongoDBService(model=Document, collection_name="many")
+    documents = [make_document(f"https://a/p/{number:03}") for number in range(50)]
+    service.sync_documents(documents)
+    # The last five are tombstoned.
+    service.sync_documents(documents[:45])
+    return service
+
+
+def test_iter_documents_streams_live_documents_in_chunks(many):
+    chunks = list(many.iter_documents(batch_size=20))
+
+    assert [len(chunk) for chunk in chunks] == [20, 20, 5]
+    ids = [raw["_id"] for chunk in many.iter_documents(validate=False) for raw in chunk]
+    assert ids == sorted(ids)
+    assert sum(map(len, many.iter_documents(include_deleted=True))) == 50
+
+
+def test_parallel_reads_return_every_document_once(many):
+    bounds = many.partition_bounds(4)
+    urls = [
+        document.metadata.url
+        for chunk in many.iter_documents_parallel(partitions=4, batch_size=7)
+        for document in chunk
+    ]
+
+    assert len(bounds) == 4
+    assert bounds[0][0] is None and bounds[-1][1] is None
+    assert sorted(urls) == [f"https://a/p/{number:03}" for number in range(45)]
+
+
+def test_parallel_reads_can_stop_early(many):
+    chunks = many.iter_documents_parallel(partitions=4, batch_size=1)
+
+    first = next(chunks)
+    chunks.close()
+
+    assert len(first) == 1
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from src.med_llm_offline.infrastructure.mongo import MongoBatchWriter, MongoDBService
+from src.med_llm_offline.infrastructure.mongo.service import BulkWriteStats
+
+
+class FailingService:
+    def bulk_upsert(self, documents, **kwargs):
+        raise ConnectionError("MongoDB is unreachable")
+
+
+class RecordingService:
+    def __init__(self):
+        self.written = []
+
+    def bulk_upsert(self, documents, **kwargs):
+        self.written.extend(documents)
+        return [BulkWriteStats(batch=0, inserted=len(documents))]
+
+
+async def produce(writer, producers=4, documents=50):
+    async def producer():
+        for document in range(documents):
+            await writer.put(document)
+
+    await asyncio.gather(*(producer() for _ in range(producers)))
+
+
+def test_writer_failure_reaches_blocked_producers():
+    async def run():
+        async with MongoBatchWriter(
+            FailingService(), batch_size=2, flush_interval=0.01, max_pending_batches=1
+        ) as writer:
+            await produce(writer)
+
+    async def run_within_timeout():
+        task = asyncio.ensure_future(run())
+        done, _ = await asyncio.wait([task], timeout=5)
+        if not done:
+            task.cancel()
+            pytest.fail("Producers are still blocked after the writer failed")
+        task.result()
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(run_within_timeout())
+
+
+def test_writer_writes_every_document():
+    service = RecordingService()
+
+    async def run():
+        async with MongoBatchWriter(
+            service, batch_size=7, flush_interval=0.01, max_pending_batches=1
+        ) as writer:
+            await produce(writer)
+        return writer.stats
+
+    stats = asyncio.run(run())
+
+    assert len(service.written) == 200
+    assert stats["written"] == 200
+
+
+def test_replace_mode_deletes_unseen_documents(mongo_client, make_document):
+    service = MongoDBService(model=type(make_document("https://a/p/1")), collection_name="replace")
+    service.ingest_documents([make_document("https://a/p/old")])
+
+    async def run(documents):
+        async with MongoBatchWriter(
+            service, batch_size=2, flush_interval=0.01, replace=True
+        ) as writer:
+            for document in documents:
+                await writer.put(document)
+        return writer.stats
+
+    stats = asyncio.run(run([make_document("https://a/p/1"), make_document("https://a/p/2")]))
+
+    urls = sorted(d.metadata.url for d in service.fetch_documents(limit=0, query={}))
+    assert urls == ["https://a/p/1", "https://a/p/2"]
+    assert stats["deleted"] == 1
@@ -0,0 +1,79 @@
+from unittest import mock
+
+from src.med_llm_offline import metrics
+from src.med_llm_offline.metrics import Histogram, MetricsRegistry
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram(buckets=(1.0, 2.0))
+    for value in (0.5, 1.5, 1.5, 3.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [1, 2, 1]
+    assert histogram.count == 4
+    assert histogram.sum == 6.5
+    assert 1.0 < histogram.quantile(0.5) <= 2.0
+    assert histogram.to_dict()["buckets"] == {"1.0": 1, "2.0": 3, "inf": 4}
+
+
+def test_empty_histogram_has_zero_quantiles():
+    assert Histogram().quantile(0.99) == 0.0
+
+
+def test_counters_and_gauges():
+    registry = MetricsRegistry()
+    registry.increment("pages")
+    registry.increment("pages", 2)
+    registry.gauge("queue_depth", 5)
+    registry.gauge("queue_depth", 2)
+
+    metadata = registry.to_metadata()
+
+    assert metadata["counters"] == {"pages": 3}
+    assert metadata["gauges"] == {"queue_depth": {"current": 2, "max": 5}}
+
+
+def test_time_records_an_observation_even_on_error():
+    registry = MetricsRegistry()
+
+    with registry.time("fetch"):
+        pass
+    try:
+        with registry.time("fetch"):
+            raise RuntimeError
+    except RuntimeError:
+        pass
+
+    assert registry.to_metadata()["latency_seconds"]["fetch"]["count"] == 2
+
+
+def test_prometheus_textfile(tmp_path):
+    registry = MetricsRegistry()
+    registry.observe("fetch", 0.2)
+    registry.increment("pages", 3)
+    registry.gauge("queue_depth", 4)
+    path = tmp_path / "metrics" / "crawl.prom"
+
+    registry.write_prometheus_textfile(path)
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert 'med_llm_stage_duration_seconds_bucket{stage="fetch",le="+Inf"} 1' in lines
+    assert 'med_llm_stage_duration_seconds_count{stage="fetch"} 1' in lines
+    assert "med_llm_pages_total 3" in lines
+    assert "med_llm_queue_depth 4" in lines
+    assert "med_llm_queue_depth_max 4" in lines
+    assert list(path.parent.iterdir()) == [path]
+
+
+def test_export_prometheus_textfile_requires_a_directory(tmp_path):
+    registry = MetricsRegistry()
+    registry.increment("pages")
+
+    with mock.patch.object(metrics.settings, "PROMETHEUS_TEXTFILE_DIR", None):
+        assert metrics.export_prometheus_textfile(registry, "crawl") is None
+
+    with mock.patch.object(metrics.settings, "PROMETHEUS_TEXTFILE_DIR", str(tmp_path)):
+        path = metrics.export_prometheus_textfile(registry, "crawl")
+
+    assert path == tmp_path / "med_llm_crawl.prom"
+    assert path.exists()